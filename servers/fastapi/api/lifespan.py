@@ -1,9 +1,21 @@
+import asyncio
 from contextlib import asynccontextmanager
 import os
 
 from fastapi import FastAPI
 
-from services.database import create_db_and_tables
+from enums.pdf_renderer import PdfRenderer
+from services.asset_gc_service import (
+    ASSET_GC_SERVICE,
+    get_asset_gc_dry_run,
+    get_asset_gc_interval,
+)
+from services.concurrent_service import CONCURRENT_SERVICE
+from services.database import create_db_and_tables, sql_engine
+from services.libreoffice_pdf_service import LIBREOFFICE_PDF_SERVICE
+from services.prometheus_metrics import PROMETHEUS_METRICS
+from services.tracing_service import TRACING_SERVICE
+from utils.export_utils import get_pdf_renderer
 from utils.get_env import get_app_data_directory_env
 from utils.model_availability import (
     check_llm_and_image_provider_api_or_model_availability,
@@ -15,9 +27,31 @@ async def app_lifespan(_: FastAPI):
     """
     Lifespan context manager for FastAPI application.
     Initializes the application data directory and checks LLM model availability.
+    Warms up LibreOffice PDF workers in background if they are the default PDF renderer.
+    Runs asset garbage collection periodically if ASSET_GC_INTERVAL is set.
+    Samples event loop lag and database pool usage for /metrics.
 
     """
     os.makedirs(get_app_data_directory_env(), exist_ok=True)
     await create_db_and_tables()
     await check_llm_and_image_provider_api_or_model_availability()
+    if get_pdf_renderer() == PdfRenderer.LIBREOFFICE:
+        CONCURRENT_SERVICE.run_task(None, LIBREOFFICE_PDF_SERVICE.warm_up)
+
+    asset_gc_task = None
+    asset_gc_interval = get_asset_gc_interval()
+    if asset_gc_interval:
+        asset_gc_task = asyncio.create_task(
+            ASSET_GC_SERVICE.run_periodically(
+                sql_engine, asset_gc_interval, get_asset_gc_dry_run()
+            )
+        )
+    runtime_metrics_task = asyncio.create_task(
+        PROMETHEUS_METRICS.monitor_runtime(sql_engine)
+    )
     yield
+    runtime_metrics_task.cancel()
+    PROMETHEUS_METRICS.mark_process_dead()
+    await TRACING_SERVICE.flush()
+    if asset_gc_task:
+        asset_gc_task.cancel()
@@ -1,7 +1,8 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from api.lifespan import app_lifespan
-from api.middlewares import UserConfigEnvUpdateMiddleware
+from api.metrics import METRICS_ROUTER
+from api.middlewares import PrometheusMetricsMiddleware, UserConfigEnvUpdateMiddleware
 from api.v1.ppt.router import API_V1_PPT_ROUTER
 from api.v1.webhook.router import API_V1_WEBHOOK_ROUTER
 from api.v1.mock.router import API_V1_MOCK_ROUTER
@@ -14,6 +15,7 @@ app = FastAPI(lifespan=app_lifespan)
 app.include_router(API_V1_PPT_ROUTER)
 app.include_router(API_V1_WEBHOOK_ROUTER)
 app.include_router(API_V1_MOCK_ROUTER)
+app.include_router(METRICS_ROUTER)
 
 # Middlewares
 origins = ["*"]
@@ -23,6 +25,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination of listing endpoints
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
 app.add_middleware(UserConfigEnvUpdateMiddleware)
+
+# Outermost, so timings include the other middlewares
+app.add_middleware(PrometheusMetricsMiddleware)
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+
+from services.prometheus_metrics import PROMETHEUS_METRICS
+
+METRICS_ROUTER = APIRouter(tags=["Metrics"])
+
+
+@METRICS_ROUTER.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return Response(
+        content=PROMETHEUS_METRICS.get_latest(),
+        media_type=PROMETHEUS_METRICS.content_type,
+    )
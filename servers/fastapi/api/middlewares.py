@@ -1,6 +1,10 @@
+import time
+
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from services.prometheus_metrics import PROMETHEUS_METRICS
 from utils.get_env import get_can_change_keys_env
 from utils.user_config import update_env_with_user_config
 
@@ -10,3 +14,53 @@ class UserConfigEnvUpdateMiddleware(BaseHTTPMiddleware):
         if get_can_change_keys_env() != "false":
             update_env_with_user_config()
         return await call_next(request)
+
+
+class PrometheusMetricsMiddleware:
+    """
+    Records request duration by route template and counts open SSE streams.
+    Written as a plain ASGI middleware so streamed responses are passed
+    through without buffering.
+    """
+
+    def __init__(self, app: ASGIApp, excluded_paths: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+        sse_stream = None
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code, sse_stream
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                content_type = dict(message.get("headers", [])).get(
+                    b"content-type", b""
+                )
+                if content_type.startswith(b"text/event-stream"):
+                    sse_stream = PROMETHEUS_METRICS.sse_streams_in_progress.labels(
+                        self.get_route(scope)
+                    )
+                    sse_stream.inc()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if sse_stream is not None:
+                sse_stream.dec()
+            PROMETHEUS_METRICS.http_request_duration.labels(
+                scope["method"], self.get_route(scope), str(status_code)
+            ).observe(time.perf_counter() - start)
+
+    @staticmethod
+    def get_route(scope: Scope) -> str:
+        # Set by the router once a route matched, unmatched paths share one label
+        route = scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
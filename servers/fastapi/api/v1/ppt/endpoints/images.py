@@ -1,19 +1,89 @@
-from typing import List
-from fastapi import APIRouter, Depends, File, UploadFile, HTTPException
+from typing import List, Optional
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Query,
+    Response,
+    UploadFile,
+    HTTPException,
+)
+from fastapi.responses import FileResponse
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
+from models.image_asset_with_thumbnail import ImageAssetWithThumbnail
 from models.image_prompt import ImagePrompt
 from models.sql.image_asset import ImageAsset
 from services.database import get_async_session
 from services.image_generation_service import ImageGenerationService
+from services.thumbnail_service import THUMBNAIL_SERVICE
 from utils.asset_directory_utils import get_images_directory
+from utils.pagination_utils import encode_cursor, get_keyset_condition
 import os
 import uuid
 from utils.file_utils import get_file_name_with_random_uuid
 
 IMAGES_ROUTER = APIRouter(prefix="/images", tags=["Images"])
 
+MAX_IMAGES_PAGE_SIZE = 100
+
+
+def get_thumbnail_url(image: ImageAsset) -> str:
+    # Cached thumbnails are served directly like the originals
+    thumbnail_path = THUMBNAIL_SERVICE.get_cached_thumbnail_path(image.path)
+    if thumbnail_path:
+        return thumbnail_path
+    return f"/api/v1/ppt/images/{image.id}/thumbnail"
+
+
+async def get_image_assets_page(
+    sql_session: AsyncSession,
+    response: Response,
+    is_uploaded: bool,
+    limit: Optional[int],
+    cursor: Optional[str],
+    include_total: bool,
+) -> List[ImageAssetWithThumbnail]:
+    """
+    Lists image assets newest first, keyset paginated on (created_at, id).
+    The next cursor and total count are returned in X-Next-Cursor and X-Total-Count.
+    """
+    if include_total:
+        total = await sql_session.scalar(
+            select(func.count(ImageAsset.id)).where(
+                ImageAsset.is_uploaded == is_uploaded
+            )
+        )
+        response.headers["X-Total-Count"] = str(total)
+
+    query = (
+        select(ImageAsset)
+        .where(ImageAsset.is_uploaded == is_uploaded)
+        .order_by(ImageAsset.created_at.desc(), ImageAsset.id.desc())
+    )
+    if cursor:
+        query = query.where(
+            get_keyset_condition(ImageAsset.created_at, ImageAsset.id, cursor)
+        )
+    if limit:
+        query = query.limit(limit + 1)
+
+    images = (await sql_session.scalars(query)).all()
+    if limit and len(images) > limit:
+        images = images[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            images[-1].created_at, images[-1].id
+        )
+
+    return [
+        ImageAssetWithThumbnail(
+            **image.model_dump(), thumbnail=get_thumbnail_url(image)
+        )
+        for image in images
+    ]
+
 
 @IMAGES_ROUTER.get("/generate")
 async def generate_image(
@@ -33,15 +103,20 @@ async def generate_image(
     return image.path
 
 
-@IMAGES_ROUTER.get("/generated", response_model=List[ImageAsset])
-async def get_generated_images(sql_session: AsyncSession = Depends(get_async_session)):
+@IMAGES_ROUTER.get("/generated", response_model=List[ImageAssetWithThumbnail])
+async def get_generated_images(
+    response: Response,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_IMAGES_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    sql_session: AsyncSession = Depends(get_async_session),
+):
     try:
-        images = await sql_session.scalars(
-            select(ImageAsset)
-            .where(ImageAsset.is_uploaded == False)
-            .order_by(ImageAsset.created_at.desc())
+        return await get_image_assets_page(
+            sql_session, response, False, limit, cursor, include_total
         )
-        return images
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to retrieve generated images: {str(e)}"
@@ -71,21 +146,45 @@ async def upload_image(
         raise HTTPException(status_code=500, detail=f"Failed to upload image: {str(e)}")
 
 
-@IMAGES_ROUTER.get("/uploaded", response_model=List[ImageAsset])
-async def get_uploaded_images(sql_session: AsyncSession = Depends(get_async_session)):
+@IMAGES_ROUTER.get("/uploaded", response_model=List[ImageAssetWithThumbnail])
+async def get_uploaded_images(
+    response: Response,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_IMAGES_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    sql_session: AsyncSession = Depends(get_async_session),
+):
     try:
-        images = await sql_session.scalars(
-            select(ImageAsset)
-            .where(ImageAsset.is_uploaded == True)
-            .order_by(ImageAsset.created_at.desc())
+        return await get_image_assets_page(
+            sql_session, response, True, limit, cursor, include_total
         )
-        return images
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to retrieve uploaded images: {str(e)}"
         )
 
 
+@IMAGES_ROUTER.get("/{id}/thumbnail")
+async def get_image_thumbnail(
+    id: uuid.UUID, sql_session: AsyncSession = Depends(get_async_session)
+):
+    image = await sql_session.get(ImageAsset, id)
+    if not image:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    thumbnail_path = await THUMBNAIL_SERVICE.get_thumbnail(image.path)
+    if not thumbnail_path:
+        raise HTTPException(status_code=404, detail="Thumbnail not available")
+
+    return FileResponse(
+        thumbnail_path,
+        media_type="image/webp",
+        headers={"Cache-Control": "public, max-age=86400"},
+    )
+
+
 @IMAGES_ROUTER.delete("/{id}", status_code=204)
 async def delete_uploaded_image_by_id(
     id: uuid.UUID, sql_session: AsyncSession = Depends(get_async_session)
@@ -97,6 +196,9 @@ async def delete_uploaded_image_by_id(
             raise HTTPException(status_code=404, detail="Image not found")
 
         os.remove(image.path)
+        thumbnail_path = THUMBNAIL_SERVICE.get_thumbnail_path(image.path)
+        if os.path.exists(thumbnail_path):
+            os.remove(thumbnail_path)
 
         await sql_session.delete(image)
         await sql_session.commit()
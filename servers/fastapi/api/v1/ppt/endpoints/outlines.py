@@ -14,6 +14,7 @@ from models.sse_response import (
     SSECompleteResponse,
     SSEErrorResponse,
     SSEResponse,
+    SSESlideOutlineResponse,
     SSEStatusResponse,
 )
 from services.temp_file_service import TEMP_FILE_SERVICE
@@ -21,6 +22,7 @@ from services.database import get_async_session
 from services.documents_loader import DocumentsLoader
 from utils.llm_calls.generate_presentation_outlines import generate_ppt_outline
 from utils.ppt_utils import get_presentation_title_from_outlines
+from utils.slide_outlines_parser import SlideOutlinesParser
 
 OUTLINES_ROUTER = APIRouter(prefix="/outlines", tags=["Outlines"])
 
@@ -58,6 +60,9 @@ async def stream_outlines(
                 (presentation.n_slides - needed_toc_count) / 10
             )
 
+        # Sends each slide outline as soon as it is complete
+        slide_outlines_parser = SlideOutlinesParser(n_slides_to_generate)
+
         async for chunk in generate_ppt_outline(
             presentation.content,
             n_slides_to_generate,
@@ -83,22 +88,35 @@ async def stream_outlines(
 
             presentation_outlines_text += chunk
 
-        try:
-            presentation_outlines_json = dict(
-                dirtyjson.loads(presentation_outlines_text)
-            )
-        except Exception as e:
-            traceback.print_exc()
-            yield SSEErrorResponse(
-                detail=f"Failed to generate presentation outlines. Please try again. {str(e)}",
-            ).to_string()
-            return
+            first_index = len(slide_outlines_parser.slides)
+            for index, slide_outline in enumerate(
+                slide_outlines_parser.feed(chunk), first_index
+            ):
+                yield SSESlideOutlineResponse(
+                    index=index, outline=slide_outline
+                ).to_string()
+
+        # Outlines are parsed from the full text only if streamed outlines are not valid
+        presentation_outlines = slide_outlines_parser.get_presentation_outlines()
+        if not presentation_outlines:
+            try:
+                presentation_outlines_json = dict(
+                    dirtyjson.loads(presentation_outlines_text)
+                )
+            except Exception as e:
+                traceback.print_exc()
+                yield SSEErrorResponse(
+                    detail=f"Failed to generate presentation outlines. Please try again. {str(e)}",
+                ).to_string()
+                return
 
-        presentation_outlines = PresentationOutlineModel(**presentation_outlines_json)
+            presentation_outlines = PresentationOutlineModel(
+                **presentation_outlines_json
+            )
 
-        presentation_outlines.slides = presentation_outlines.slides[
-            :n_slides_to_generate
-        ]
+            presentation_outlines.slides = presentation_outlines.slides[
+                :n_slides_to_generate
+            ]
 
         presentation.outlines = presentation_outlines.model_dump()
         presentation.title = get_presentation_title_from_outlines(presentation_outlines)
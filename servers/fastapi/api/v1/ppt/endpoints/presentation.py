@@ -1,21 +1,32 @@
 import asyncio
-from datetime import datetime
 import json
 import math
 import os
 import random
 import traceback
-from typing import Annotated, List, Literal, Optional, Tuple
+from typing import Annotated, Dict, List, Literal, Optional, Tuple
 import dirtyjson
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Path
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Body,
+    Depends,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+)
 from fastapi.responses import StreamingResponse
-from sqlalchemy import delete
+from sqlalchemy import and_, delete, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from constants.presentation import DEFAULT_TEMPLATES
+from enums.pdf_renderer import PdfRenderer
 from enums.webhook_event import WebhookEvent
 from models.api_error_model import APIErrorModel
 from models.generate_presentation_request import GeneratePresentationRequest
+from models.generation_progress import GenerationProgressEvent
 from models.presentation_and_path import PresentationPathAndEditPath
 from models.presentation_from_template import EditPresentationRequest
 from models.presentation_outline_model import (
@@ -24,26 +35,40 @@ from models.presentation_outline_model import (
 )
 from enums.tone import Tone
 from enums.verbosity import Verbosity
-from models.pptx_models import PptxPresentationModel
+from models.pptx_models import PptxImageCompressionModel, PptxPresentationModel
 from models.presentation_layout import PresentationLayoutModel
 from models.presentation_structure_model import PresentationStructureModel
 from models.presentation_with_slides import (
+    PresentationUpdateResponse,
     PresentationWithSlides,
 )
+from models.presentation_summary import PresentationSummary, SlideSummary
 from models.sql.template import TemplateModel
 
 from services.documents_loader import DocumentsLoader
+from services.generation_progress_service import GENERATION_PROGRESS_SERVICE
+from services.presentation_layout_store import PRESENTATION_LAYOUT_STORE
 from services.webhook_service import WebhookService
 from utils.get_layout_by_name import get_layout_by_name
 from services.image_generation_service import ImageGenerationService
+from utils.db_utils import bulk_insert_models
 from utils.dict_utils import deep_update
-from utils.export_utils import export_presentation
+from utils.export_utils import export_presentation, get_image_compression_options
+from utils.file_response_utils import get_file_download_response
 from utils.llm_calls.generate_presentation_outlines import generate_ppt_outline
+from models.sql.image_asset import ImageAsset
 from models.sql.slide import SlideModel
-from models.sse_response import SSECompleteResponse, SSEErrorResponse, SSEResponse
+from models.sse_response import (
+    SSECompleteResponse,
+    SSEErrorResponse,
+    SSEResponse,
+    SSESlidePatchResponse,
+)
 
 from services.database import get_async_session
 from services.temp_file_service import TEMP_FILE_SERVICE
+from services.tracing_service import TRACING_SERVICE
+from services.prometheus_metrics import PROMETHEUS_METRICS
 from services.concurrent_service import CONCURRENT_SERVICE
 from models.sql.presentation import PresentationModel
 from services.pptx_presentation_creator import PptxPresentationCreator
@@ -52,12 +77,17 @@ from models.sql.async_presentation_generation_status import (
     AsyncPresentationGenerationTaskModel,
 )
 from utils.asset_directory_utils import get_exports_directory, get_images_directory
-from utils.get_env import get_track_openai_usage_env
+from utils.get_env import (
+    get_slide_content_batch_size_env,
+    get_track_openai_usage_env,
+)
 from utils.llm_calls.generate_presentation_structure import (
     generate_presentation_structure,
 )
 from utils.llm_calls.generate_slide_content import (
     get_slide_content_from_type_and_outline,
+    get_slide_contents_from_types_and_outlines,
+    stream_slide_content_from_type_and_outline,
 )
 from utils.ppt_utils import (
     get_presentation_title_from_outlines,
@@ -67,36 +97,99 @@ from utils.process_slides import (
     process_slide_add_placeholder_assets,
     process_slide_and_fetch_assets,
 )
-from utils.parsers import parse_bool_or_none
+from utils.pagination_utils import encode_cursor, get_keyset_condition
+from utils.partial_json_parser import PartialJsonParser
+from utils.slide_outlines_parser import SlideOutlinesParser
+from utils.parsers import parse_bool_or_none, parse_int_or_none
 import uuid
 
 
 PRESENTATION_ROUTER = APIRouter(prefix="/presentation", tags=["Presentation"])
 
+MAX_PRESENTATIONS_PAGE_SIZE = 100
+GENERATION_PROGRESS_HEARTBEAT_INTERVAL = 15
+
+PRESENTATION_SUMMARY_FIELDS = (
+    "id",
+    "n_slides",
+    "language",
+    "title",
+    "created_at",
+    "updated_at",
+    "tone",
+    "verbosity",
+)
+PRESENTATION_SUMMARY_COLUMNS = tuple(
+    getattr(PresentationModel, field) for field in PRESENTATION_SUMMARY_FIELDS
+)
+SLIDE_SUMMARY_FIELDS = tuple(SlideSummary.model_fields.keys())
+SLIDE_SUMMARY_COLUMNS = tuple(
+    getattr(SlideModel, field).label(f"slide_{field}")
+    for field in SLIDE_SUMMARY_FIELDS
+)
 
-@PRESENTATION_ROUTER.get("/all", response_model=List[PresentationWithSlides])
-async def get_all_presentations(sql_session: AsyncSession = Depends(get_async_session)):
-    presentations_with_slides = []
 
-    query = (
-        select(PresentationModel, SlideModel)
-        .join(
-            SlideModel,
-            (SlideModel.presentation == PresentationModel.id) & (SlideModel.index == 0),
+@PRESENTATION_ROUTER.get("/all", response_model=List[PresentationSummary])
+async def get_all_presentations(
+    response: Response,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PRESENTATIONS_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    title: Optional[str] = None,
+    include_total: bool = False,
+    sql_session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Lists presentations with their first slide, newest first.
+    Only the columns needed for the listing are loaded. Pages are keyset paginated
+    on (created_at, id): pass the X-Next-Cursor header of a page as cursor to get
+    the next one. X-Total-Count is set if include_total is true.
+    """
+    filters = [
+        SlideModel.presentation == PresentationModel.id,
+        SlideModel.index == 0,
+    ]
+    if title:
+        filters.append(PresentationModel.title.ilike(f"%{title}%"))
+
+    if include_total:
+        total = await sql_session.scalar(
+            select(func.count(PresentationModel.id)).join(SlideModel, and_(*filters))
         )
-        .order_by(PresentationModel.created_at.desc())
+        response.headers["X-Total-Count"] = str(total)
+
+    query = (
+        select(*PRESENTATION_SUMMARY_COLUMNS, *SLIDE_SUMMARY_COLUMNS)
+        .join(SlideModel, and_(*filters))
+        .order_by(PresentationModel.created_at.desc(), PresentationModel.id.desc())
     )
+    if cursor:
+        query = query.where(
+            get_keyset_condition(
+                PresentationModel.created_at, PresentationModel.id, cursor
+            )
+        )
+    if limit:
+        query = query.limit(limit + 1)
+
+    rows = (await sql_session.execute(query)).all()
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            rows[-1].created_at, rows[-1].id
+        )
 
-    results = await sql_session.execute(query)
-    rows = results.all()
-    presentations_with_slides = [
-        PresentationWithSlides(
-            **presentation.model_dump(),
-            slides=[first_slide],
+    n_presentation_columns = len(PRESENTATION_SUMMARY_COLUMNS)
+    return [
+        PresentationSummary(
+            **dict(zip(PRESENTATION_SUMMARY_FIELDS, row[:n_presentation_columns])),
+            slides=[
+                SlideSummary(
+                    **dict(zip(SLIDE_SUMMARY_FIELDS, row[n_presentation_columns:]))
+                )
+            ],
         )
-        for presentation, first_slide in rows
+        for row in rows
     ]
-    return presentations_with_slides
 
 
 @PRESENTATION_ROUTER.get("/{id}", response_model=PresentationWithSlides)
@@ -251,7 +344,9 @@ async def prepare_presentation(
     sql_session.add(presentation)
     presentation.outlines = presentation_outline_model.model_dump(mode="json")
     presentation.title = title or presentation.title
-    presentation.set_layout(layout)
+    await PRESENTATION_LAYOUT_STORE.set_presentation_layout(
+        sql_session, presentation, layout
+    )
     presentation.set_structure(presentation_structure)
     await sql_session.commit()
 
@@ -276,11 +371,13 @@ async def stream_presentation(
             detail="Outlines can not be empty",
         )
 
+    layout = await PRESENTATION_LAYOUT_STORE.get_presentation_layout(
+        sql_session, presentation
+    )
     image_generation_service = ImageGenerationService(get_images_directory())
 
     async def inner():
         structure = presentation.get_structure()
-        layout = presentation.get_layout()
         outline = presentation.get_presentation_outline()
 
         # These tasks will be gathered and awaited after all slides are generated
@@ -294,15 +391,41 @@ async def stream_presentation(
         for i, slide_layout_index in enumerate(structure.slides):
             slide_layout = layout.slides[slide_layout_index]
 
+            # Fields are sent as patches while the slide content streams
+            slide_content_text = ""
+            parser = PartialJsonParser()
             try:
-                slide_content = await get_slide_content_from_type_and_outline(
+                async for chunk in stream_slide_content_from_type_and_outline(
                     slide_layout,
                     outline.slides[i],
                     presentation.language,
                     presentation.tone,
                     presentation.verbosity,
                     presentation.instructions,
-                )
+                ):
+                    if isinstance(chunk, HTTPException):
+                        raise chunk
+                    slide_content_text += chunk
+                    for patch in parser.feed(chunk):
+                        yield SSESlidePatchResponse(
+                            index=i,
+                            layout=slide_layout.id,
+                            layout_group=layout.name,
+                            patch=patch,
+                        ).to_string()
+
+                try:
+                    slide_content = dict(dirtyjson.loads(slide_content_text))
+                except Exception as e:
+                    print(f"Failed to parse streamed slide {i}, generating again: {e}")
+                    slide_content = await get_slide_content_from_type_and_outline(
+                        slide_layout,
+                        outline.slides[i],
+                        presentation.language,
+                        presentation.tone,
+                        presentation.verbosity,
+                        presentation.instructions,
+                    )
             except HTTPException as e:
                 yield SSEErrorResponse(detail=e.detail).to_string()
                 return
@@ -347,8 +470,7 @@ async def stream_presentation(
         await sql_session.commit()
 
         sql_session.add(presentation)
-        sql_session.add_all(slides)
-        sql_session.add_all(generated_assets)
+        await bulk_insert_models(sql_session, [*slides, *generated_assets])
         await sql_session.commit()
 
         response = PresentationWithSlides(
@@ -364,17 +486,30 @@ async def stream_presentation(
     return StreamingResponse(inner(), media_type="text/event-stream")
 
 
-@PRESENTATION_ROUTER.patch("/update", response_model=PresentationWithSlides)
+@PRESENTATION_ROUTER.patch("/update", response_model=PresentationUpdateResponse)
 async def update_presentation(
     id: Annotated[uuid.UUID, Body()],
     n_slides: Annotated[Optional[int], Body()] = None,
     title: Annotated[Optional[str], Body()] = None,
     slides: Annotated[Optional[List[SlideModel]], Body()] = None,
+    expected_version: Annotated[Optional[int], Body()] = None,
     sql_session: AsyncSession = Depends(get_async_session),
 ):
+    """
+    Updates presentation and writes only the slides that changed.
+    Incoming slides are matched to stored ones by id and compared by content hash;
+    new slides are inserted, changed ones updated and missing ones deleted.
+    Version is incremented on every change. If expected_version is given and does
+    not match, or another update lands first, the request fails with 409.
+    """
     presentation = await sql_session.get(PresentationModel, id)
     if not presentation:
         raise HTTPException(status_code=404, detail="Presentation not found")
+    if expected_version is not None and expected_version != presentation.version:
+        raise HTTPException(
+            status_code=409,
+            detail="Presentation has been modified. Please reload and try again.",
+        )
 
     presentation_update_dict = {}
     if n_slides:
@@ -382,54 +517,150 @@ async def update_presentation(
     if title:
         presentation_update_dict["title"] = title
 
-    if n_slides or title:
-        presentation.sqlmodel_update(presentation_update_dict)
-
+    inserted_slides: List[SlideModel] = []
+    updated_slides: List[SlideModel] = []
+    deleted_slide_ids: List[uuid.UUID] = []
     if slides:
         # Just to make sure id is UUID
         for slide in slides:
             slide.presentation = uuid.UUID(slide.presentation)
             slide.id = uuid.UUID(slide.id)
+            slide.content_hash = slide.get_content_hash()
 
-        await sql_session.execute(
-            delete(SlideModel).where(SlideModel.presentation == presentation.id)
+        stored_slide_hashes = dict(
+            (
+                await sql_session.execute(
+                    select(SlideModel.id, SlideModel.content_hash).where(
+                        SlideModel.presentation == presentation.id
+                    )
+                )
+            ).all()
+        )
+        incoming_slide_ids = {slide.id for slide in slides}
+        for slide in slides:
+            if slide.id not in stored_slide_hashes:
+                inserted_slides.append(slide)
+            elif stored_slide_hashes[slide.id] != slide.content_hash:
+                updated_slides.append(slide)
+        deleted_slide_ids = [
+            slide_id
+            for slide_id in stored_slide_hashes
+            if slide_id not in incoming_slide_ids
+        ]
+
+    if (
+        presentation_update_dict
+        or inserted_slides
+        or updated_slides
+        or deleted_slide_ids
+    ):
+        # Conditional update guards against concurrent writers and locks the row
+        result = await sql_session.execute(
+            update(PresentationModel)
+            .where(
+                PresentationModel.id == presentation.id,
+                PresentationModel.version == presentation.version,
+            )
+            .values(version=PresentationModel.version + 1, **presentation_update_dict)
         )
-        sql_session.add_all(slides)
+        if result.rowcount == 0:
+            await sql_session.rollback()
+            raise HTTPException(
+                status_code=409,
+                detail="Presentation has been modified. Please reload and try again.",
+            )
 
-    await sql_session.commit()
+        if deleted_slide_ids:
+            await sql_session.execute(
+                delete(SlideModel).where(SlideModel.id.in_(deleted_slide_ids))
+            )
+        if updated_slides:
+            await sql_session.execute(
+                update(SlideModel), [slide.model_dump() for slide in updated_slides]
+            )
+        sql_session.add_all(inserted_slides)
+        await sql_session.commit()
+        await sql_session.refresh(presentation)
 
-    return PresentationWithSlides(
+    return PresentationUpdateResponse(
         **presentation.model_dump(),
         slides=slides or [],
+        inserted_slides=[slide.id for slide in inserted_slides],
+        updated_slides=[slide.id for slide in updated_slides],
+        deleted_slides=deleted_slide_ids,
     )
 
 
 @PRESENTATION_ROUTER.post("/export/pptx", response_model=str)
 async def export_presentation_as_pptx(
+    request: Request,
     pptx_model: Annotated[PptxPresentationModel, Body()],
+    stream: Annotated[
+        bool, Query(description="Return the PPTX file in the response body")
+    ] = False,
+    persist: Annotated[
+        bool,
+        Query(description="Keep the PPTX in the exports directory when streaming"),
+    ] = True,
 ):
+    if not (stream or persist):
+        raise HTTPException(
+            status_code=400, detail="Persist can only be disabled when streaming"
+        )
+
     temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
 
-    pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
+    pptx_creator = PptxPresentationCreator(
+        pptx_model, temp_dir, get_image_compression_options()
+    )
     await pptx_creator.create_ppt()
 
-    export_directory = get_exports_directory()
+    export_directory = get_exports_directory() if persist else temp_dir
     pptx_path = os.path.join(
         export_directory, f"{pptx_model.name or uuid.uuid4()}.pptx"
     )
     pptx_creator.save(pptx_path)
+    print(f"Export stats: {pptx_creator.stats.to_log_string()}")
+    PROMETHEUS_METRICS.observe_export("pptx", pptx_creator.stats)
+
+    if stream:
+        return get_file_download_response(request, pptx_path, delete_after=not persist)
 
     return pptx_path
 
 
 @PRESENTATION_ROUTER.post("/export", response_model=PresentationPathAndEditPath)
 async def export_presentation_as_pptx_or_pdf(
+    request: Request,
     id: Annotated[uuid.UUID, Body(description="Presentation ID to export")],
     export_as: Annotated[
         Literal["pptx", "pdf"], Body(description="Format to export the presentation as")
     ] = "pptx",
+    image_compression: Annotated[
+        Optional[PptxImageCompressionModel],
+        Body(description="Downsample and recompress images in the exported PPTX"),
+    ] = None,
+    pdf_renderer: Annotated[
+        Optional[PdfRenderer],
+        Body(description="Renderer used for PDF export"),
+    ] = None,
+    stream: Annotated[
+        bool, Body(description="Return the exported file in the response body")
+    ] = False,
+    persist: Annotated[
+        bool,
+        Body(description="Keep the exported file in the exports directory when streaming"),
+    ] = True,
+    include_export_stats: Annotated[
+        bool, Body(description="Include per-stage export timings and counts")
+    ] = False,
     sql_session: AsyncSession = Depends(get_async_session),
 ):
+    if not (stream or persist):
+        raise HTTPException(
+            status_code=400, detail="Persist can only be disabled when streaming"
+        )
+
     presentation = await sql_session.get(PresentationModel, id)
 
     if not presentation:
@@ -439,8 +670,17 @@ async def export_presentation_as_pptx_or_pdf(
         id,
         presentation.title or str(uuid.uuid4()),
         export_as,
+        image_compression,
+        pdf_renderer,
+        persist,
+        include_export_stats,
     )
 
+    if stream:
+        return get_file_download_response(
+            request, presentation_and_path.path, delete_after=not persist
+        )
+
     return PresentationPathAndEditPath(
         **presentation_and_path.model_dump(),
         edit_path=f"/presentation?id={id}",
@@ -503,27 +743,47 @@ async def generate_presentation_handler(
     )
     usage_tracker = OpenAIUsageTracker(enabled=track_openai_usage)
 
+    # Slide contents started while outlines are still streaming, with their outlines
+    prefetched_slide_contents: Dict[int, Tuple[SlideOutlineModel, asyncio.Task]] = {}
+
     try:
-        with usage_tracker.activate():
+        with usage_tracker.activate(), TRACING_SERVICE.start_span(
+            "generate_presentation",
+            presentation_id=str(presentation_id),
+            n_slides=request.n_slides,
+            template=request.template,
+        ) as generation_span:
             using_slides_markdown = False
 
             if request.slides_markdown:
                 using_slides_markdown = True
                 request.n_slides = len(request.slides_markdown)
 
+            # Parse Layouts
+            with TRACING_SERVICE.start_span("layout_loading"):
+                layout_model = await get_layout_by_name(request.template)
+            total_slide_layouts = len(layout_model.slides)
+
+            # Slides are generated in groups of this many per LLM call
+            group_size = max(
+                parse_int_or_none(get_slide_content_batch_size_env()) or 1, 1
+            )
+
             if not using_slides_markdown:
                 additional_context = ""
 
                 # Updating async status
                 if async_status:
-                    async_status.message = "Generating presentation outlines"
-                    async_status.updated_at = datetime.now()
-                    sql_session.add(async_status)
-                    await sql_session.commit()
+                    await GENERATION_PROGRESS_SERVICE.update_task(
+                        sql_session, async_status, "Generating presentation outlines"
+                    )
 
                 if request.files:
                     documents_loader = DocumentsLoader(file_paths=request.files)
-                    await documents_loader.load_documents()
+                    with TRACING_SERVICE.start_span(
+                        "document_loading", n_files=len(request.files)
+                    ):
+                        await documents_loader.load_documents()
                     documents = documents_loader.documents
                     if documents:
                         additional_context = "\n\n".join(documents)
@@ -543,37 +803,97 @@ async def generate_presentation_handler(
                         (request.n_slides - needed_toc_count) / 10
                     )
 
+                # Layouts of ordered templates are known before outlines, so
+                # content of each slide is generated as soon as its outline is
+                # complete, unless table of contents slides shift the slides
+                prefetch_slide_contents = (
+                    layout_model.ordered
+                    and not request.include_table_of_contents
+                    and group_size == 1
+                )
+                slide_outlines_parser = SlideOutlinesParser(n_slides_to_generate)
+
+                def prefetch_slide_content(index: int, outline: SlideOutlineModel):
+                    if index >= total_slide_layouts:
+                        return
+                    slide_layout = layout_model.slides[index]
+
+                    async def get_content():
+                        with TRACING_SERVICE.start_span(
+                            "slide_content",
+                            slide_index=index,
+                            layout=slide_layout.id,
+                            prefetched=True,
+                        ):
+                            return await get_slide_content_from_type_and_outline(
+                                slide_layout,
+                                outline,
+                                request.language,
+                                request.tone.value,
+                                request.verbosity.value,
+                                request.instructions,
+                            )
+
+                    prefetched_slide_contents[index] = (
+                        outline,
+                        asyncio.create_task(get_content()),
+                    )
+
                 presentation_outlines_text = ""
-                async for chunk in generate_ppt_outline(
-                    request.content,
-                    n_slides_to_generate,
-                    request.language,
-                    additional_context,
-                    request.tone.value,
-                    request.verbosity.value,
-                    request.instructions,
-                    request.include_title_slide,
-                    request.web_search,
-                ):
+                with TRACING_SERVICE.start_span("outline_generation"):
+                    async for chunk in generate_ppt_outline(
+                        request.content,
+                        n_slides_to_generate,
+                        request.language,
+                        additional_context,
+                        request.tone.value,
+                        request.verbosity.value,
+                        request.instructions,
+                        request.include_title_slide,
+                        request.web_search,
+                    ):
 
-                    if isinstance(chunk, HTTPException):
-                        raise chunk
+                        if isinstance(chunk, HTTPException):
+                            raise chunk
 
-                    presentation_outlines_text += chunk
+                        presentation_outlines_text += chunk
 
-                try:
-                    presentation_outlines_json = dict(
-                        dirtyjson.loads(presentation_outlines_text)
-                    )
-                except Exception:
-                    traceback.print_exc()
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Failed to generate presentation outlines. Please try again.",
-                    )
-                presentation_outlines = PresentationOutlineModel(
-                    **presentation_outlines_json
+                        first_index = len(slide_outlines_parser.slides)
+                        for index, slide_outline in enumerate(
+                            slide_outlines_parser.feed(chunk), first_index
+                        ):
+                            if prefetch_slide_contents:
+                                prefetch_slide_content(index, slide_outline)
+
+                # Outlines are parsed from the full text only if streamed outlines are not valid
+                presentation_outlines = (
+                    slide_outlines_parser.get_presentation_outlines()
                 )
+                if not presentation_outlines:
+                    try:
+                        presentation_outlines_json = dict(
+                            dirtyjson.loads(presentation_outlines_text)
+                        )
+                    except Exception:
+                        traceback.print_exc()
+                        raise HTTPException(
+                            status_code=400,
+                            detail="Failed to generate presentation outlines. Please try again.",
+                        )
+                    presentation_outlines = PresentationOutlineModel(
+                        **presentation_outlines_json
+                    )
+
+                    # Dropping slide contents of outlines that were parsed differently
+                    for index, (outline, task) in list(
+                        prefetched_slide_contents.items()
+                    ):
+                        if (
+                            index >= len(presentation_outlines.slides)
+                            or presentation_outlines.slides[index] != outline
+                        ):
+                            task.cancel()
+                            del prefetched_slide_contents[index]
                 total_outlines = n_slides_to_generate
 
             else:
@@ -588,30 +908,26 @@ async def generate_presentation_handler(
 
             # Updating async status
             if async_status:
-                async_status.message = "Selecting layout for each slide"
-                async_status.updated_at = datetime.now()
-                sql_session.add(async_status)
-                await sql_session.commit()
+                await GENERATION_PROGRESS_SERVICE.update_task(
+                    sql_session, async_status, "Selecting layout for each slide"
+                )
 
             print("-" * 40)
             print(f"Generated {total_outlines} outlines for the presentation")
 
-            # Parse Layouts
-            layout_model = await get_layout_by_name(request.template)
-            total_slide_layouts = len(layout_model.slides)
-
             # Generate Structure
             if layout_model.ordered:
                 presentation_structure = layout_model.to_presentation_structure()
             else:
-                presentation_structure: PresentationStructureModel = (
-                    await generate_presentation_structure(
-                        presentation_outlines,
-                        layout_model,
-                        request.instructions,
-                        using_slides_markdown,
+                with TRACING_SERVICE.start_span("structure_generation"):
+                    presentation_structure: PresentationStructureModel = (
+                        await generate_presentation_structure(
+                            presentation_outlines,
+                            layout_model,
+                            request.instructions,
+                            using_slides_markdown,
+                        )
                     )
-                )
 
             presentation_structure.slides = presentation_structure.slides[:total_outlines]
             for index in range(total_outlines):
@@ -669,20 +985,12 @@ async def generate_presentation_handler(
                 language=request.language,
                 title=get_presentation_title_from_outlines(presentation_outlines),
                 outlines=presentation_outlines.model_dump(),
-                layout=layout_model.model_dump(),
                 structure=presentation_structure.model_dump(),
                 tone=request.tone.value,
                 verbosity=request.verbosity.value,
                 instructions=request.instructions,
             )
 
-            # Updating async status
-            if async_status:
-                async_status.message = "Generating slides"
-                async_status.updated_at = datetime.now()
-                sql_session.add(async_status)
-                await sql_session.commit()
-
             image_generation_service = ImageGenerationService(get_images_directory())
             async_assets_generation_tasks = []
 
@@ -692,79 +1000,173 @@ async def generate_presentation_handler(
             slide_layout_indices = presentation_structure.slides
             slide_layouts = [layout_model.slides[idx] for idx in slide_layout_indices]
 
-            # Schedule slide content generation and asset fetching in batches of 10
-            batch_size = 10
-            for start in range(0, len(slide_layouts), batch_size):
-                end = min(start + batch_size, len(slide_layouts))
-
-                print(f"Generating slides from {start} to {end}")
+            # Updating async status, this is persisted as a checkpoint
+            if async_status:
+                await GENERATION_PROGRESS_SERVICE.update_task(
+                    sql_session,
+                    async_status,
+                    "Generating slides",
+                    persist=True,
+                    total_slides=len(slide_layouts),
+                    completed_slides=0,
+                )
 
-                # Generate contents for this batch concurrently
-                content_tasks = [
-                    get_slide_content_from_type_and_outline(
-                        slide_layouts[i],
-                        presentation_outlines.slides[i],
+            n_generated_slides = 0
+
+            async def get_slide_content(index: int) -> dict:
+                nonlocal n_generated_slides
+                prefetched = prefetched_slide_contents.pop(index, None)
+                if prefetched:
+                    slide_content = await prefetched[1]
+                else:
+                    with TRACING_SERVICE.start_span(
+                        "slide_content",
+                        slide_index=index,
+                        layout=slide_layouts[index].id,
+                    ):
+                        slide_content = await get_slide_content_from_type_and_outline(
+                            slide_layouts[index],
+                            presentation_outlines.slides[index],
+                            request.language,
+                            request.tone.value,
+                            request.verbosity.value,
+                            request.instructions,
+                        )
+                n_generated_slides += 1
+                if async_status:
+                    await GENERATION_PROGRESS_SERVICE.update_task(
+                        sql_session,
+                        async_status,
+                        "Generating slides",
+                        total_slides=len(slide_layouts),
+                        completed_slides=n_generated_slides,
+                        slide_index=index,
+                    )
+                return slide_content
+
+            async def get_slide_contents(indices: List[int]) -> List[dict]:
+                nonlocal n_generated_slides
+                with TRACING_SERVICE.start_span(
+                    "slide_content_batch",
+                    slide_index=indices[0],
+                    n_slides=len(indices),
+                ):
+                    slide_contents = await get_slide_contents_from_types_and_outlines(
+                        [slide_layouts[index] for index in indices],
+                        [presentation_outlines.slides[index] for index in indices],
                         request.language,
                         request.tone.value,
                         request.verbosity.value,
                         request.instructions,
                     )
-                    for i in range(start, end)
-                ]
-                batch_contents: List[dict] = await asyncio.gather(*content_tasks)
-
-                # Build slides for this batch
-                batch_slides: List[SlideModel] = []
-                for offset, slide_content in enumerate(batch_contents):
-                    i = start + offset
-                    slide_layout = slide_layouts[i]
-                    slide = SlideModel(
-                        presentation=presentation_id,
-                        layout_group=layout_model.name,
-                        layout=slide_layout.id,
-                        index=i,
-                        speaker_note=slide_content.get("__speaker_note__"),
-                        content=slide_content,
+                n_generated_slides += len(indices)
+                if async_status:
+                    await GENERATION_PROGRESS_SERVICE.update_task(
+                        sql_session,
+                        async_status,
+                        "Generating slides",
+                        total_slides=len(slide_layouts),
+                        completed_slides=n_generated_slides,
+                        slide_index=indices[-1],
                     )
-                    slides.append(slide)
-                    batch_slides.append(slide)
+                return slide_contents
+
+            async def fetch_slide_assets(slide: SlideModel) -> List[ImageAsset]:
+                with TRACING_SERVICE.start_span("slide_assets", slide_index=slide.index):
+                    return await process_slide_and_fetch_assets(
+                        image_generation_service, slide
+                    )
+
+            # Schedule slide content generation and asset fetching in batches of 10
+            batch_size = 10
+            with TRACING_SERVICE.start_span(
+                "slide_content_generation", n_slides=len(slide_layouts)
+            ):
+                for start in range(0, len(slide_layouts), batch_size):
+                    end = min(start + batch_size, len(slide_layouts))
+
+                    print(f"Generating slides from {start} to {end}")
+
+                    # Generate contents for this batch concurrently
+                    if group_size > 1:
+                        content_tasks = [
+                            get_slide_contents(
+                                list(
+                                    range(
+                                        group_start, min(group_start + group_size, end)
+                                    )
+                                )
+                            )
+                            for group_start in range(start, end, group_size)
+                        ]
+                        batch_contents: List[dict] = [
+                            slide_content
+                            for group_contents in await asyncio.gather(*content_tasks)
+                            for slide_content in group_contents
+                        ]
+                    else:
+                        content_tasks = [get_slide_content(i) for i in range(start, end)]
+                        batch_contents: List[dict] = await asyncio.gather(*content_tasks)
+
+                    # Build slides for this batch
+                    batch_slides: List[SlideModel] = []
+                    for offset, slide_content in enumerate(batch_contents):
+                        i = start + offset
+                        slide_layout = slide_layouts[i]
+                        slide = SlideModel(
+                            presentation=presentation_id,
+                            layout_group=layout_model.name,
+                            layout=slide_layout.id,
+                            index=i,
+                            speaker_note=slide_content.get("__speaker_note__"),
+                            content=slide_content,
+                        )
+                        slides.append(slide)
+                        batch_slides.append(slide)
 
-                # Start asset fetch tasks for just-generated slides so they run while next batch is processed
-                asset_tasks = [
-                    process_slide_and_fetch_assets(image_generation_service, slide)
-                    for slide in batch_slides
-                ]
-                async_assets_generation_tasks.extend(asset_tasks)
+                    # Start asset fetch tasks for just-generated slides so they run while next batch is processed
+                    asset_tasks = [fetch_slide_assets(slide) for slide in batch_slides]
+                    async_assets_generation_tasks.extend(asset_tasks)
 
             if async_status:
-                async_status.message = "Fetching assets for slides"
-                async_status.updated_at = datetime.now()
-                sql_session.add(async_status)
-                await sql_session.commit()
+                await GENERATION_PROGRESS_SERVICE.update_task(
+                    sql_session, async_status, "Fetching assets for slides"
+                )
 
             # Run all asset tasks concurrently while batches may still be generating content
-            generated_assets_list = await asyncio.gather(*async_assets_generation_tasks)
+            with TRACING_SERVICE.start_span("asset_fetching"):
+                generated_assets_list = await asyncio.gather(
+                    *async_assets_generation_tasks
+                )
             generated_assets = []
             for assets_list in generated_assets_list:
                 generated_assets.extend(assets_list)
 
             # 8. Save PresentationModel and Slides
-            sql_session.add(presentation)
-            sql_session.add_all(slides)
-            sql_session.add_all(generated_assets)
-            await sql_session.commit()
+            # Layout is stored here so no write transaction is held during generation
+            with TRACING_SERVICE.start_span("save"):
+                presentation.layout_hash = await PRESENTATION_LAYOUT_STORE.save(
+                    sql_session, layout_model
+                )
+                sql_session.add(presentation)
+                await bulk_insert_models(sql_session, [*slides, *generated_assets])
+                await sql_session.commit()
 
             if async_status:
-                async_status.message = "Exporting presentation"
-                async_status.updated_at = datetime.now()
-                sql_session.add(async_status)
+                await GENERATION_PROGRESS_SERVICE.update_task(
+                    sql_session, async_status, "Exporting presentation"
+                )
 
             # 9. Export
-            presentation_and_path = await export_presentation(
-                presentation_id,
-                presentation.title or str(uuid.uuid4()),
-                request.export_as,
-            )
+            with TRACING_SERVICE.start_span("export", export_as=request.export_as):
+                presentation_and_path = await export_presentation(
+                    presentation_id,
+                    presentation.title or str(uuid.uuid4()),
+                    request.export_as,
+                    request.image_compression,
+                    request.pdf_renderer,
+                    include_stats=request.include_export_stats,
+                )
 
             response = PresentationPathAndEditPath(
                 **presentation_and_path.model_dump(),
@@ -772,14 +1174,18 @@ async def generate_presentation_handler(
             )
             if track_openai_usage:
                 response.openai_usage = usage_tracker.build_summary()
+            if request.include_timings:
+                response.timings = generation_span.get_timing_breakdown()
 
             if async_status:
-                async_status.message = "Presentation generation completed"
-                async_status.status = "completed"
                 async_status.data = response.model_dump(mode="json")
-                async_status.updated_at = datetime.now()
-                sql_session.add(async_status)
-                await sql_session.commit()
+                await GENERATION_PROGRESS_SERVICE.update_task(
+                    sql_session,
+                    async_status,
+                    "Presentation generation completed",
+                    status="completed",
+                    persist=True,
+                )
 
             # Triggering webhook on success
             CONCURRENT_SERVICE.run_task(
@@ -807,16 +1213,22 @@ async def generate_presentation_handler(
         )
 
         if async_status:
-            async_status.status = "error"
-            async_status.message = "Presentation generation failed"
-            async_status.updated_at = datetime.now()
             async_status.error = api_error_model.model_dump(mode="json")
-            sql_session.add(async_status)
-            await sql_session.commit()
+            await GENERATION_PROGRESS_SERVICE.update_task(
+                sql_session,
+                async_status,
+                "Presentation generation failed",
+                status="error",
+                persist=True,
+            )
 
         else:
             raise e
 
+    finally:
+        for _, task in prefetched_slide_contents.values():
+            task.cancel()
+
 
 @PRESENTATION_ROUTER.post("/generate", response_model=PresentationPathAndEditPath)
 async def generate_presentation_sync(
@@ -876,6 +1288,11 @@ async def check_async_presentation_generation_status(
     id: str = Path(description="ID of the presentation generation task"),
     sql_session: AsyncSession = Depends(get_async_session),
 ):
+    # Latest progress is fresher than the database, which only has checkpoints
+    progress = await GENERATION_PROGRESS_SERVICE.get_latest(id)
+    if progress:
+        return progress.to_task()
+
     status = await sql_session.get(AsyncPresentationGenerationTaskModel, id)
     if not status:
         raise HTTPException(
@@ -884,6 +1301,67 @@ async def check_async_presentation_generation_status(
     return status
 
 
+@PRESENTATION_ROUTER.get("/status/{id}/stream")
+async def stream_async_presentation_generation_status(
+    id: str = Path(description="ID of the presentation generation task"),
+    sql_session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Streams progress of an async presentation generation task as server sent
+    events, including per slide progress, until it completes or fails.
+    """
+
+    async def get_progress() -> Optional[GenerationProgressEvent]:
+        progress = await GENERATION_PROGRESS_SERVICE.get_latest(id)
+        if progress:
+            return progress
+        status = await sql_session.get(
+            AsyncPresentationGenerationTaskModel, id, populate_existing=True
+        )
+        return GenerationProgressEvent.from_task(status) if status else None
+
+    if not await get_progress():
+        raise HTTPException(
+            status_code=404, detail="No presentation generation task found"
+        )
+
+    def to_sse(progress: GenerationProgressEvent) -> str:
+        return SSEResponse(
+            event="progress", data=progress.model_dump_json()
+        ).to_string()
+
+    # Task row is gone once its presentation is deleted
+    task_not_found = SSEErrorResponse(
+        detail="No presentation generation task found"
+    ).to_string()
+
+    async def inner():
+        async with GENERATION_PROGRESS_SERVICE.subscribe(id) as subscription:
+            # Read after subscribing so no event is missed in between
+            progress = await get_progress()
+            if not progress:
+                yield task_not_found
+                return
+            yield to_sse(progress)
+            while not progress.is_terminal:
+                next_progress = await subscription.get(
+                    GENERATION_PROGRESS_HEARTBEAT_INTERVAL
+                )
+                if next_progress is None:
+                    # Task may be running in another worker without a shared broker
+                    next_progress = await get_progress()
+                    if not next_progress:
+                        yield task_not_found
+                        return
+                    if not next_progress.is_terminal:
+                        yield ": keep-alive\n\n"
+                        continue
+                progress = next_progress
+                yield to_sse(progress)
+
+    return StreamingResponse(inner(), media_type="text/event-stream")
+
+
 @PRESENTATION_ROUTER.post("/edit", response_model=PresentationPathAndEditPath)
 async def edit_presentation_with_new_content(
     data: Annotated[EditPresentationRequest, Body()],
@@ -915,11 +1393,16 @@ async def edit_presentation_with_new_content(
         delete(SlideModel).where(SlideModel.id.in_(slides_to_delete))
     )
 
-    sql_session.add_all(new_slides)
+    await bulk_insert_models(sql_session, new_slides)
     await sql_session.commit()
 
     presentation_and_path = await export_presentation(
-        presentation.id, presentation.title or str(uuid.uuid4()), data.export_as
+        presentation.id,
+        presentation.title or str(uuid.uuid4()),
+        data.export_as,
+        data.image_compression,
+        data.pdf_renderer,
+        include_stats=data.include_export_stats,
     )
 
     return PresentationPathAndEditPath(
@@ -955,11 +1438,16 @@ async def derive_presentation_from_existing_one(
         )
 
     sql_session.add(new_presentation)
-    sql_session.add_all(new_slides)
+    await bulk_insert_models(sql_session, new_slides)
     await sql_session.commit()
 
     presentation_and_path = await export_presentation(
-        new_presentation.id, new_presentation.title or str(uuid.uuid4()), data.export_as
+        new_presentation.id,
+        new_presentation.title or str(uuid.uuid4()),
+        data.export_as,
+        data.image_compression,
+        data.pdf_renderer,
+        include_stats=data.include_export_stats,
     )
 
     return PresentationPathAndEditPath(
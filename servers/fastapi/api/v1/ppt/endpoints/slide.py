@@ -7,6 +7,7 @@ from models.sql.presentation import PresentationModel
 from models.sql.slide import SlideModel
 from services.database import get_async_session
 from services.image_generation_service import ImageGenerationService
+from services.presentation_layout_store import PRESENTATION_LAYOUT_STORE
 from utils.asset_directory_utils import get_images_directory
 from utils.llm_calls.edit_slide import get_edited_slide_content
 from utils.llm_calls.edit_slide_html import get_edited_slide_html
@@ -31,7 +32,9 @@ async def edit_slide(
     if not presentation:
         raise HTTPException(status_code=404, detail="Presentation not found")
 
-    presentation_layout = presentation.get_layout()
+    presentation_layout = await PRESENTATION_LAYOUT_STORE.get_presentation_layout(
+        sql_session, presentation
+    )
     slide_layout = await get_slide_layout_from_prompt(
         prompt, presentation_layout, slide
     )
@@ -9,8 +9,12 @@ from openai import OpenAI
 from openai import APIError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete, func
+from enums.llm_call_purpose import LLMCallPurpose
+from enums.llm_call_type import LLMCallType
+from enums.llm_provider import LLMProvider
 from utils.asset_directory_utils import get_images_directory
 from services.database import get_async_session
+from services.llm_call_metrics import LLM_CALL_METRICS, record_llm_request
 from models.sql.presentation_layout_code import PresentationLayoutCodeModel
 from .prompts import (
     GENERATE_HTML_SYSTEM_PROMPT,
@@ -176,12 +180,19 @@ async def generate_html_from_slide(
         ]
 
         print("Making Responses API request for HTML generation...")
-        response = client.responses.create(
-            model="gpt-5",
-            input=input_payload,
-            reasoning={"effort": "high"},
-            text={"verbosity": "low"},
-        )
+        with LLM_CALL_METRICS.track(
+            LLMCallPurpose.HTML,
+            LLMCallType.UNSTRUCTURED,
+            LLMProvider.OPENAI,
+            "gpt-5",
+        ):
+            response = client.responses.create(
+                model="gpt-5",
+                input=input_payload,
+                reasoning={"effort": "high"},
+                text={"verbosity": "low"},
+            )
+            record_llm_request(response.usage)
 
         # Extract the response text
         html_content = (
@@ -261,12 +272,19 @@ async def generate_react_component_from_html(
             {"role": "user", "content": content_parts},
         ]
 
-        response = client.responses.create(
-            model="gpt-5",
-            input=input_payload,
-            reasoning={"effort": "minimal"},
-            text={"verbosity": "low"},
-        )
+        with LLM_CALL_METRICS.track(
+            LLMCallPurpose.HTML_TO_REACT,
+            LLMCallType.UNSTRUCTURED,
+            LLMProvider.OPENAI,
+            "gpt-5",
+        ):
+            response = client.responses.create(
+                model="gpt-5",
+                input=input_payload,
+                reasoning={"effort": "minimal"},
+                text={"verbosity": "low"},
+            )
+            record_llm_request(response.usage)
 
         react_content = (
             getattr(response, "output_text", None)
@@ -383,12 +401,19 @@ async def edit_html_with_images(
             {"role": "user", "content": content_parts},
         ]
 
-        response = client.responses.create(
-            model="gpt-5",
-            input=input_payload,
-            reasoning={"effort": "low"},
-            text={"verbosity": "low"},
-        )
+        with LLM_CALL_METRICS.track(
+            LLMCallPurpose.HTML,
+            LLMCallType.UNSTRUCTURED,
+            LLMProvider.OPENAI,
+            "gpt-5",
+        ):
+            response = client.responses.create(
+                model="gpt-5",
+                input=input_payload,
+                reasoning={"effort": "low"},
+                text={"verbosity": "low"},
+            )
+            record_llm_request(response.usage)
 
         edited_html = (
             getattr(response, "output_text", None)
@@ -0,0 +1,156 @@
+"""
+Compares database size and slide read latency with uncompressed and compressed
+slide content and html_content columns.
+
+Each mode writes the same presentations into a fresh SQLite file, then loads all
+slides of random presentations, like opening decks in the editor.
+
+Usage: python -m benchmarks.bench_column_compression [--presentations N] [--slides N] [--reads N]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+from utils.compression_utils import ZSTANDARD_AVAILABLE
+
+WORDS = (
+    "revenue growth market customer product strategy team quarter platform "
+    "launch pipeline retention margin forecast region partner roadmap hiring "
+    "analytics pricing churn expansion cohort funnel conversion benchmark"
+).split()
+
+
+def _get_text(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def _get_slide(rng: random.Random, presentation_id: uuid.UUID, index: int):
+    content = {
+        "title": _get_text(rng, 6),
+        "description": _get_text(rng, 60),
+        "bulletPoints": [
+            {"title": _get_text(rng, 4), "description": _get_text(rng, 30)}
+            for _ in range(5)
+        ],
+        "image": {
+            "__image_url__": f"https://images.example.com/{uuid.uuid4()}.jpg",
+            "__image_prompt__": _get_text(rng, 12),
+        },
+    }
+    html_content = (
+        "<div class='w-full h-full flex flex-col px-16 py-12 bg-white'>"
+        + "".join(
+            f"<div class='flex items-start gap-4 mb-6'><span class='text-lg "
+            f"font-semibold text-slate-800'>{_get_text(rng, 4)}</span>"
+            f"<p class='text-base text-slate-600 leading-relaxed'>"
+            f"{_get_text(rng, 30)}</p></div>"
+            for _ in range(5)
+        )
+        + "</div>"
+    )
+    return SlideModel(
+        presentation=presentation_id,
+        layout_group="general",
+        layout="general:bullet-points",
+        index=index,
+        content=content,
+        html_content=html_content,
+        properties=None,
+    )
+
+
+async def _run_mode(
+    name: str, database_path: str, n_presentations: int, n_slides: int, reads: int
+):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: SQLModel.metadata.create_all(
+                sync_conn,
+                tables=[PresentationModel.__table__, SlideModel.__table__],
+            )
+        )
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    # Same seed so every mode stores identical data
+    rng = random.Random(0)
+    presentation_ids = []
+    start = time.perf_counter()
+    async with session_maker() as session:
+        for _ in range(n_presentations):
+            presentation = PresentationModel(
+                content="benchmark", n_slides=n_slides, language="en"
+            )
+            presentation_ids.append(presentation.id)
+            session.add(presentation)
+            session.add_all(
+                [_get_slide(rng, presentation.id, index) for index in range(n_slides)]
+            )
+        await session.commit()
+    write_elapsed = time.perf_counter() - start
+
+    latencies = []
+    for _ in range(reads):
+        presentation_id = rng.choice(presentation_ids)
+        start = time.perf_counter()
+        async with session_maker() as session:
+            slides = (
+                await session.scalars(
+                    select(SlideModel)
+                    .where(SlideModel.presentation == presentation_id)
+                    .order_by(SlideModel.index)
+                )
+            ).all()
+        latencies.append(time.perf_counter() - start)
+        assert len(slides) == n_slides
+    await engine.dispose()
+
+    latencies.sort()
+    print(
+        f"{name}: db_size={os.path.getsize(database_path) / 1024 / 1024:.2f}MiB "
+        f"write={write_elapsed:.2f}s "
+        f"read_p50={statistics.median(latencies) * 1000:.2f}ms "
+        f"read_p95={latencies[int(len(latencies) * 0.95) - 1] * 1000:.2f}ms"
+    )
+
+
+async def run(n_presentations: int, n_slides: int, reads: int):
+    modes = ["none", "zlib"]
+    if ZSTANDARD_AVAILABLE:
+        modes.append("zstd")
+    else:
+        print("zstandard is not installed, skipping zstd")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for mode in modes:
+            if mode == "none":
+                os.environ.pop("DATABASE_COMPRESSION", None)
+            else:
+                os.environ["DATABASE_COMPRESSION"] = mode
+            await _run_mode(
+                mode,
+                os.path.join(temp_dir, f"{mode}.db"),
+                n_presentations,
+                n_slides,
+                reads,
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--presentations", type=int, default=200)
+    parser.add_argument("--slides", type=int, default=15)
+    parser.add_argument("--reads", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.presentations, args.slides, args.reads))
@@ -0,0 +1,120 @@
+"""
+Compares concurrent generation-like database load on the default engine and the
+backend-tuned engine profile.
+
+Each job writes a presentation with its slides in one transaction while readers
+keep loading slides, similar to several generation jobs and editors sharing one DB.
+
+Usage: python -m benchmarks.bench_database_concurrency [--database-url URL] [--jobs N] [--slides N] [--readers N]
+Without --database-url a temporary SQLite file is used.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Optional
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+from utils.db_utils import create_tuned_async_engine
+
+
+async def _write_job(session_maker: async_sessionmaker, n_slides: int):
+    presentation_id = uuid.uuid4()
+    async with session_maker() as session:
+        session.add(
+            PresentationModel(
+                id=presentation_id, content="benchmark", n_slides=n_slides, language="en"
+            )
+        )
+        await session.commit()
+        for index in range(n_slides):
+            session.add(
+                SlideModel(
+                    presentation=presentation_id,
+                    layout_group="general",
+                    layout="general:basic",
+                    index=index,
+                    content={"title": f"Slide {index}", "body": "x" * 2000},
+                )
+            )
+            # Generation commits as it goes, which is where writers contend
+            await session.commit()
+
+
+async def _read_loop(session_maker: async_sessionmaker, stop: asyncio.Event) -> int:
+    reads = 0
+    while not stop.is_set():
+        async with session_maker() as session:
+            await session.scalars(select(SlideModel).limit(50))
+        reads += 1
+    return reads
+
+
+async def _run_profile(
+    name: str, engine: AsyncEngine, jobs: int, n_slides: int, readers: int
+):
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: SQLModel.metadata.create_all(
+                sync_conn,
+                tables=[PresentationModel.__table__, SlideModel.__table__],
+            )
+        )
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    stop = asyncio.Event()
+    reader_tasks = [
+        asyncio.create_task(_read_loop(session_maker, stop)) for _ in range(readers)
+    ]
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *[_write_job(session_maker, n_slides) for _ in range(jobs)],
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    reads = sum(await asyncio.gather(*reader_tasks))
+    errors = [result for result in results if isinstance(result, Exception)]
+    await engine.dispose()
+
+    print(
+        f"{name}: jobs={jobs} slides={n_slides} elapsed={elapsed:.2f}s "
+        f"slide_writes/s={jobs * n_slides / elapsed:.0f} reads/s={reads / elapsed:.0f} "
+        f"errors={len(errors)}"
+    )
+    if errors:
+        print(f"  first error: {errors[0]!r}")
+
+
+async def run(database_url: Optional[str], jobs: int, n_slides: int, readers: int):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name, create_engine in (
+            ("default", lambda url, args: create_async_engine(url, connect_args=args)),
+            ("tuned", create_tuned_async_engine),
+        ):
+            url = database_url or (
+                f"sqlite+aiosqlite:///{os.path.join(temp_dir, name + '.db')}"
+            )
+            connect_args = {"check_same_thread": False} if "sqlite" in url else {}
+            await _run_profile(
+                name, create_engine(url, connect_args), jobs, n_slides, readers
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--slides", type=int, default=20)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(run(args.database_url, args.jobs, args.slides, args.readers))
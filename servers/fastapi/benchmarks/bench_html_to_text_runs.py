@@ -0,0 +1,44 @@
+"""
+Micro-benchmark for parse_html_text_to_text_runs on large markdown-heavy slides.
+
+Usage: python -m benchmarks.bench_html_to_text_runs [--paragraphs N] [--repeat N]
+"""
+
+import argparse
+import time
+
+from models.pptx_models import PptxFontModel
+from services.html_to_text_runs_service import parse_html_text_to_text_runs
+
+
+PARAGRAPH = (
+    "<strong>Revenue</strong> grew <em>23%</em> year over year, driven by "
+    "<b>enterprise</b> adoption and <u>new markets</u>. Use <code>api.v2</code> "
+    "for <s>legacy</s> integrations.\n<strong><em>Key takeaway:</em></strong> "
+    "margins improved across <i>all</i> regions."
+)
+
+
+def run(paragraphs: int, repeat: int):
+    base_font = PptxFontModel(name="Inter", size=18, color="222222")
+    text = "\n".join([PARAGRAPH] * paragraphs)
+
+    timings = []
+    runs_count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        runs = parse_html_text_to_text_runs(text, base_font)
+        timings.append(time.perf_counter() - start)
+        runs_count = len(runs)
+
+    timings.sort()
+    print(f"paragraphs={paragraphs} runs={runs_count} repeat={repeat}")
+    print(f"best={timings[0] * 1000:.2f}ms median={timings[len(timings) // 2] * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--paragraphs", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.paragraphs, args.repeat)
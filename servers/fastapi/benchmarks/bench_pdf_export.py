@@ -0,0 +1,103 @@
+"""
+Compares PDF export through the Next.js browser renderer with the pooled
+LibreOffice renderer for an existing presentation. Needs the full stack running.
+
+Reports wall time and peak RSS. LibreOffice workers are children of this process,
+so their peak is read from RUSAGE_CHILDREN. The browser renders inside the Next.js
+server, pass its pid with --browser-pid to sample the RSS of its process tree.
+
+Usage: python -m benchmarks.bench_pdf_export --presentation-id ID [--runs N] [--browser-pid PID]
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import threading
+import time
+from typing import Optional
+import uuid
+
+from enums.pdf_renderer import PdfRenderer
+from utils.export_utils import export_presentation
+
+
+def _get_tree_rss_kb(pid: int) -> int:
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+                        break
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as f:
+                    pending.extend(int(child) for child in f.read().split())
+        except (FileNotFoundError, ProcessLookupError):
+            continue
+    return total
+
+
+class _RssSampler:
+    def __init__(self, pid: int, interval: float = 0.05):
+        self.pid = pid
+        self.interval = interval
+        self.peak_kb = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak_kb = max(self.peak_kb, _get_tree_rss_kb(self.pid))
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._stop.set()
+        self._thread.join()
+
+
+async def _export(presentation_id: uuid.UUID, renderer: PdfRenderer) -> float:
+    start = time.perf_counter()
+    await export_presentation(
+        presentation_id, f"benchmark-{renderer.value}", "pdf", pdf_renderer=renderer
+    )
+    return time.perf_counter() - start
+
+
+async def run(presentation_id: uuid.UUID, runs: int, browser_pid: Optional[int]):
+    for renderer in (PdfRenderer.BROWSER, PdfRenderer.LIBREOFFICE):
+        timings = []
+        peak_kb = 0
+        for _ in range(runs):
+            if renderer == PdfRenderer.BROWSER and browser_pid:
+                with _RssSampler(browser_pid) as sampler:
+                    timings.append(await _export(presentation_id, renderer))
+                peak_kb = max(peak_kb, sampler.peak_kb)
+            else:
+                timings.append(await _export(presentation_id, renderer))
+
+        if renderer == PdfRenderer.LIBREOFFICE:
+            peak_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+        timings.sort()
+        peak = f"{peak_kb / 1024:.1f}MB" if peak_kb else "n/a"
+        print(
+            f"{renderer.value}: best={timings[0]:.2f}s "
+            f"median={timings[len(timings) // 2]:.2f}s peak_rss={peak}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--presentation-id", type=uuid.UUID, required=True)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--browser-pid", type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(run(args.presentation_id, args.runs, args.browser_pid))
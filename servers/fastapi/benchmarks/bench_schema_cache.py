@@ -0,0 +1,144 @@
+"""
+Compares preprocessing slide layout schemas on every slide call with the
+JSON schema cache.
+
+Each call builds the response schema of a layout, removing asset urls and adding
+the speaker note, then the OpenAI strict variant and the Gemini tool variant, as
+slide content calls with those providers do.
+
+Usage: python -m benchmarks.bench_schema_cache [--layouts N] [--calls N]
+"""
+
+import argparse
+import time
+
+from models.presentation_layout import SlideLayoutModel
+from services.json_schema_cache import JSON_SCHEMA_CACHE
+from utils.llm_calls.generate_slide_content import get_response_schema
+from utils.schema_utils import (
+    add_field_in_schema,
+    ensure_strict_json_schema,
+    flatten_json_schema,
+    remove_fields_from_schema,
+    remove_titles_from_schema,
+)
+
+
+def _get_string(title: str, max_length: int) -> dict:
+    return {
+        "type": "string",
+        "title": title,
+        "minLength": 10,
+        "maxLength": max_length,
+        "description": f"{title} of the slide",
+    }
+
+
+def _get_image() -> dict:
+    return {
+        "type": "object",
+        "title": "Image",
+        "properties": {
+            "__image_url__": {"type": "string", "format": "uri"},
+            "__image_prompt__": _get_string("Image prompt", 50),
+        },
+        "required": ["__image_url__", "__image_prompt__"],
+    }
+
+
+def _get_layout(index: int) -> SlideLayoutModel:
+    item = {
+        "type": "object",
+        "title": "Item",
+        "properties": {
+            "heading": _get_string("Heading", 40),
+            "description": _get_string("Description", 150),
+            "icon": {
+                "type": "object",
+                "title": "Icon",
+                "properties": {
+                    "__icon_url__": {"type": "string"},
+                    "__icon_query__": _get_string("Icon query", 30),
+                },
+                "required": ["__icon_url__", "__icon_query__"],
+            },
+            "image": _get_image(),
+        },
+        "required": ["heading", "description", "icon"],
+    }
+    return SlideLayoutModel(
+        id=f"layout-{index}",
+        json_schema={
+            "type": "object",
+            "title": f"Layout {index}",
+            "properties": {
+                "title": _get_string("Title", 60),
+                "description": _get_string("Description", 300),
+                "image": _get_image(),
+                "items": {
+                    "type": "array",
+                    "minItems": 2,
+                    "maxItems": 6,
+                    "items": item,
+                },
+            },
+            "required": ["title", "description", "items"],
+        },
+    )
+
+
+def _preprocess(layout: SlideLayoutModel):
+    response_schema = remove_fields_from_schema(
+        layout.json_schema, ["__image_url__", "__icon_url__"]
+    )
+    response_schema = add_field_in_schema(
+        response_schema,
+        {
+            "__speaker_note__": {
+                "type": "string",
+                "minLength": 100,
+                "maxLength": 250,
+                "description": "Speaker note for the slide",
+            }
+        },
+        True,
+    )
+    ensure_strict_json_schema(response_schema, path=(), root=response_schema)
+    remove_titles_from_schema(flatten_json_schema(response_schema))
+
+
+def _preprocess_cached(layout: SlideLayoutModel):
+    response_schema = get_response_schema(layout)
+    JSON_SCHEMA_CACHE.get_strict(response_schema)
+    JSON_SCHEMA_CACHE.get_flattened(response_schema)
+
+
+def _measure(calls: int, layouts: list, preprocess) -> float:
+    start = time.perf_counter()
+    for call in range(calls):
+        preprocess(layouts[call % len(layouts)])
+    return time.perf_counter() - start
+
+
+def run(n_layouts: int, calls: int):
+    layouts = [_get_layout(index) for index in range(n_layouts)]
+    JSON_SCHEMA_CACHE.clear()
+
+    uncached = _measure(calls, layouts, _preprocess)
+    cached = _measure(calls, layouts, _preprocess_cached)
+
+    print(f"layouts={n_layouts} calls={calls}")
+    print(f"uncached: {uncached / calls * 1e6:.1f}us per call")
+    print(
+        f"cached: {cached / calls * 1e6:.1f}us per call "
+        f"({uncached / cached:.1f}x faster, "
+        f"hits={JSON_SCHEMA_CACHE.hits} misses={JSON_SCHEMA_CACHE.misses})"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--layouts", type=int, default=12)
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+    run(args.layouts, args.calls)
@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class LLMCallPurpose(Enum):
+    OUTLINE = "outline"
+    STRUCTURE = "structure"
+    SLIDE_CONTENT = "slide_content"
+    SLIDE_CONTENT_BATCH = "slide_content_batch"
+    EDIT = "edit"
+    EDIT_HTML = "edit_html"
+    LAYOUT_SELECTION = "layout_selection"
+    HTML = "html"
+    HTML_TO_REACT = "html_to_react"
+    OTHER = "other"
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class PdfRenderer(Enum):
+    BROWSER = "browser"
+    LIBREOFFICE = "libreoffice"
@@ -0,0 +1,18 @@
+from typing import List
+
+from migrations import (
+    m0001_hot_query_indexes,
+    m0002_presentation_layout_store,
+    m0003_slide_versions,
+)
+from utils.migration_utils import Migration
+
+
+# Append new migrations with the next version. Never edit or reorder applied ones.
+MIGRATIONS: List[Migration] = [
+    Migration(1, "hot_query_indexes", m0001_hot_query_indexes.upgrade),
+    Migration(
+        2, "presentation_layout_store", m0002_presentation_layout_store.upgrade
+    ),
+    Migration(3, "slide_versions", m0003_slide_versions.upgrade),
+]
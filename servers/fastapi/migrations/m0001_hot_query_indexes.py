@@ -0,0 +1,28 @@
+from sqlalchemy import Connection
+
+from utils.migration_utils import create_index_if_missing
+
+
+def upgrade(conn: Connection):
+    # Slides of a presentation ordered by index, and first slide lookups
+    create_index_if_missing(
+        conn, "slides", "ix_slides_presentation_index", ["presentation", "index"]
+    )
+    # Presentation listing ordered by (created_at, id)
+    create_index_if_missing(
+        conn, "presentations", "ix_presentations_created_at_id", ["created_at", "id"]
+    )
+    # Generated and uploaded image galleries ordered by created_at
+    create_index_if_missing(
+        conn,
+        "imageasset",
+        "ix_imageasset_is_uploaded_created_at",
+        ["is_uploaded", "created_at"],
+    )
+    # Layout counts and last update per presentation
+    create_index_if_missing(
+        conn,
+        "presentation_layout_codes",
+        "ix_presentation_layout_codes_presentation_updated_at",
+        ["presentation", "updated_at"],
+    )
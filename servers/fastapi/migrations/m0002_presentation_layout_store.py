@@ -0,0 +1,69 @@
+from sqlalchemy import Column, Connection, String, null, select, update
+
+from models.presentation_layout import PresentationLayoutModel
+from models.sql.presentation_layout import PresentationLayoutSqlModel
+from services.presentation_layout_store import get_layout_dict_hash
+from utils.datetime_utils import get_current_utc_datetime
+from utils.db_utils import get_insert_ignore
+from utils.migration_utils import add_column_if_missing, get_table, has_table
+
+BATCH_SIZE = 500
+
+
+def get_layout_json(layout: dict) -> dict:
+    # Hash the same canonical form the layout store uses for new presentations
+    try:
+        return PresentationLayoutModel(**layout).model_dump(mode="json")
+    except Exception:
+        return layout
+
+
+def upgrade(conn: Connection):
+    """
+    Moves inline presentation layouts into the content addressed layout store.
+    """
+    if not has_table(conn, "presentations"):
+        return
+
+    PresentationLayoutSqlModel.__table__.create(conn, checkfirst=True)
+    add_column_if_missing(
+        conn, "presentations", Column("layout_hash", String(64), nullable=True)
+    )
+
+    presentations = get_table(conn, "presentations")
+    layouts = PresentationLayoutSqlModel.__table__
+    stored_hashes = set()
+    last_id = None
+    while True:
+        query = (
+            select(presentations.c.id, presentations.c.layout)
+            .where(presentations.c.layout_hash.is_(None))
+            .order_by(presentations.c.id)
+            .limit(BATCH_SIZE)
+        )
+        if last_id is not None:
+            query = query.where(presentations.c.id > last_id)
+        rows = conn.execute(query).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        for row in rows:
+            if not row.layout:
+                continue
+            layout = get_layout_json(row.layout)
+            layout_hash = get_layout_dict_hash(layout)
+            if layout_hash not in stored_hashes:
+                conn.execute(
+                    get_insert_ignore(layouts, conn.dialect.name).values(
+                        hash=layout_hash,
+                        layout=layout,
+                        created_at=get_current_utc_datetime(),
+                    )
+                )
+                stored_hashes.add(layout_hash)
+            conn.execute(
+                update(presentations)
+                .where(presentations.c.id == row.id)
+                .values(layout_hash=layout_hash, layout=null())
+            )
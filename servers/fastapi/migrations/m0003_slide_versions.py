@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Connection, Integer, String
+
+from utils.migration_utils import add_column_if_missing
+
+
+def upgrade(conn: Connection):
+    add_column_if_missing(
+        conn,
+        "presentations",
+        Column("version", Integer, nullable=False, server_default="1"),
+    )
+    # Left empty for existing slides, they are hashed on their next write
+    add_column_if_missing(
+        conn, "slides", Column("content_hash", String(64), nullable=True)
+    )
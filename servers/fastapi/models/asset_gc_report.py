@@ -0,0 +1,33 @@
+from typing import Dict
+
+from pydantic import BaseModel, Field
+
+
+class AssetGcReport(BaseModel):
+    dry_run: bool = False
+    referenced_images: int = 0
+    # Files, directories or rows removed and bytes freed per asset category
+    deleted: Dict[str, int] = Field(default_factory=dict)
+    reclaimed_bytes: Dict[str, int] = Field(default_factory=dict)
+    duration: float = 0.0
+
+    @property
+    def total_reclaimed_bytes(self) -> int:
+        return sum(self.reclaimed_bytes.values())
+
+    def add(self, category: str, n_bytes: int):
+        self.deleted[category] = self.deleted.get(category, 0) + 1
+        self.reclaimed_bytes[category] = (
+            self.reclaimed_bytes.get(category, 0) + n_bytes
+        )
+
+    def to_log_string(self) -> str:
+        categories = ", ".join(
+            f"{category}={self.deleted[category]} ({self.reclaimed_bytes[category]} bytes)"
+            for category in self.deleted
+        )
+        return (
+            f"dry_run={self.dry_run} referenced_images={self.referenced_images} "
+            f"reclaimed_bytes={self.total_reclaimed_bytes} "
+            f"duration={self.duration:.3f}s [{categories}]"
+        )
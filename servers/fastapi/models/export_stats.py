@@ -0,0 +1,45 @@
+from contextlib import contextmanager
+import time
+from typing import Dict
+
+from pydantic import BaseModel, Field
+
+
+class ExportStatsModel(BaseModel):
+    # Seconds spent in each export stage
+    timings: Dict[str, float] = Field(default_factory=dict)
+    slides: int = 0
+    shapes: int = 0
+    pictures: int = 0
+    assets_downloaded: int = 0
+    bytes_downloaded: int = 0
+    asset_cache_hits: int = 0
+    artifact_bytes: int = 0
+
+    @contextmanager
+    def time_stage(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_timing(stage, time.perf_counter() - start)
+
+    def add_timing(self, stage: str, seconds: float):
+        self.timings[stage] = round(self.timings.get(stage, 0.0) + seconds, 6)
+
+    def get_slowest_stage(self) -> str | None:
+        if not self.timings:
+            return None
+        return max(self.timings, key=self.timings.get)
+
+    def to_log_string(self) -> str:
+        timings = ", ".join(
+            f"{stage}={seconds:.3f}s" for stage, seconds in self.timings.items()
+        )
+        return (
+            f"slides={self.slides} shapes={self.shapes} pictures={self.pictures} "
+            f"assets_downloaded={self.assets_downloaded} "
+            f"bytes_downloaded={self.bytes_downloaded} "
+            f"asset_cache_hits={self.asset_cache_hits} "
+            f"artifact_bytes={self.artifact_bytes} [{timings}]"
+        )
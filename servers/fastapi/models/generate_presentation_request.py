@@ -1,8 +1,10 @@
 from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
 
+from enums.pdf_renderer import PdfRenderer
 from enums.tone import Tone
 from enums.verbosity import Verbosity
+from models.pptx_models import PptxImageCompressionModel
 
 
 class GeneratePresentationRequest(BaseModel):
@@ -37,6 +39,22 @@ class GeneratePresentationRequest(BaseModel):
     export_as: Literal["pptx", "pdf"] = Field(
         default="pptx", description="Export format"
     )
+    pdf_renderer: Optional[PdfRenderer] = Field(
+        default=None,
+        description="Renderer used for PDF export, defaults to PDF_EXPORT_RENDERER",
+    )
+    image_compression: Optional[PptxImageCompressionModel] = Field(
+        default=None,
+        description="Downsample and recompress images in the exported PPTX",
+    )
+    include_export_stats: bool = Field(
+        default=False,
+        description="Whether to include per-stage export timings and counts",
+    )
+    include_timings: bool = Field(
+        default=False,
+        description="Whether to include time spent in each generation stage",
+    )
     trigger_webhook: bool = Field(
         default=False, description="Whether to trigger subscribed webhooks"
     )
@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from models.sql.async_presentation_generation_status import (
+    AsyncPresentationGenerationTaskModel,
+)
+
+
+TERMINAL_GENERATION_STATUSES = ("completed", "error")
+
+
+class GenerationProgressEvent(BaseModel):
+    task_id: str
+    status: str
+    message: Optional[str] = None
+    total_slides: Optional[int] = None
+    completed_slides: Optional[int] = None
+    slide_index: Optional[int] = None
+    data: Optional[dict] = None
+    error: Optional[dict] = None
+    created_at: Optional[datetime] = None
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in TERMINAL_GENERATION_STATUSES
+
+    @classmethod
+    def from_task(
+        cls, task: AsyncPresentationGenerationTaskModel, **progress
+    ) -> "GenerationProgressEvent":
+        return cls(
+            task_id=task.id,
+            status=task.status,
+            message=task.message,
+            data=task.data,
+            error=task.error,
+            created_at=task.created_at,
+            updated_at=task.updated_at,
+            **progress,
+        )
+
+    def to_task(self) -> AsyncPresentationGenerationTaskModel:
+        return AsyncPresentationGenerationTaskModel(
+            id=self.task_id,
+            status=self.status,
+            message=self.message,
+            data=self.data,
+            error=self.error,
+            created_at=self.created_at or self.updated_at,
+            updated_at=self.updated_at,
+        )
@@ -0,0 +1,14 @@
+from datetime import datetime
+from typing import Optional
+import uuid
+
+from pydantic import BaseModel
+
+
+class ImageAssetWithThumbnail(BaseModel):
+    id: uuid.UUID
+    created_at: datetime
+    is_uploaded: bool
+    path: str
+    extras: Optional[dict] = None
+    thumbnail: str
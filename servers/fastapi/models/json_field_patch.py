@@ -0,0 +1,11 @@
+from typing import Any, List
+
+from pydantic import BaseModel
+
+
+class JsonFieldPatch(BaseModel):
+    # Keys and array indices from the root of the document to the field
+    path: List[str | int]
+    value: Any
+    # Whether the value is complete, strings are also sent while streaming
+    done: bool
@@ -0,0 +1,28 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from enums.llm_provider import LLMProvider
+
+
+class LLMEndpointConfig(BaseModel):
+    name: str
+    provider: LLMProvider
+    api_key: Optional[str] = None
+    # OpenAI compatible base url, used by openai, ollama and custom endpoints
+    base_url: Optional[str] = None
+    # Model to use instead of the one requested, needed by endpoints of other providers
+    model: Optional[str] = None
+    weight: float = Field(default=1.0, gt=0)
+    # Fallback endpoints are only used once all other endpoints failed
+    fallback: bool = False
+
+
+class LLMEndpointHealth(BaseModel):
+    name: str
+    provider: LLMProvider
+    state: str
+    latency: Optional[float] = None
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
@@ -165,6 +165,18 @@ class PptxSlideModel(BaseModel):
     ]
 
 
+class PptxImageCompressionModel(BaseModel):
+    dpi: int = 150
+    quality: int = 85
+
+
+class PptxImageCompressionStatsModel(BaseModel):
+    images: int = 0
+    original_bytes: int = 0
+    compressed_bytes: int = 0
+    bytes_saved: int = 0
+
+
 class PptxPresentationModel(BaseModel):
     name: Optional[str] = None
     shapes: Optional[List[PptxShapeModel]] = None
@@ -3,14 +3,20 @@ from typing import Optional
 
 from pydantic import BaseModel
 
+from models.export_stats import ExportStatsModel
 from models.openai_usage_cost import OpenAIUsageCostSummary
+from models.pptx_models import PptxImageCompressionStatsModel
+from models.timing_breakdown import TimingBreakdownModel
 
 
 class PresentationAndPath(BaseModel):
     presentation_id: uuid.UUID
     path: str
+    image_compression: Optional[PptxImageCompressionStatsModel] = None
+    export_stats: Optional[ExportStatsModel] = None
 
 
 class PresentationPathAndEditPath(PresentationAndPath):
     edit_path: str
     openai_usage: Optional[OpenAIUsageCostSummary] = None
+    timings: Optional[TimingBreakdownModel] = None
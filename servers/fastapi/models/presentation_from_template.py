@@ -1,7 +1,10 @@
-from typing import List, Literal
+from typing import List, Literal, Optional
 from pydantic import BaseModel
 import uuid
 
+from enums.pdf_renderer import PdfRenderer
+from models.pptx_models import PptxImageCompressionModel
+
 
 class SlideContentUpdate(BaseModel):
     index: int
@@ -12,3 +15,6 @@ class EditPresentationRequest(BaseModel):
     presentation_id: uuid.UUID
     slides: List[SlideContentUpdate]
     export_as: Literal["pptx", "pdf"] = "pptx"
+    image_compression: Optional[PptxImageCompressionModel] = None
+    pdf_renderer: Optional[PdfRenderer] = None
+    include_export_stats: bool = False
@@ -0,0 +1,27 @@
+from typing import List, Optional
+from datetime import datetime
+import uuid
+
+from pydantic import BaseModel
+
+
+class SlideSummary(BaseModel):
+    id: uuid.UUID
+    presentation: uuid.UUID
+    layout_group: str
+    layout: str
+    index: int
+    content: dict
+    properties: Optional[dict] = None
+
+
+class PresentationSummary(BaseModel):
+    id: uuid.UUID
+    n_slides: int
+    language: str
+    title: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    tone: Optional[str] = None
+    verbosity: Optional[str] = None
+    slides: List[SlideSummary]
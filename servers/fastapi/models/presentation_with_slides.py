@@ -17,4 +17,11 @@ class PresentationWithSlides(BaseModel):
     updated_at: datetime
     tone: Optional[str] = None
     verbosity: Optional[str] = None
+    version: Optional[int] = None
     slides: List[SlideModel]
+
+
+class PresentationUpdateResponse(PresentationWithSlides):
+    inserted_slides: List[uuid.UUID] = []
+    updated_slides: List[uuid.UUID] = []
+    deleted_slides: List[uuid.UUID] = []
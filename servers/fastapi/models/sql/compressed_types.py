@@ -0,0 +1,55 @@
+import json
+
+from sqlalchemy import JSON, Text
+from sqlalchemy.types import TypeDecorator
+
+from utils.compression_utils import (
+    compress_text_if_enabled,
+    decompress_text,
+    get_compression_codec,
+    is_compressed,
+)
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text column that stores large values compressed if DATABASE_COMPRESSION is set.
+    Uncompressed values, including existing rows, are read as they are.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return compress_text_if_enabled(value) or value
+
+    def process_result_value(self, value, dialect):
+        if value is not None and is_compressed(value):
+            return decompress_text(value)
+        return value
+
+
+class CompressedJSON(TypeDecorator):
+    """
+    JSON column that stores large values as a compressed JSON string if
+    DATABASE_COMPRESSION is set, so the column stays valid JSON on every backend.
+    Uncompressed values, including existing rows, are read as they are.
+    """
+
+    impl = JSON
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or not get_compression_codec():
+            return value
+        compressed = compress_text_if_enabled(
+            json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+        )
+        return compressed or value
+
+    def process_result_value(self, value, dialect):
+        if isinstance(value, str) and is_compressed(value):
+            return json.loads(decompress_text(value))
+        return value
@@ -2,13 +2,17 @@ from datetime import datetime
 from typing import Optional
 import uuid
 
-from sqlalchemy import JSON, Column, DateTime
+from sqlalchemy import JSON, Column, DateTime, Index
 from sqlmodel import Field, SQLModel
 
 from utils.datetime_utils import get_current_utc_datetime
 
 
 class ImageAsset(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_imageasset_is_uploaded_created_at", "is_uploaded", "created_at"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     created_at: datetime = Field(
         sa_column=Column(
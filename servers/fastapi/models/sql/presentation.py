@@ -1,17 +1,18 @@
 from datetime import datetime
 from typing import List, Optional
 import uuid
-from sqlalchemy import JSON, Column, DateTime, String
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String
 from sqlmodel import Boolean, Field, SQLModel
 
-from models.presentation_layout import PresentationLayoutModel
 from models.presentation_outline_model import PresentationOutlineModel
 from models.presentation_structure_model import PresentationStructureModel
+from models.sql.compressed_types import CompressedJSON
 from utils.datetime_utils import get_current_utc_datetime
 
 
 class PresentationModel(SQLModel, table=True):
     __tablename__ = "presentations"
+    __table_args__ = (Index("ix_presentations_created_at_id", "created_at", "id"),)
 
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
     content: str
@@ -19,7 +20,7 @@ class PresentationModel(SQLModel, table=True):
     language: str
     title: Optional[str] = None
     file_paths: Optional[List[str]] = Field(sa_column=Column(JSON), default=None)
-    outlines: Optional[dict] = Field(sa_column=Column(JSON), default=None)
+    outlines: Optional[dict] = Field(sa_column=Column(CompressedJSON), default=None)
     created_at: datetime = Field(
         sa_column=Column(
             DateTime(timezone=True), nullable=False, default=get_current_utc_datetime
@@ -33,7 +34,9 @@ class PresentationModel(SQLModel, table=True):
             onupdate=get_current_utc_datetime,
         ),
     )
+    # Inline layout of presentations created before the layout store
     layout: Optional[dict] = Field(sa_column=Column(JSON), default=None)
+    layout_hash: Optional[str] = Field(sa_column=Column(String(64)), default=None)
     structure: Optional[dict] = Field(sa_column=Column(JSON), default=None)
     instructions: Optional[str] = Field(sa_column=Column(String), default=None)
     tone: Optional[str] = Field(sa_column=Column(String), default=None)
@@ -41,6 +44,11 @@ class PresentationModel(SQLModel, table=True):
     include_table_of_contents: bool = Field(sa_column=Column(Boolean), default=False)
     include_title_slide: bool = Field(sa_column=Column(Boolean), default=True)
     web_search: bool = Field(sa_column=Column(Boolean), default=False)
+    # Incremented on every update, used for optimistic concurrency
+    version: int = Field(
+        default=1,
+        sa_column=Column(Integer, nullable=False, default=1, server_default="1"),
+    )
 
     def get_new_presentation(self):
         return PresentationModel(
@@ -52,6 +60,7 @@ class PresentationModel(SQLModel, table=True):
             file_paths=self.file_paths,
             outlines=self.outlines,
             layout=self.layout,
+            layout_hash=self.layout_hash,
             structure=self.structure,
             instructions=self.instructions,
             tone=self.tone,
@@ -65,12 +74,6 @@ class PresentationModel(SQLModel, table=True):
             return None
         return PresentationOutlineModel(**self.outlines)
 
-    def get_layout(self):
-        return PresentationLayoutModel(**self.layout)
-
-    def set_layout(self, layout: PresentationLayoutModel):
-        self.layout = layout.model_dump()
-
     def get_structure(self):
         if not self.structure:
             return None
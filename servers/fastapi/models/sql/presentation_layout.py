@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, String
+from sqlmodel import Field, SQLModel
+
+from utils.datetime_utils import get_current_utc_datetime
+
+
+class PresentationLayoutSqlModel(SQLModel, table=True):
+    """
+    Presentation layouts deduplicated by the sha256 of their canonical JSON.
+    Rows are immutable, presentations reference them by hash.
+    """
+
+    __tablename__ = "presentation_layouts"
+
+    hash: str = Field(sa_column=Column(String(64), primary_key=True))
+    layout: dict = Field(sa_column=Column(JSON, nullable=False))
+    created_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True), nullable=False, default=get_current_utc_datetime
+        ),
+    )
@@ -1,9 +1,10 @@
 from datetime import datetime
 from typing import Optional, List
 import uuid
-from sqlalchemy import Column, DateTime, Text, JSON
+from sqlalchemy import Column, DateTime, Index, JSON
 from sqlmodel import SQLModel, Field
 
+from models.sql.compressed_types import CompressedText
 from utils.datetime_utils import get_current_utc_datetime
 
 
@@ -11,13 +12,21 @@ class PresentationLayoutCodeModel(SQLModel, table=True):
     """Model for storing presentation layout codes"""
 
     __tablename__ = "presentation_layout_codes"
+    __table_args__ = (
+        Index(
+            "ix_presentation_layout_codes_presentation_updated_at",
+            "presentation",
+            "updated_at",
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     presentation: uuid.UUID = Field(index=True, description="UUID of the presentation")
     layout_id: str = Field(description="Unique identifier for the layout")
     layout_name: str = Field(description="Display name of the layout")
     layout_code: str = Field(
-        sa_column=Column(Text), description="TSX/React component code for the layout"
+        sa_column=Column(CompressedText),
+        description="TSX/React component code for the layout",
     )
     fonts: Optional[List[str]] = Field(
         sa_column=Column(JSON), default=None, description="Optional list of font links"
@@ -1,11 +1,16 @@
+import hashlib
+import json
 from typing import Optional
 import uuid
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, String, event
 from sqlmodel import Field, Column, JSON, SQLModel
 
+from models.sql.compressed_types import CompressedJSON, CompressedText
+
 
 class SlideModel(SQLModel, table=True):
     __tablename__ = "slides"
+    __table_args__ = (Index("ix_slides_presentation_index", "presentation", "index"),)
 
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
     presentation: uuid.UUID = Field(
@@ -14,10 +19,26 @@ class SlideModel(SQLModel, table=True):
     layout_group: str
     layout: str
     index: int
-    content: dict = Field(sa_column=Column(JSON))
-    html_content: Optional[str]
+    content: dict = Field(sa_column=Column(CompressedJSON))
+    html_content: Optional[str] = Field(sa_column=Column(CompressedText))
     speaker_note: Optional[str] = None
     properties: Optional[dict] = Field(sa_column=Column(JSON))
+    content_hash: Optional[str] = Field(sa_column=Column(String(64)), default=None)
+
+    def get_content_hash(self) -> str:
+        slide_json = {
+            "layout_group": self.layout_group,
+            "layout": self.layout,
+            "index": self.index,
+            "content": self.content,
+            "html_content": self.html_content,
+            "speaker_note": self.speaker_note,
+            "properties": self.properties,
+        }
+        canonical_json = json.dumps(
+            slide_json, sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical_json.encode()).hexdigest()
 
     def get_new_slide(self, presentation: uuid.UUID, content: Optional[dict] = None):
         return SlideModel(
@@ -30,3 +51,9 @@ class SlideModel(SQLModel, table=True):
             content=content or self.content,
             properties=self.properties,
         )
+
+
+@event.listens_for(SlideModel, "before_insert")
+@event.listens_for(SlideModel, "before_update")
+def _set_slide_content_hash(_, __, slide: SlideModel):
+    slide.content_hash = slide.get_content_hash()
@@ -2,6 +2,9 @@ import json
 
 from pydantic import BaseModel
 
+from models.json_field_patch import JsonFieldPatch
+from models.presentation_outline_model import SlideOutlineModel
+
 
 class SSEResponse(BaseModel):
     event: str
@@ -38,3 +41,41 @@ class SSECompleteResponse(BaseModel):
             event="response",
             data=json.dumps({"type": "complete", self.key: self.value}),
         ).to_string()
+
+
+class SSESlidePatchResponse(BaseModel):
+    index: int
+    layout: str
+    layout_group: str
+    patch: JsonFieldPatch
+
+    def to_string(self):
+        return SSEResponse(
+            event="response",
+            data=json.dumps(
+                {
+                    "type": "patch",
+                    "index": self.index,
+                    "layout": self.layout,
+                    "layout_group": self.layout_group,
+                    **self.patch.model_dump(mode="json"),
+                }
+            ),
+        ).to_string()
+
+
+class SSESlideOutlineResponse(BaseModel):
+    index: int
+    outline: SlideOutlineModel
+
+    def to_string(self):
+        return SSEResponse(
+            event="response",
+            data=json.dumps(
+                {
+                    "type": "outline",
+                    "index": self.index,
+                    "outline": self.outline.model_dump(mode="json"),
+                }
+            ),
+        ).to_string()
@@ -0,0 +1,10 @@
+from typing import Dict
+
+from pydantic import BaseModel, Field
+
+
+class TimingBreakdownModel(BaseModel):
+    trace_id: str
+    total: float
+    # Seconds spent in each stage, stages that run concurrently overlap
+    stages: Dict[str, float] = Field(default_factory=dict)
@@ -0,0 +1,397 @@
+"""
+Removes images, exports and temp files that are no longer used.
+
+Usage: python -m services.asset_gc_service [--dry-run] [--min-age SECONDS]
+"""
+
+import argparse
+import asyncio
+from datetime import timedelta
+import os
+import shutil
+import time
+from typing import Iterable, List, Optional, Set
+from urllib.parse import urlparse
+import uuid
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlmodel import select
+
+from models.asset_gc_report import AssetGcReport
+from models.sql.image_asset import ImageAsset
+from models.sql.slide import SlideModel
+from services.prometheus_metrics import PROMETHEUS_METRICS
+from services.thumbnail_service import THUMBNAIL_SERVICE
+from utils.datetime_utils import get_current_utc_datetime
+from utils.get_env import (
+    get_app_data_directory_env,
+    get_asset_gc_dry_run_env,
+    get_asset_gc_export_max_age_env,
+    get_asset_gc_interval_env,
+    get_asset_gc_min_age_env,
+    get_temp_directory_env,
+)
+from utils.parsers import (
+    parse_bool_or_none,
+    parse_int_or_default,
+    parse_int_or_none,
+)
+
+
+# Assets younger than this are never removed, as images are written to disk
+# before the slides referencing them are saved
+DEFAULT_ASSET_GC_MIN_AGE = 24 * 3600
+DEFAULT_ASSET_GC_EXPORT_MAX_AGE = 7 * 24 * 3600
+DEFAULT_ASSET_GC_BATCH_SIZE = 500
+
+
+def get_image_urls(data) -> Iterable[str]:
+    if isinstance(data, dict):
+        image_url = data.get("__image_url__")
+        if isinstance(image_url, str):
+            yield image_url
+        for value in data.values():
+            yield from get_image_urls(value)
+    elif isinstance(data, list):
+        for item in data:
+            yield from get_image_urls(item)
+
+
+def get_path_size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return size
+
+
+def is_same_or_nested_directory(directory: str, other_directory: str) -> bool:
+    directories = [os.path.realpath(directory), os.path.realpath(other_directory)]
+    return os.path.commonpath(directories) in directories
+
+
+def get_last_modified_time(path: str) -> float:
+    """Returns the modification time of a file, or of the newest entry in a directory."""
+    last_modified_time = os.path.getmtime(path)
+    if os.path.isdir(path):
+        for root, directories, files in os.walk(path):
+            for name in directories + files:
+                try:
+                    last_modified_time = max(
+                        last_modified_time, os.path.getmtime(os.path.join(root, name))
+                    )
+                except OSError:
+                    pass
+    return last_modified_time
+
+
+def is_older_than(path: str, cutoff: float) -> bool:
+    try:
+        return get_last_modified_time(path) < cutoff
+    except OSError:
+        return False
+
+
+def is_uuid(name: str) -> bool:
+    try:
+        uuid.UUID(name)
+    except ValueError:
+        return False
+    return True
+
+
+class AssetGarbageCollector:
+    """
+    Deletes assets nothing refers to anymore:
+    - Generated images whose ImageAsset row is not referenced by any slide
+    - Files and PPTX/PDF import screenshots in the images directory that belong
+    to no ImageAsset row and are not referenced by any slide
+    - Exports and temp directories older than their maximum age, judged by
+    their newest file. Only uuid named temp directories are swept, as others
+    such as the LibreOffice worker profiles live as long as the server
+
+    References are the __image_url__ values in slide content.
+    Rows are deleted in batches, each committed before its files are removed so
+    a failure never leaves rows pointing to missing files.
+    In dry run mode nothing is deleted and the report lists what would be.
+    """
+
+    def __init__(
+        self,
+        app_data_directory: Optional[str] = None,
+        temp_directory: Optional[str] = None,
+        min_age: int = DEFAULT_ASSET_GC_MIN_AGE,
+        export_max_age: int = DEFAULT_ASSET_GC_EXPORT_MAX_AGE,
+        batch_size: int = DEFAULT_ASSET_GC_BATCH_SIZE,
+        include_uploaded: bool = False,
+    ):
+        self._app_data_directory = app_data_directory
+        self._temp_directory = temp_directory
+        self.min_age = min_age
+        self.export_max_age = export_max_age
+        self.batch_size = batch_size
+        self.include_uploaded = include_uploaded
+
+    @property
+    def app_data_directory(self) -> str:
+        return self._app_data_directory or get_app_data_directory_env()
+
+    @property
+    def temp_directory(self) -> str:
+        return self._temp_directory or get_temp_directory_env() or "/tmp/presenton"
+
+    @property
+    def images_directory(self) -> str:
+        return os.path.join(self.app_data_directory, "images")
+
+    @property
+    def exports_directory(self) -> str:
+        return os.path.join(self.app_data_directory, "exports")
+
+    def normalize_path(self, url_or_path: str) -> Optional[str]:
+        """
+        Returns the file path an image url or path points to,
+        or None if it is not stored in the app data directory.
+        """
+        url = urlparse(url_or_path)
+        path = url.path
+        if path.startswith("/app_data/"):
+            path = os.path.join(self.app_data_directory, path[len("/app_data/") :])
+        elif url.scheme or not os.path.isabs(path):
+            return None
+        return os.path.normpath(path)
+
+    async def get_referenced_paths(self, sql_session: AsyncSession) -> Set[str]:
+        referenced_paths = set()
+        last_id = None
+        while True:
+            query = select(SlideModel.id, SlideModel.content).order_by(SlideModel.id)
+            if last_id is not None:
+                query = query.where(SlideModel.id > last_id)
+            rows = (await sql_session.execute(query.limit(self.batch_size))).all()
+            if not rows:
+                return referenced_paths
+
+            for _, content in rows:
+                for image_url in get_image_urls(content):
+                    path = self.normalize_path(image_url)
+                    if path:
+                        referenced_paths.add(path)
+            last_id = rows[-1][0]
+
+    def remove(self, path: str, category: str, report: AssetGcReport):
+        try:
+            n_bytes = get_path_size(path)
+            if not report.dry_run:
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"Failed to remove {path}: {e}")
+            return
+        report.add(category, n_bytes)
+
+    def remove_image(self, path: str, category: str, report: AssetGcReport):
+        self.remove(path, category, report)
+        thumbnail_path = THUMBNAIL_SERVICE.get_thumbnail_path(path)
+        if os.path.exists(thumbnail_path):
+            self.remove(thumbnail_path, "thumbnails", report)
+
+    async def collect_image_assets(
+        self,
+        sql_session: AsyncSession,
+        referenced_paths: Set[str],
+        report: AssetGcReport,
+    ) -> Set[str]:
+        """
+        Deletes unreferenced image assets older than the minimum age.
+        Returns paths of all image assets.
+        """
+        cutoff = get_current_utc_datetime() - timedelta(seconds=self.min_age)
+        asset_paths = set()
+        last_id = None
+        while True:
+            query = select(
+                ImageAsset.id,
+                ImageAsset.path,
+                ImageAsset.is_uploaded,
+                ImageAsset.created_at,
+            ).order_by(ImageAsset.id)
+            if last_id is not None:
+                query = query.where(ImageAsset.id > last_id)
+            rows = (await sql_session.execute(query.limit(self.batch_size))).all()
+            if not rows:
+                return asset_paths
+            last_id = rows[-1][0]
+
+            orphans = []
+            for id, path, is_uploaded, created_at in rows:
+                normalized_path = self.normalize_path(path) or path
+                asset_paths.add(normalized_path)
+                # SQLite returns naive datetimes, which are stored in UTC
+                if created_at.tzinfo is None:
+                    created_at = created_at.replace(tzinfo=cutoff.tzinfo)
+                is_collectable = (
+                    (self.include_uploaded or not is_uploaded)
+                    and created_at < cutoff
+                    and normalized_path not in referenced_paths
+                )
+                if is_collectable:
+                    orphans.append((id, normalized_path))
+            if not orphans:
+                continue
+
+            if not report.dry_run:
+                await sql_session.execute(
+                    delete(ImageAsset).where(
+                        ImageAsset.id.in_([id for id, _ in orphans])
+                    )
+                )
+                await sql_session.commit()
+            await asyncio.to_thread(
+                self._remove_images, [path for _, path in orphans], report
+            )
+
+    def _remove_images(self, paths: List[str], report: AssetGcReport):
+        for path in paths:
+            if os.path.exists(path):
+                self.remove_image(path, "image_assets", report)
+            else:
+                report.add("image_assets", 0)
+
+    def collect_image_files(
+        self, asset_paths: Set[str], referenced_paths: Set[str], report: AssetGcReport
+    ):
+        """
+        Deletes files and screenshot directories in the images directory
+        which are neither image assets nor referenced by slides.
+        """
+        if not os.path.isdir(self.images_directory):
+            return
+        cutoff = time.time() - self.min_age
+        thumbnails_directory = os.path.join(self.images_directory, "thumbnails")
+
+        for entry in os.scandir(self.images_directory):
+            path = os.path.normpath(entry.path)
+            if path == thumbnails_directory or not is_older_than(path, cutoff):
+                continue
+            if entry.is_dir():
+                prefix = path + os.sep
+                if not any(
+                    referenced_path.startswith(prefix)
+                    for referenced_path in referenced_paths
+                ):
+                    self.remove(path, "screenshots", report)
+            elif path not in asset_paths and path not in referenced_paths:
+                self.remove_image(path, "images", report)
+
+    def collect_expired_files(
+        self,
+        directory: str,
+        max_age: int,
+        category: str,
+        report: AssetGcReport,
+        only_uuid_names: bool = False,
+    ):
+        if not os.path.isdir(directory):
+            return
+        cutoff = time.time() - max_age
+        for entry in os.scandir(directory):
+            if only_uuid_names and not is_uuid(entry.name):
+                continue
+            if is_older_than(entry.path, cutoff):
+                self.remove(entry.path, category, report)
+
+    async def run(
+        self, sql_session: AsyncSession, dry_run: bool = False
+    ) -> AssetGcReport:
+        start = time.perf_counter()
+        report = AssetGcReport(dry_run=dry_run)
+
+        referenced_paths = await self.get_referenced_paths(sql_session)
+        report.referenced_images = len(referenced_paths)
+        asset_paths = await self.collect_image_assets(
+            sql_session, referenced_paths, report
+        )
+        await asyncio.to_thread(
+            self.collect_image_files, asset_paths, referenced_paths, report
+        )
+        await asyncio.to_thread(
+            self.collect_expired_files,
+            self.exports_directory,
+            self.export_max_age,
+            "exports",
+            report,
+        )
+        # Temp directory is never swept if app data is stored in it
+        if not is_same_or_nested_directory(
+            self.temp_directory, self.app_data_directory
+        ):
+            await asyncio.to_thread(
+                self.collect_expired_files,
+                self.temp_directory,
+                self.min_age,
+                "temp",
+                report,
+                True,
+            )
+
+        report.duration = time.perf_counter() - start
+        if not dry_run:
+            PROMETHEUS_METRICS.observe_asset_gc(report)
+        print(f"Asset garbage collection: {report.to_log_string()}")
+        return report
+
+    async def run_periodically(self, engine: AsyncEngine, interval: int, dry_run: bool):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with AsyncSession(engine, expire_on_commit=False) as sql_session:
+                    await self.run(sql_session, dry_run)
+            except Exception as e:
+                print(f"Asset garbage collection failed: {e}")
+
+
+def get_asset_gc_interval() -> Optional[int]:
+    return parse_int_or_none(get_asset_gc_interval_env())
+
+
+def get_asset_gc_dry_run() -> bool:
+    return parse_bool_or_none(get_asset_gc_dry_run_env()) or False
+
+
+ASSET_GC_SERVICE = AssetGarbageCollector(
+    min_age=parse_int_or_default(get_asset_gc_min_age_env(), DEFAULT_ASSET_GC_MIN_AGE),
+    export_max_age=parse_int_or_default(
+        get_asset_gc_export_max_age_env(), DEFAULT_ASSET_GC_EXPORT_MAX_AGE
+    ),
+)
+
+
+if __name__ == "__main__":
+    from services.database import sql_engine
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--min-age", type=int, default=ASSET_GC_SERVICE.min_age)
+    parser.add_argument("--include-uploaded", action="store_true")
+    args = parser.parse_args()
+
+    ASSET_GC_SERVICE.min_age = args.min_age
+    ASSET_GC_SERVICE.include_uploaded = args.include_uploaded
+
+    async def main():
+        async with AsyncSession(sql_engine, expire_on_commit=False) as sql_session:
+            await ASSET_GC_SERVICE.run(sql_session, args.dry_run)
+        await sql_engine.dispose()
+
+    asyncio.run(main())
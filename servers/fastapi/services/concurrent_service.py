@@ -2,6 +2,8 @@ import asyncio
 from asyncio import Task
 from typing import Any, Callable, Coroutine, Optional
 
+from services.prometheus_metrics import PROMETHEUS_METRICS
+
 
 class ConcurrentService:
     def __init__(self):
@@ -17,7 +19,19 @@ class ConcurrentService:
         async def wrapper():
             if delay:
                 await asyncio.sleep(delay)
-            await callable(*args, **kwargs)
+            in_progress = PROMETHEUS_METRICS.background_tasks_in_progress.labels(
+                callable.__name__
+            )
+            in_progress.inc()
+            status = "failed"
+            try:
+                await callable(*args, **kwargs)
+                status = "completed"
+            finally:
+                in_progress.dec()
+                PROMETHEUS_METRICS.background_tasks.labels(
+                    callable.__name__, status
+                ).inc()
 
         task = asyncio.create_task(wrapper())
 
@@ -2,7 +2,6 @@ from collections.abc import AsyncGenerator
 import os
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
-    create_async_engine,
     async_sessionmaker,
     AsyncSession,
 )
@@ -15,16 +14,21 @@ from models.sql.image_asset import ImageAsset
 from models.sql.key_value import KeyValueSqlModel
 from models.sql.ollama_pull_status import OllamaPullStatus
 from models.sql.presentation import PresentationModel
+from models.sql.presentation_layout import PresentationLayoutSqlModel
 from models.sql.slide import SlideModel
 from models.sql.presentation_layout_code import PresentationLayoutCodeModel
 from models.sql.template import TemplateModel
 from models.sql.webhook_subscription import WebhookSubscription
-from utils.db_utils import get_database_url_and_connect_args
+from services.migration_service import run_migrations
+from utils.db_utils import (
+    create_tuned_async_engine,
+    get_database_url_and_connect_args,
+)
 
 
 database_url, connect_args = get_database_url_and_connect_args()
 
-sql_engine: AsyncEngine = create_async_engine(database_url, connect_args=connect_args)
+sql_engine: AsyncEngine = create_tuned_async_engine(database_url, connect_args)
 async_session_maker = async_sessionmaker(sql_engine, expire_on_commit=False)
 
 
@@ -35,8 +39,8 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
 
 # Container DB (Lives inside the container)
 container_db_url = "sqlite+aiosqlite:////app/container.db"
-container_db_engine: AsyncEngine = create_async_engine(
-    container_db_url, connect_args={"check_same_thread": False}
+container_db_engine: AsyncEngine = create_tuned_async_engine(
+    container_db_url, {"check_same_thread": False}
 )
 container_db_async_session_maker = async_sessionmaker(
     container_db_engine, expire_on_commit=False
@@ -56,6 +60,7 @@ async def create_db_and_tables():
                 sync_conn,
                 tables=[
                     PresentationModel.__table__,
+                    PresentationLayoutSqlModel.__table__,
                     SlideModel.__table__,
                     KeyValueSqlModel.__table__,
                     ImageAsset.__table__,
@@ -66,6 +71,8 @@ async def create_db_and_tables():
                 ],
             )
         )
+    # Brings tables created by older versions up to date
+    await run_migrations(sql_engine)
 
     async with container_db_engine.begin() as conn:
         await conn.run_sync(
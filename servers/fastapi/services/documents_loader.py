@@ -11,6 +11,7 @@ from constants.documents import (
     WORD_TYPES,
 )
 from services.docling_service import DoclingService
+from services.prometheus_metrics import PROMETHEUS_METRICS
 
 
 class DocumentsLoader:
@@ -53,15 +54,27 @@ class DocumentsLoader:
 
             mime_type = mimetypes.guess_type(file_path)[0]
             if mime_type in PDF_MIME_TYPES:
-                document, imgs = await self.load_pdf(
-                    file_path, load_text, load_images, temp_dir
-                )
+                with PROMETHEUS_METRICS.time(
+                    PROMETHEUS_METRICS.document_parse_duration, "pdf"
+                ):
+                    document, imgs = await self.load_pdf(
+                        file_path, load_text, load_images, temp_dir
+                    )
             elif mime_type in TEXT_MIME_TYPES:
-                document = await self.load_text(file_path)
+                with PROMETHEUS_METRICS.time(
+                    PROMETHEUS_METRICS.document_parse_duration, "text"
+                ):
+                    document = await self.load_text(file_path)
             elif mime_type in POWERPOINT_TYPES:
-                document = self.load_powerpoint(file_path)
+                with PROMETHEUS_METRICS.time(
+                    PROMETHEUS_METRICS.document_parse_duration, "powerpoint"
+                ):
+                    document = self.load_powerpoint(file_path)
             elif mime_type in WORD_TYPES:
-                document = self.load_msword(file_path)
+                with PROMETHEUS_METRICS.time(
+                    PROMETHEUS_METRICS.document_parse_duration, "word"
+                ):
+                    document = self.load_msword(file_path)
 
             documents.append(document)
             images.append(imgs)
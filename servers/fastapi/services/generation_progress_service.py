@@ -0,0 +1,177 @@
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Dict, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.generation_progress import GenerationProgressEvent
+from models.sql.async_presentation_generation_status import (
+    AsyncPresentationGenerationTaskModel,
+)
+from utils.get_env import get_redis_url_env
+
+
+# Seconds the latest event of a task is kept after it is published
+PROGRESS_RETENTION = 3600
+
+
+class InMemoryProgressSubscription:
+    def __init__(self, queue: asyncio.Queue):
+        self.queue = queue
+
+    async def get(self, timeout: float) -> Optional[GenerationProgressEvent]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InMemoryProgressBroker:
+    """
+    Delivers progress events to subscribers in the same process.
+    """
+
+    def __init__(self, retention: int = PROGRESS_RETENTION):
+        self.retention = retention
+        self._latest: Dict[str, GenerationProgressEvent] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+    def _forget(self, event: GenerationProgressEvent):
+        if self._latest.get(event.task_id) is event:
+            del self._latest[event.task_id]
+
+    async def publish(self, event: GenerationProgressEvent):
+        self._latest[event.task_id] = event
+        asyncio.get_running_loop().call_later(self.retention, self._forget, event)
+        for queue in self._subscribers.get(event.task_id, ()):
+            queue.put_nowait(event)
+
+    async def get_latest(self, task_id: str) -> Optional[GenerationProgressEvent]:
+        return self._latest.get(task_id)
+
+    @asynccontextmanager
+    async def subscribe(
+        self, task_id: str
+    ) -> AsyncIterator[InMemoryProgressSubscription]:
+        queue = asyncio.Queue()
+        self._subscribers[task_id].add(queue)
+        try:
+            yield InMemoryProgressSubscription(queue)
+        finally:
+            self._subscribers[task_id].discard(queue)
+            if not self._subscribers[task_id]:
+                del self._subscribers[task_id]
+
+
+class RedisProgressSubscription:
+    def __init__(self, pubsub):
+        self.pubsub = pubsub
+
+    async def get(self, timeout: float) -> Optional[GenerationProgressEvent]:
+        message = await self.pubsub.get_message(
+            ignore_subscribe_messages=True, timeout=timeout
+        )
+        if not message:
+            return None
+        return GenerationProgressEvent.model_validate_json(message["data"])
+
+
+class RedisProgressBroker:
+    """
+    Delivers progress events across processes and hosts through Redis pub/sub.
+    The latest event of each task is also stored so late subscribers and
+    status polls can read it without touching the database.
+    """
+
+    def __init__(self, redis_url: str, retention: int = PROGRESS_RETENTION):
+        from redis import asyncio as aioredis
+
+        self.retention = retention
+        self._redis = aioredis.from_url(redis_url)
+
+    def _get_channel(self, task_id: str) -> str:
+        return f"presenton:generation_progress:{task_id}"
+
+    def _get_latest_key(self, task_id: str) -> str:
+        return f"presenton:generation_progress:{task_id}:latest"
+
+    async def publish(self, event: GenerationProgressEvent):
+        payload = event.model_dump_json()
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.set(self._get_latest_key(event.task_id), payload, ex=self.retention)
+            pipe.publish(self._get_channel(event.task_id), payload)
+            await pipe.execute()
+
+    async def get_latest(self, task_id: str) -> Optional[GenerationProgressEvent]:
+        payload = await self._redis.get(self._get_latest_key(task_id))
+        if not payload:
+            return None
+        return GenerationProgressEvent.model_validate_json(payload)
+
+    @asynccontextmanager
+    async def subscribe(self, task_id: str) -> AsyncIterator[RedisProgressSubscription]:
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(self._get_channel(task_id))
+        try:
+            yield RedisProgressSubscription(pubsub)
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+
+class GenerationProgressService:
+    """
+    Publishes progress of async presentation generation to subscribers.
+    Uses Redis if REDIS_URL is set so all workers share progress, otherwise
+    progress is only visible within the process generating the presentation.
+    Progress is best effort, failures to publish are logged and ignored.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.broker = (
+            RedisProgressBroker(redis_url) if redis_url else InMemoryProgressBroker()
+        )
+
+    async def publish(self, event: GenerationProgressEvent):
+        try:
+            await self.broker.publish(event)
+        except Exception as e:
+            print(f"Failed to publish generation progress: {e}")
+
+    async def get_latest(self, task_id: str) -> Optional[GenerationProgressEvent]:
+        try:
+            return await self.broker.get_latest(task_id)
+        except Exception as e:
+            print(f"Failed to get generation progress: {e}")
+            return None
+
+    def subscribe(self, task_id: str):
+        return self.broker.subscribe(task_id)
+
+    async def update_task(
+        self,
+        sql_session: AsyncSession,
+        task: AsyncPresentationGenerationTaskModel,
+        message: str,
+        status: Optional[str] = None,
+        persist: bool = False,
+        **progress,
+    ):
+        """
+        Updates the task and publishes it with the given progress fields.
+        Task is only written to the database if persist is true, which should be
+        reserved for checkpoints and terminal states.
+        """
+        task.message = message
+        task.status = status or task.status
+        task.updated_at = datetime.now()
+        if persist:
+            sql_session.add(task)
+            await sql_session.commit()
+
+        await self.publish(GenerationProgressEvent.from_task(task, **progress))
+
+
+GENERATION_PROGRESS_SERVICE = GenerationProgressService(get_redis_url_env())
@@ -1,65 +1,119 @@
+from dataclasses import dataclass
+from functools import lru_cache
 from html.parser import HTMLParser
-from typing import List, Optional
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from models.pptx_models import PptxFontModel, PptxTextRunModel
 
 
+# Inline tags that change the font of the text they wrap
+FORMATTING_TAGS: Dict[str, str] = {
+    "strong": "bold",
+    "b": "bold",
+    "em": "italic",
+    "i": "italic",
+    "u": "underline",
+    "s": "strike",
+    "strike": "strike",
+    "del": "strike",
+    "code": "code",
+}
+
+_FONT_FIELDS = tuple(PptxFontModel.model_fields.keys())
+
+
+@dataclass(slots=True)
+class TextRun:
+    """
+    Lightweight text run produced by the inline HTML parser.
+    Fonts are shared between runs with the same formatting and must not be mutated.
+    """
+
+    text: str
+    font: Optional[PptxFontModel] = None
+
+    def to_model(self) -> PptxTextRunModel:
+        return PptxTextRunModel(text=self.text, font=self.font)
+
+
+def get_font_key(font: PptxFontModel) -> Tuple:
+    return tuple(getattr(font, field) for field in _FONT_FIELDS)
+
+
+@lru_cache(maxsize=1024)
+def resolve_font(font_key: Tuple, formatting: FrozenSet[str]) -> PptxFontModel:
+    font_json = dict(zip(_FONT_FIELDS, font_key))
+
+    if "bold" in formatting:
+        font_json["font_weight"] = 700
+    if "italic" in formatting:
+        font_json["italic"] = True
+    if "underline" in formatting:
+        font_json["underline"] = True
+    if "strike" in formatting:
+        font_json["strike"] = True
+    if "code" in formatting:
+        font_json["name"] = "Courier New"
+
+    return PptxFontModel(**font_json)
+
+
 class InlineHTMLToRunsParser(HTMLParser):
     def __init__(self, base_font: PptxFontModel):
         super().__init__(convert_charrefs=True)
         self.base_font = base_font
         self.tag_stack: List[str] = []
-        self.text_runs: List[PptxTextRunModel] = []
+        self.text_runs: List[TextRun] = []
+
+        self._base_font_key = get_font_key(base_font)
+        self._formatting_counts: Dict[str, int] = {}
+        self._font: Optional[PptxFontModel] = None
 
     def _current_font(self) -> PptxFontModel:
-        font_json = self.base_font.model_dump()
-        is_bold = any(tag in ("strong", "b") for tag in self.tag_stack)
-        is_italic = any(tag in ("em", "i") for tag in self.tag_stack)
-        is_underline = any(tag == "u" for tag in self.tag_stack)
-        is_strike = any(tag in ("s", "strike", "del") for tag in self.tag_stack)
-        is_code = any(tag == "code" for tag in self.tag_stack)
-
-        if is_bold:
-            font_json["font_weight"] = 700
-        if is_italic:
-            font_json["italic"] = True
-        if is_underline:
-            font_json["underline"] = True
-        if is_strike:
-            font_json["strike"] = True
-        if is_code:
-            font_json["name"] = "Courier New"
-
-        return PptxFontModel(**font_json)
+        if self._font is None:
+            formatting = frozenset(
+                name for name, count in self._formatting_counts.items() if count
+            )
+            self._font = resolve_font(self._base_font_key, formatting)
+        return self._font
+
+    def _update_formatting(self, tag: str, delta: int):
+        formatting = FORMATTING_TAGS.get(tag)
+        if formatting is None:
+            return
+        self._formatting_counts[formatting] = (
+            self._formatting_counts.get(formatting, 0) + delta
+        )
+        self._font = None
 
     def handle_starttag(self, tag, attrs):
         tag = tag.lower()
         if tag == "br":
-            self.text_runs.append(PptxTextRunModel(text="\n"))
+            self.text_runs.append(TextRun(text="\n"))
             return
         self.tag_stack.append(tag)
+        self._update_formatting(tag, 1)
 
     def handle_endtag(self, tag):
         tag = tag.lower()
         for i in range(len(self.tag_stack) - 1, -1, -1):
             if self.tag_stack[i] == tag:
                 del self.tag_stack[i]
+                self._update_formatting(tag, -1)
                 break
 
     def handle_data(self, data):
         if data == "":
             return
-        self.text_runs.append(PptxTextRunModel(text=data, font=self._current_font()))
+        self.text_runs.append(TextRun(text=data, font=self._current_font()))
 
 
 def parse_html_text_to_text_runs(
     text: str, base_font: Optional[PptxFontModel] = None
-) -> List[PptxTextRunModel]:
+) -> List[TextRun]:
     normalized_text = text.replace("\r\n", "\n").replace("\r", "\n")
     normalized_text = normalized_text.replace("\n", "<br>")
 
     parser = InlineHTMLToRunsParser(base_font if base_font else PptxFontModel())
     parser.feed(normalized_text)
     return parser.text_runs
-
-
@@ -9,6 +9,7 @@ from openai import NOT_GIVEN, AsyncOpenAI
 from models.image_prompt import ImagePrompt
 from models.sql.image_asset import ImageAsset
 from services.openai_usage_tracker import track_openai_image_usage
+from services.prometheus_metrics import PROMETHEUS_METRICS
 from utils.get_env import (
     get_dall_e_3_quality_env,
     get_gpt_image_1_5_quality_env,
@@ -18,6 +19,7 @@ from utils.get_env import get_pixabay_api_key_env
 from utils.get_env import get_comfyui_url_env
 from utils.get_env import get_comfyui_workflow_env
 from utils.image_provider import (
+    get_selected_image_provider,
     is_gpt_image_1_5_selected,
     is_image_generation_disabled,
     is_pixels_selected,
@@ -80,13 +82,17 @@ class ImageGenerationService:
         )
         print(f"Request - Generating Image for {image_prompt}")
 
+        image_provider = get_selected_image_provider().value
         try:
-            if self.is_stock_provider_selected():
-                image_path = await self.image_gen_func(image_prompt)
-            else:
-                image_path = await self.image_gen_func(
-                    image_prompt, self.output_directory
-                )
+            with PROMETHEUS_METRICS.time(
+                PROMETHEUS_METRICS.image_generation_duration, image_provider
+            ):
+                if self.is_stock_provider_selected():
+                    image_path = await self.image_gen_func(image_prompt)
+                else:
+                    image_path = await self.image_gen_func(
+                        image_prompt, self.output_directory
+                    )
             if image_path:
                 if image_path.startswith("http"):
                     return image_path
@@ -103,6 +109,7 @@ class ImageGenerationService:
 
         except Exception as e:
             print(f"Error generating image: {e}")
+            PROMETHEUS_METRICS.image_generation_errors.labels(image_provider).inc()
             return "/static/images/placeholder.jpg"
 
     async def generate_image_openai(
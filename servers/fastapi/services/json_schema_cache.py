@@ -0,0 +1,85 @@
+from collections import OrderedDict
+from copy import deepcopy
+import hashlib
+import json
+from typing import Callable, Dict, Hashable, Tuple
+
+from utils.schema_utils import (
+    ensure_strict_json_schema,
+    flatten_json_schema,
+    remove_titles_from_schema,
+)
+
+
+DEFAULT_JSON_SCHEMA_CACHE_SIZE = 512
+
+
+class JsonSchemaCache:
+    """
+    Least recently used cache of preprocessed JSON schemas, such as response
+    schemas of slide layouts and their provider specific variants.
+
+    Schemas are keyed by what they are built from and a hash of the source
+    schema, so a changed layout gets a new entry. Returned schemas are shared
+    and must not be mutated.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_JSON_SCHEMA_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._schemas: OrderedDict[Hashable, dict] = OrderedDict()
+        # Hashes of cached schemas by their id, so schemas built from cached
+        # schemas do not hash them again
+        self._hashes: Dict[int, Tuple[dict, str]] = {}
+
+    def get_hash(self, schema: dict) -> str:
+        known = self._hashes.get(id(schema))
+        if known is not None and known[0] is schema:
+            return known[1]
+        return hashlib.sha256(
+            json.dumps(schema, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def get(self, key: Hashable, build: Callable[[], dict]) -> dict:
+        schema = self._schemas.get(key)
+        if schema is not None:
+            self.hits += 1
+            self._schemas.move_to_end(key)
+            return schema
+
+        self.misses += 1
+        schema = build()
+        self._schemas[key] = schema
+        self._hashes[id(schema)] = (schema, self.get_hash(schema))
+        if len(self._schemas) > self.maxsize:
+            _, evicted = self._schemas.popitem(last=False)
+            self._hashes.pop(id(evicted), None)
+        return schema
+
+    def get_strict(self, schema: dict) -> dict:
+        """Returns the schema as required by strict OpenAI structured outputs."""
+
+        def build():
+            strict_schema = deepcopy(schema)
+            return ensure_strict_json_schema(
+                strict_schema, path=(), root=strict_schema
+            )
+
+        return self.get(("strict", self.get_hash(schema)), build)
+
+    def get_flattened(self, schema: dict) -> dict:
+        """Returns the schema without references and titles, as Gemini tools need."""
+        return self.get(
+            ("flattened", self.get_hash(schema)),
+            lambda: remove_titles_from_schema(flatten_json_schema(schema)),
+        )
+
+    def clear(self):
+        self.hits = 0
+        self.misses = 0
+        self._schemas.clear()
+        self._hashes.clear()
+
+
+JSON_SCHEMA_CACHE = JsonSchemaCache()
@@ -0,0 +1,166 @@
+import asyncio
+import os
+import shutil
+from typing import List, Optional
+
+from fastapi import HTTPException
+
+from services.temp_file_service import TEMP_FILE_SERVICE
+from utils.get_env import (
+    get_libreoffice_queue_size_env,
+    get_libreoffice_timeout_env,
+    get_libreoffice_workers_env,
+)
+from utils.parsers import parse_int_or_none
+
+
+DEFAULT_LIBREOFFICE_WORKERS = 2
+DEFAULT_LIBREOFFICE_QUEUE_SIZE = 32
+DEFAULT_LIBREOFFICE_TIMEOUT = 300
+
+
+def get_libreoffice_executable() -> str:
+    return shutil.which("soffice") or shutil.which("libreoffice") or "libreoffice"
+
+
+class LibreOfficeWorker:
+    """
+    Headless LibreOffice worker with its own user profile.
+    Profile is initialized once on warm up so conversions skip first start setup,
+    and isolated profiles let workers run in parallel without locking each other.
+    """
+
+    def __init__(self, index: int, base_dir: str):
+        self.index = index
+        self.profile_dir = os.path.join(base_dir, f"worker-{index}")
+        self.conversions = 0
+        self._warmed_up = False
+
+    def _get_command(self, *args: str) -> List[str]:
+        return [
+            get_libreoffice_executable(),
+            f"-env:UserInstallation=file://{self.profile_dir}",
+            "--headless",
+            "--norestore",
+            "--nologo",
+            "--nodefault",
+            "--nofirststartwizard",
+            *args,
+        ]
+
+    async def _run(self, timeout: int, *args: str) -> tuple[int, str]:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self._get_command(*args),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=500, detail="LibreOffice is not installed on the server"
+            )
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise HTTPException(
+                status_code=504,
+                detail=f"LibreOffice PDF conversion timed out after {timeout} seconds",
+            )
+        return process.returncode, stderr.decode(errors="ignore")
+
+    async def warm_up(self, timeout: int):
+        if self._warmed_up:
+            return
+        os.makedirs(self.profile_dir, exist_ok=True)
+        await self._run(timeout, "--terminate_after_init")
+        self._warmed_up = True
+
+    async def convert_to_pdf(self, pptx_path: str, output_dir: str, timeout: int) -> str:
+        await self.warm_up(timeout)
+
+        returncode, stderr = await self._run(
+            timeout, "--convert-to", "pdf", "--outdir", output_dir, pptx_path
+        )
+        pdf_path = os.path.join(
+            output_dir, f"{os.path.splitext(os.path.basename(pptx_path))[0]}.pdf"
+        )
+        if returncode != 0 or not os.path.exists(pdf_path):
+            print(f"LibreOffice worker {self.index} failed: {stderr}")
+            raise HTTPException(
+                status_code=500, detail="Failed to convert presentation to PDF"
+            )
+
+        self.conversions += 1
+        return pdf_path
+
+
+class LibreOfficePdfService:
+    """
+    Converts PPTX files to PDF with a pool of warm LibreOffice workers.
+    Callers wait in a bounded queue for a free worker and are rejected once it is full.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        timeout: Optional[int] = None,
+    ):
+        self.workers = workers or DEFAULT_LIBREOFFICE_WORKERS
+        self.queue_size = queue_size or DEFAULT_LIBREOFFICE_QUEUE_SIZE
+        self.timeout = timeout or DEFAULT_LIBREOFFICE_TIMEOUT
+
+        self._pool: Optional[asyncio.Queue[LibreOfficeWorker]] = None
+        self._waiting = 0
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    def _get_pool(self) -> asyncio.Queue:
+        if self._pool is None:
+            base_dir = TEMP_FILE_SERVICE.create_temp_dir("libreoffice")
+            self._pool = asyncio.Queue()
+            for index in range(self.workers):
+                self._pool.put_nowait(LibreOfficeWorker(index, base_dir))
+        return self._pool
+
+    async def warm_up(self):
+        pool = self._get_pool()
+        workers = [pool.get_nowait() for _ in range(pool.qsize())]
+        try:
+            await asyncio.gather(
+                *[worker.warm_up(self.timeout) for worker in workers],
+                return_exceptions=True,
+            )
+        finally:
+            for worker in workers:
+                pool.put_nowait(worker)
+
+    async def convert_to_pdf(self, pptx_path: str, output_dir: str) -> str:
+        if self._waiting >= self.queue_size:
+            raise HTTPException(
+                status_code=503,
+                detail="PDF export queue is full. Please try again later.",
+            )
+
+        pool = self._get_pool()
+        self._waiting += 1
+        try:
+            worker = await pool.get()
+        finally:
+            self._waiting -= 1
+
+        try:
+            return await worker.convert_to_pdf(pptx_path, output_dir, self.timeout)
+        finally:
+            pool.put_nowait(worker)
+
+
+LIBREOFFICE_PDF_SERVICE = LibreOfficePdfService(
+    workers=parse_int_or_none(get_libreoffice_workers_env()),
+    queue_size=parse_int_or_none(get_libreoffice_queue_size_env()),
+    timeout=parse_int_or_none(get_libreoffice_timeout_env()),
+)
@@ -0,0 +1,215 @@
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import time
+from typing import Any, AsyncGenerator, AsyncIterator, Optional, Tuple
+
+from enums.llm_call_purpose import LLMCallPurpose
+from enums.llm_call_type import LLMCallType
+from enums.llm_provider import LLMProvider
+from services.prometheus_metrics import PROMETHEUS_METRICS, PrometheusMetrics
+
+
+_CURRENT_LLM_CALL: ContextVar["LLMCall | None"] = ContextVar(
+    "current_llm_call", default=None
+)
+
+
+def _read_int(obj: Any, *names: str) -> Optional[int]:
+    for name in names:
+        curr = obj
+        for key in name.split("."):
+            if curr is None:
+                break
+            if isinstance(curr, dict):
+                curr = curr.get(key)
+            else:
+                curr = getattr(curr, key, None)
+        if isinstance(curr, int):
+            return curr
+    return None
+
+
+def get_usage_tokens(usage: Any) -> Tuple[int, int, int]:
+    """
+    Returns input, output and cached input tokens of an OpenAI, Anthropic or
+    Google usage object. Input tokens include cached tokens for all providers.
+    """
+    input_tokens = _read_int(
+        usage, "prompt_tokens", "input_tokens", "prompt_token_count"
+    )
+    output_tokens = _read_int(
+        usage, "completion_tokens", "output_tokens", "candidates_token_count"
+    )
+    cached_tokens = _read_int(
+        usage,
+        "prompt_tokens_details.cached_tokens",
+        "input_tokens_details.cached_tokens",
+        "cache_read_input_tokens",
+        "cached_content_token_count",
+    )
+    # Anthropic reports cache reads and writes separately from input tokens
+    cache_creation_tokens = _read_int(usage, "cache_creation_input_tokens")
+    if _read_int(usage, "cache_read_input_tokens") is not None:
+        input_tokens = (
+            (input_tokens or 0) + (cached_tokens or 0) + (cache_creation_tokens or 0)
+        )
+    return input_tokens or 0, output_tokens or 0, cached_tokens or 0
+
+
+@dataclass
+class LLMCall:
+    purpose: LLMCallPurpose
+    mode: LLMCallType
+    provider: LLMProvider
+    model: str
+    started_at: float = field(default_factory=time.perf_counter)
+    time_to_first_token: Optional[float] = None
+    latency: Optional[float] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    # Provider requests made for this call, more than one means tool call
+    # rounds or retries
+    requests: int = 0
+    error: Optional[str] = None
+    # Cancelled by the caller, such as the losing request of a hedged call,
+    # which is not an error of the provider
+    cancelled: bool = False
+
+    @property
+    def retries(self) -> int:
+        return max(self.requests - 1, 0)
+
+    def mark_first_token(self):
+        if self.time_to_first_token is None:
+            self.time_to_first_token = time.perf_counter() - self.started_at
+
+    def add_usage(self, usage: Any):
+        if usage is None:
+            return
+        input_tokens, output_tokens, cached_tokens = get_usage_tokens(usage)
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        self.cached_tokens += cached_tokens
+
+    def finish(self, error: Optional[BaseException] = None):
+        self.latency = time.perf_counter() - self.started_at
+        if isinstance(error, asyncio.CancelledError):
+            self.cancelled = True
+        elif error is not None:
+            self.error = type(error).__name__
+
+    def to_log_string(self) -> str:
+        time_to_first_token = (
+            f"{self.time_to_first_token:.3f}s"
+            if self.time_to_first_token is not None
+            else "-"
+        )
+        return (
+            f"purpose={self.purpose.value} mode={self.mode.value} "
+            f"provider={self.provider.value} model={self.model} "
+            f"latency={self.latency:.3f}s ttft={time_to_first_token} "
+            f"input_tokens={self.input_tokens} output_tokens={self.output_tokens} "
+            f"cached_tokens={self.cached_tokens} retries={self.retries} "
+            f"error={self.error or '-'} cancelled={self.cancelled}"
+        )
+
+
+class LLMCallMetrics:
+    """
+    Tracks latency, time to first token, token usage, retries and errors of
+    LLM calls, which are logged and recorded in Prometheus histograms by
+    purpose, mode and provider.
+    """
+
+    def __init__(self, prometheus_metrics: Optional[PrometheusMetrics] = None):
+        self._prometheus_metrics = prometheus_metrics or PROMETHEUS_METRICS
+
+    def observe(self, call: LLMCall):
+        self._prometheus_metrics.observe_llm_call(call)
+        print(f"LLM call: {call.to_log_string()}")
+
+    @contextmanager
+    def track(
+        self,
+        purpose: LLMCallPurpose,
+        mode: LLMCallType,
+        provider: LLMProvider,
+        model: str,
+    ):
+        """
+        Tracks a call made inside the block.
+        Provider requests made in it should be reported with record_llm_request.
+        """
+        call = LLMCall(purpose=purpose, mode=mode, provider=provider, model=model)
+        token = _CURRENT_LLM_CALL.set(call)
+        try:
+            yield call
+        except BaseException as e:
+            call.finish(e)
+            raise
+        else:
+            call.finish()
+        finally:
+            _CURRENT_LLM_CALL.reset(token)
+            self.observe(call)
+
+    async def track_stream(
+        self,
+        stream: AsyncIterator[str],
+        purpose: LLMCallPurpose,
+        mode: LLMCallType,
+        provider: LLMProvider,
+        model: str,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Tracks a streamed call, time to first token is the time until its first chunk.
+        """
+        call = LLMCall(purpose=purpose, mode=mode, provider=provider, model=model)
+        try:
+            while True:
+                # Set only while the stream runs, as consumers may iterate
+                # it from different contexts
+                token = _CURRENT_LLM_CALL.set(call)
+                try:
+                    chunk = await stream.__anext__()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    _CURRENT_LLM_CALL.reset(token)
+                call.mark_first_token()
+                yield chunk
+        except GeneratorExit:
+            # Consumer stopped reading, which is not a failed call
+            call.finish()
+            await stream.aclose()
+            raise
+        except BaseException as e:
+            call.finish(e)
+            raise
+        else:
+            call.finish()
+        finally:
+            self.observe(call)
+
+
+def record_llm_request(usage: Any = None):
+    """
+    Counts a provider request of the tracked LLM call and adds its token usage.
+    Streamed requests report usage separately with record_llm_usage.
+    """
+    call = _CURRENT_LLM_CALL.get()
+    if call is not None:
+        call.requests += 1
+        call.add_usage(usage)
+
+
+def record_llm_usage(usage: Any):
+    call = _CURRENT_LLM_CALL.get()
+    if call is not None:
+        call.add_usage(usage)
+
+
+LLM_CALL_METRICS = LLMCallMetrics()
@@ -20,6 +20,8 @@ from google.genai.types import Tool as GoogleTool
 from anthropic import AsyncAnthropic
 from anthropic.types import Message as AnthropicMessage
 from anthropic import MessageStreamEvent as AnthropicMessageStreamEvent
+from enums.llm_call_purpose import LLMCallPurpose
+from enums.llm_call_type import LLMCallType
 from enums.llm_provider import LLMProvider
 from models.llm_message import (
     AnthropicAssistantMessage,
@@ -39,11 +41,21 @@ from models.llm_tool_call import (
     OpenAIToolCallFunction,
 )
 from models.llm_tools import LLMDynamicTool, LLMTool
+from services.llm_call_metrics import (
+    LLM_CALL_METRICS,
+    record_llm_request,
+    record_llm_usage,
+)
+from services.json_schema_cache import JSON_SCHEMA_CACHE
+from services.llm_endpoint_pool import get_llm_endpoint_pool
+from services.llm_hedging_policy import LLM_HEDGING_POLICY
+from services.llm_prompt_cache import LLM_PROMPT_CACHE
 from services.llm_tool_calls_handler import LLMToolCallsHandler
 from services.openai_usage_tracker import (
     track_openai_chat_completion_usage,
     track_openai_response_usage,
 )
+from services.prometheus_metrics import PROMETHEUS_METRICS
 from utils.async_iterator import iterator_to_async
 from utils.dummy_functions import do_nothing_async
 from utils.get_env import (
@@ -52,6 +64,8 @@ from utils.get_env import (
     get_custom_llm_url_env,
     get_disable_thinking_env,
     get_google_api_key_env,
+    get_llm_hedging_api_key_env,
+    get_llm_hedging_model_env,
     get_ollama_url_env,
     get_openai_api_key_env,
     get_tool_calls_env,
@@ -59,17 +73,30 @@ from utils.get_env import (
 )
 from utils.llm_provider import get_llm_provider, get_model
 from utils.parsers import parse_bool_or_none
-from utils.schema_utils import (
-    ensure_strict_json_schema,
-    flatten_json_schema,
-    remove_titles_from_schema,
-)
 
 
 class LLMClient:
-    def __init__(self):
-        self.llm_provider = get_llm_provider()
-        self._client = self._get_client()
+    def __init__(
+        self,
+        purpose: LLMCallPurpose = LLMCallPurpose.OTHER,
+        api_key: Optional[str] = None,
+        llm_provider: Optional[LLMProvider] = None,
+        base_url: Optional[str] = None,
+    ):
+        # Label of calls made by this client in LLM call metrics
+        self.purpose = purpose
+        self.llm_provider = llm_provider or get_llm_provider()
+        # Override the API key and url of the provider from the environment
+        self._api_key = api_key
+        self._base_url = base_url
+        # Calls are routed over LLM_ENDPOINTS if set, unless this client is
+        # one of its endpoints or is given its own API key or url, such as
+        # the client of hedge requests
+        self._endpoint_pool = (
+            None if (llm_provider or api_key or base_url) else get_llm_endpoint_pool()
+        )
+        self._client = None if self._endpoint_pool else self._get_client()
+        self._hedge_client: Optional["LLMClient"] = None
         self.tool_calls_handler = LLMToolCallsHandler(self)
 
     # ? Use tool calls
@@ -111,44 +138,46 @@ class LLMClient:
                 )
 
     def _get_openai_client(self):
-        if not get_openai_api_key_env():
+        if not (self._api_key or get_openai_api_key_env()):
             raise HTTPException(
                 status_code=400,
                 detail="OpenAI API Key is not set",
             )
-        return AsyncOpenAI()
+        return AsyncOpenAI(api_key=self._api_key, base_url=self._base_url)
 
     def _get_google_client(self):
-        if not get_google_api_key_env():
+        if not (self._api_key or get_google_api_key_env()):
             raise HTTPException(
                 status_code=400,
                 detail="Google API Key is not set",
             )
-        return genai.Client()
+        return genai.Client(api_key=self._api_key)
 
     def _get_anthropic_client(self):
-        if not get_anthropic_api_key_env():
+        if not (self._api_key or get_anthropic_api_key_env()):
             raise HTTPException(
                 status_code=400,
                 detail="Anthropic API Key is not set",
             )
-        return AsyncAnthropic()
+        return AsyncAnthropic(api_key=self._api_key)
 
     def _get_ollama_client(self):
         return AsyncOpenAI(
-            base_url=(get_ollama_url_env() or "http://localhost:11434") + "/v1",
+            base_url=self._base_url
+            or (get_ollama_url_env() or "http://localhost:11434") + "/v1",
             api_key="ollama",
         )
 
     def _get_custom_client(self):
-        if not get_custom_llm_url_env():
+        base_url = self._base_url or get_custom_llm_url_env()
+        if not base_url:
             raise HTTPException(
                 status_code=400,
                 detail="Custom LLM URL is not set",
             )
         return AsyncOpenAI(
-            base_url=get_custom_llm_url_env(),
-            api_key=get_custom_llm_api_key_env() or "null",
+            base_url=base_url,
+            api_key=self._api_key or get_custom_llm_api_key_env() or "null",
         )
 
     # ? Prompts
@@ -190,6 +219,42 @@ class LLMClient:
             message for message in messages if not isinstance(message, LLMSystemMessage)
         ]
 
+    def _get_anthropic_system(self, messages: List[LLMMessage]) -> str | List[dict]:
+        return LLM_PROMPT_CACHE.get_anthropic_system(self._get_system_prompt(messages))
+
+    def _get_openai_extra_body(
+        self, messages: List[LLMMessage], extra_body: Optional[dict]
+    ) -> Optional[dict]:
+        # Other OpenAI compatible APIs may reject unknown parameters
+        if self.llm_provider != LLMProvider.OPENAI:
+            return extra_body
+        prompt_cache_key = LLM_PROMPT_CACHE.get_prompt_cache_key(
+            self.purpose, self._get_system_prompt(messages)
+        )
+        if not prompt_cache_key:
+            return extra_body
+        return {**(extra_body or {}), "prompt_cache_key": prompt_cache_key}
+
+    async def _get_google_system_config(
+        self, model: str, messages: List[LLMMessage], tools: Optional[list]
+    ) -> dict:
+        """
+        Returns the system instruction, or the cached content holding it,
+        of a Gemini request config.
+        """
+        system_prompt = self._get_system_prompt(messages)
+        # Tools would have to be cached along with the system instruction
+        if not tools:
+            cached_content = await LLM_PROMPT_CACHE.get_google_cached_content(
+                self._client,
+                model,
+                system_prompt,
+                self._api_key or get_google_api_key_env(),
+            )
+            if cached_content:
+                return {"cached_content": cached_content}
+        return {"system_instruction": system_prompt}
+
     # ? Generate Unstructured Content
     async def _generate_openai(
         self,
@@ -206,8 +271,9 @@ class LLMClient:
             messages=[message.model_dump() for message in messages],
             max_completion_tokens=max_tokens,
             tools=tools,
-            extra_body=extra_body,
+            extra_body=self._get_openai_extra_body(messages, extra_body),
         )
+        record_llm_request(response.usage)
         if self.llm_provider == LLMProvider.OPENAI:
             track_openai_chat_completion_usage(model=model, usage=response.usage)
 
@@ -271,12 +337,13 @@ class LLMClient:
             contents=self._get_google_messages(messages),
             config=GenerateContentConfig(
                 tools=google_tools,
-                system_instruction=self._get_system_prompt(messages),
+                **await self._get_google_system_config(model, messages, google_tools),
                 response_mime_type="text/plain",
                 max_output_tokens=max_tokens,
             ),
         )
 
+        record_llm_request(response.usage_metadata)
         content = response.candidates[0].content
         response_parts = content.parts
 
@@ -331,7 +398,7 @@ class LLMClient:
 
         response: AnthropicMessage = await client.messages.create(
             model=model,
-            system=self._get_system_prompt(messages),
+            system=self._get_anthropic_system(messages),
             messages=[
                 message.model_dump()
                 for message in self._get_anthropic_messages(messages)
@@ -339,6 +406,7 @@ class LLMClient:
             tools=tools,
             max_tokens=max_tokens or 4000,
         )
+        record_llm_request(response.usage)
         text_content = None
         tool_calls: List[AnthropicToolCall] = []
         for content in response.content:
@@ -414,45 +482,58 @@ class LLMClient:
         max_tokens: Optional[int] = None,
         tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
     ):
-        parsed_tools = self.tool_calls_handler.parse_tools(tools)
+        if self._endpoint_pool:
+            return await self._endpoint_pool.call(
+                self.purpose,
+                model,
+                self.llm_provider,
+                lambda client, model: client.generate(
+                    model=model, messages=messages, max_tokens=max_tokens, tools=tools
+                ),
+            )
 
-        content = None
-        match self.llm_provider:
-            case LLMProvider.OPENAI:
-                content = await self._generate_openai(
-                    model=model,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    tools=parsed_tools,
-                )
-            case LLMProvider.GOOGLE:
-                content = await self._generate_google(
-                    model=model,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    tools=parsed_tools,
-                )
-            case LLMProvider.ANTHROPIC:
-                content = await self._generate_anthropic(
-                    model=model,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    tools=parsed_tools,
-                )
-            case LLMProvider.OLLAMA:
-                content = await self._generate_ollama(
-                    model=model, messages=messages, max_tokens=max_tokens
-                )
-            case LLMProvider.CUSTOM:
-                content = await self._generate_custom(
-                    model=model, messages=messages, max_tokens=max_tokens
+        with LLM_CALL_METRICS.track(
+            self.purpose, LLMCallType.UNSTRUCTURED, self.llm_provider, model
+        ):
+            parsed_tools = self.tool_calls_handler.parse_tools(tools)
+
+            content = None
+            match self.llm_provider:
+                case LLMProvider.OPENAI:
+                    content = await self._generate_openai(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        tools=parsed_tools,
+                    )
+                case LLMProvider.GOOGLE:
+                    content = await self._generate_google(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        tools=parsed_tools,
+                    )
+                case LLMProvider.ANTHROPIC:
+                    content = await self._generate_anthropic(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        tools=parsed_tools,
+                    )
+                case LLMProvider.OLLAMA:
+                    content = await self._generate_ollama(
+                        model=model, messages=messages, max_tokens=max_tokens
+                    )
+                case LLMProvider.CUSTOM:
+                    content = await self._generate_custom(
+                        model=model, messages=messages, max_tokens=max_tokens
+                    )
+            if content is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail="LLM did not return any content",
                 )
-        if content is None:
-            raise HTTPException(
-                status_code=400,
-                detail="LLM did not return any content",
-            )
-        return content
+            return content
 
     # ? Generate Structured Content
     async def _generate_openai_structured(
@@ -474,11 +555,7 @@ class LLMClient:
             self.use_tool_calls_for_structured_output()
         )
         if strict and depth == 0:
-            response_schema = ensure_strict_json_schema(
-                response_schema,
-                path=(),
-                root=response_schema,
-            )
+            response_schema = JSON_SCHEMA_CACHE.get_strict(response_schema)
         if use_tool_calls_for_structured_output and depth == 0:
             if all_tools is None:
                 all_tools = []
@@ -513,8 +590,9 @@ class LLMClient:
             ),
             max_completion_tokens=max_tokens,
             tools=all_tools,
-            extra_body=extra_body,
+            extra_body=self._get_openai_extra_body(messages, extra_body),
         )
+        record_llm_request(response.usage)
         if self.llm_provider == LLMProvider.OPENAI:
             track_openai_chat_completion_usage(model=model, usage=response.usage)
 
@@ -594,8 +672,8 @@ class LLMClient:
                         {
                             "name": "ResponseSchema",
                             "description": "Provide response to the user",
-                            "parameters": remove_titles_from_schema(
-                                flatten_json_schema(response_format)
+                            "parameters": JSON_SCHEMA_CACHE.get_flattened(
+                                response_format
                             ),
                         }
                     ]
@@ -617,13 +695,14 @@ class LLMClient:
                     if tools
                     else None
                 ),
-                system_instruction=self._get_system_prompt(messages),
+                **await self._get_google_system_config(model, messages, google_tools),
                 response_mime_type="application/json" if not tools else None,
                 response_json_schema=response_format if not tools else None,
                 max_output_tokens=max_tokens,
             ),
         )
 
+        record_llm_request(response.usage_metadata)
         content = response.candidates[0].content
         response_parts = content.parts
         text_content = None
@@ -686,7 +765,7 @@ class LLMClient:
         client: AsyncAnthropic = self._client
         response: AnthropicMessage = await client.messages.create(
             model=model,
-            system=self._get_system_prompt(messages),
+            system=self._get_anthropic_system(messages),
             messages=[
                 message.model_dump()
                 for message in self._get_anthropic_messages(messages)
@@ -701,6 +780,7 @@ class LLMClient:
                 *(tools or []),
             ],
         )
+        record_llm_request(response.usage)
         tool_calls: List[AnthropicToolCall] = []
         for content in response.content:
             if content.type == "tool_use":
@@ -781,6 +861,15 @@ class LLMClient:
             depth=depth,
         )
 
+    def _get_hedge_client(self) -> "LLMClient":
+        if not get_llm_hedging_api_key_env():
+            return self
+        if self._hedge_client is None:
+            self._hedge_client = LLMClient(
+                self.purpose, api_key=get_llm_hedging_api_key_env()
+            )
+        return self._hedge_client
+
     async def generate_structured(
         self,
         model: str,
@@ -790,57 +879,162 @@ class LLMClient:
         tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
         max_tokens: Optional[int] = None,
     ) -> dict:
-        parsed_tools = self.tool_calls_handler.parse_tools(tools)
-
-        content = None
-        match self.llm_provider:
-            case LLMProvider.OPENAI:
-                content = await self._generate_openai_structured(
-                    model=model,
-                    messages=messages,
-                    response_format=response_format,
-                    strict=strict,
-                    tools=parsed_tools,
-                    max_tokens=max_tokens,
-                )
-            case LLMProvider.GOOGLE:
-                content = await self._generate_google_structured(
-                    model=model,
-                    messages=messages,
-                    response_format=response_format,
-                    tools=parsed_tools,
-                    max_tokens=max_tokens,
-                )
-            case LLMProvider.ANTHROPIC:
-                content = await self._generate_anthropic_structured(
-                    model=model,
-                    messages=messages,
-                    response_format=response_format,
-                    tools=parsed_tools,
-                    max_tokens=max_tokens,
+        """
+        Generates structured content.
+        If hedging is enabled for the purpose of this client and the call runs
+        longer than the hedging percentile of recent calls, a duplicate request
+        is sent to LLM_HEDGING_MODEL or with LLM_HEDGING_API_KEY if set. The first
+        successful response is returned and the other request is cancelled.
+        """
+        kwargs = {
+            "messages": messages,
+            "response_format": response_format,
+            "strict": strict,
+            "tools": tools,
+            "max_tokens": max_tokens,
+        }
+        if self.purpose not in LLM_HEDGING_POLICY.purposes:
+            return await self._generate_structured(model, **kwargs)
+
+        # Not hedged until enough latencies are known
+        hedge_delay = LLM_HEDGING_POLICY.get_hedge_delay(
+            self.purpose, self.llm_provider, model
+        )
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        primary = asyncio.create_task(self._generate_structured(model, **kwargs))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if primary in done:
+                content = primary.result()
+                LLM_HEDGING_POLICY.observe(
+                    self.purpose, self.llm_provider, model, loop.time() - start
                 )
-            case LLMProvider.OLLAMA:
-                content = await self._generate_ollama_structured(
-                    model=model,
-                    messages=messages,
-                    response_format=response_format,
-                    strict=strict,
-                    max_tokens=max_tokens,
+                return content
+
+            hedge_model = get_llm_hedging_model_env() or model
+            print(
+                f"Hedging {self.purpose.value} call to {model} after "
+                f"{hedge_delay:.2f}s with {hedge_model}"
+            )
+            hedge = asyncio.create_task(
+                self._get_hedge_client()._generate_structured(hedge_model, **kwargs)
+            )
+            tasks.add(hedge)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
                 )
-            case LLMProvider.CUSTOM:
-                content = await self._generate_custom_structured(
+                # Primary wins ties as its result is from the requested model
+                for task in sorted(done, key=lambda task: task is not primary):
+                    if task.exception() is None:
+                        # Cancelled primaries are recorded at their elapsed time
+                        # so slow calls keep counting towards the percentile
+                        LLM_HEDGING_POLICY.observe(
+                            self.purpose,
+                            self.llm_provider,
+                            model,
+                            loop.time() - start,
+                        )
+                        PROMETHEUS_METRICS.llm_hedged_calls.labels(
+                            self.purpose.value,
+                            self.llm_provider.value,
+                            "primary" if task is primary else "hedge",
+                        ).inc()
+                        return task.result()
+            PROMETHEUS_METRICS.llm_hedged_calls.labels(
+                self.purpose.value, self.llm_provider.value, "none"
+            ).inc()
+            raise primary.exception()
+        finally:
+            for task in tasks:
+                if task.done() and not task.cancelled():
+                    # Failures of losing requests are retrieved so they are not
+                    # logged as never retrieved
+                    task.exception()
+                else:
+                    task.cancel()
+
+    async def _generate_structured(
+        self,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: dict,
+        strict: bool = False,
+        tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
+        max_tokens: Optional[int] = None,
+    ) -> dict:
+        if self._endpoint_pool:
+            return await self._endpoint_pool.call(
+                self.purpose,
+                model,
+                self.llm_provider,
+                lambda client, model: client._generate_structured(
                     model=model,
                     messages=messages,
                     response_format=response_format,
                     strict=strict,
+                    tools=tools,
                     max_tokens=max_tokens,
-                )
-        if content is None:
-            raise HTTPException(
-                status_code=400,
-                detail="LLM did not return any content",
+                ),
             )
-        return content
+
+        with LLM_CALL_METRICS.track(
+            self.purpose, LLMCallType.STRUCTURED, self.llm_provider, model
+        ):
+            parsed_tools = self.tool_calls_handler.parse_tools(tools)
+
+            content = None
+            match self.llm_provider:
+                case LLMProvider.OPENAI:
+                    content = await self._generate_openai_structured(
+                        model=model,
+                        messages=messages,
+                        response_format=response_format,
+                        strict=strict,
+                        tools=parsed_tools,
+                        max_tokens=max_tokens,
+                    )
+                case LLMProvider.GOOGLE:
+                    content = await self._generate_google_structured(
+                        model=model,
+                        messages=messages,
+                        response_format=response_format,
+                        tools=parsed_tools,
+                        max_tokens=max_tokens,
+                    )
+                case LLMProvider.ANTHROPIC:
+                    content = await self._generate_anthropic_structured(
+                        model=model,
+                        messages=messages,
+                        response_format=response_format,
+                        tools=parsed_tools,
+                        max_tokens=max_tokens,
+                    )
+                case LLMProvider.OLLAMA:
+                    content = await self._generate_ollama_structured(
+                        model=model,
+                        messages=messages,
+                        response_format=response_format,
+                        strict=strict,
+                        max_tokens=max_tokens,
+                    )
+                case LLMProvider.CUSTOM:
+                    content = await self._generate_custom_structured(
+                        model=model,
+                        messages=messages,
+                        response_format=response_format,
+                        strict=strict,
+                        max_tokens=max_tokens,
+                    )
+            if content is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail="LLM did not return any content",
+                )
+            return content
 
     # ? Stream Unstructured Content
     async def _stream_openai(
@@ -864,14 +1058,16 @@ class LLMClient:
             messages=[message.model_dump() for message in messages],
             max_completion_tokens=max_tokens,
             tools=tools,
-            extra_body=extra_body,
+            extra_body=self._get_openai_extra_body(messages, extra_body),
             stream=True,
         )
         if self.llm_provider == LLMProvider.OPENAI:
             request_payload["stream_options"] = {"include_usage": True}
 
+        record_llm_request()
         async for event in await client.chat.completions.create(**request_payload):
             event: OpenAIChatCompletionChunk = event
+            record_llm_usage(event.usage)
             if self.llm_provider == LLMProvider.OPENAI and event.usage:
                 track_openai_chat_completion_usage(model=model, usage=event.usage)
             if not event.choices:
@@ -962,16 +1158,20 @@ class LLMClient:
 
         generated_contents = []
         tool_calls: List[GoogleToolCall] = []
+        record_llm_request()
+        usage_metadata = None
         async for event in iterator_to_async(client.models.generate_content_stream)(
             model=model,
             contents=self._get_google_messages(messages),
             config=GenerateContentConfig(
-                system_instruction=self._get_system_prompt(messages),
+                **await self._get_google_system_config(model, messages, google_tools),
                 response_mime_type="text/plain",
                 tools=google_tools,
                 max_output_tokens=max_tokens,
             ),
         ):
+            # Usage of each chunk covers the whole response so far
+            usage_metadata = event.usage_metadata or usage_metadata
             if not (
                 event.candidates
                 and event.candidates[0].content
@@ -993,6 +1193,7 @@ class LLMClient:
                             arguments=each_part.function_call.args,
                         )
                     )
+        record_llm_usage(usage_metadata)
 
         if tool_calls:
             tool_call_messages = await self.tool_calls_handler.handle_tool_calls_google(
@@ -1029,9 +1230,10 @@ class LLMClient:
         client: AsyncAnthropic = self._client
 
         tool_calls: List[AnthropicToolCall] = []
+        record_llm_request()
         async with client.messages.stream(
             model=model,
-            system=self._get_system_prompt(messages),
+            system=self._get_anthropic_system(messages),
             messages=[
                 message.model_dump()
                 for message in self._get_anthropic_messages(messages)
@@ -1057,6 +1259,7 @@ class LLMClient:
                             input=event.content_block.input,
                         )
                     )
+            record_llm_usage(stream.current_message_snapshot.usage)
 
         if tool_calls:
             tool_call_messages = (
@@ -1116,39 +1319,57 @@ class LLMClient:
         max_tokens: Optional[int] = None,
         tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
     ):
+        if self._endpoint_pool:
+            return self._endpoint_pool.stream(
+                self.purpose,
+                model,
+                self.llm_provider,
+                lambda client, model: client.stream(
+                    model=model, messages=messages, max_tokens=max_tokens, tools=tools
+                ),
+            )
+
         parsed_tools = self.tool_calls_handler.parse_tools(tools)
 
         match self.llm_provider:
             case LLMProvider.OPENAI:
-                return self._stream_openai(
+                stream = self._stream_openai(
                     model=model,
                     messages=messages,
                     max_tokens=max_tokens,
                     tools=parsed_tools,
                 )
             case LLMProvider.GOOGLE:
-                return self._stream_google(
+                stream = self._stream_google(
                     model=model,
                     messages=messages,
                     max_tokens=max_tokens,
                     tools=parsed_tools,
                 )
             case LLMProvider.ANTHROPIC:
-                return self._stream_anthropic(
+                stream = self._stream_anthropic(
                     model=model,
                     messages=messages,
                     max_tokens=max_tokens,
                     tools=parsed_tools,
                 )
             case LLMProvider.OLLAMA:
-                return self._stream_ollama(
+                stream = self._stream_ollama(
                     model=model, messages=messages, max_tokens=max_tokens
                 )
             case LLMProvider.CUSTOM:
-                return self._stream_custom(
+                stream = self._stream_custom(
                     model=model, messages=messages, max_tokens=max_tokens
                 )
 
+        return LLM_CALL_METRICS.track_stream(
+            stream,
+            self.purpose,
+            LLMCallType.UNSTRUCTURED_STREAM,
+            self.llm_provider,
+            model,
+        )
+
     # ? Stream Structured Content
     async def _stream_openai_structured(
         self,
@@ -1170,11 +1391,7 @@ class LLMClient:
             self.use_tool_calls_for_structured_output()
         )
         if strict and depth == 0:
-            response_schema = ensure_strict_json_schema(
-                response_schema,
-                path=(),
-                root=response_schema,
-            )
+            response_schema = JSON_SCHEMA_CACHE.get_strict(response_schema)
 
         if use_tool_calls_for_structured_output and depth == 0:
             if all_tools is None:
@@ -1217,14 +1434,16 @@ class LLMClient:
                 if not use_tool_calls_for_structured_output
                 else None
             ),
-            extra_body=extra_body,
+            extra_body=self._get_openai_extra_body(messages, extra_body),
             stream=True,
         )
         if self.llm_provider == LLMProvider.OPENAI:
             request_payload["stream_options"] = {"include_usage": True}
 
+        record_llm_request()
         async for event in await client.chat.completions.create(**request_payload):
             event: OpenAIChatCompletionChunk = event
+            record_llm_usage(event.usage)
             if self.llm_provider == LLMProvider.OPENAI and event.usage:
                 track_openai_chat_completion_usage(model=model, usage=event.usage)
             if not event.choices:
@@ -1327,8 +1546,8 @@ class LLMClient:
                         {
                             "name": "ResponseSchema",
                             "description": "Provide response to the user",
-                            "parameters": remove_titles_from_schema(
-                                flatten_json_schema(response_format)
+                            "parameters": JSON_SCHEMA_CACHE.get_flattened(
+                                response_format
                             ),
                         }
                     ]
@@ -1340,6 +1559,8 @@ class LLMClient:
         generated_contents = []
         tool_calls: List[GoogleToolCall] = []
         has_response_schema_tool_call = False
+        record_llm_request()
+        usage_metadata = None
         async for event in iterator_to_async(client.models.generate_content_stream)(
             model=model,
             contents=parsed_messages,
@@ -1354,12 +1575,14 @@ class LLMClient:
                     if tools
                     else None
                 ),
-                system_instruction=self._get_system_prompt(messages),
+                **await self._get_google_system_config(model, messages, google_tools),
                 response_mime_type="application/json" if not tools else None,
                 response_json_schema=response_format if not tools else None,
                 max_output_tokens=max_tokens,
             ),
         ):
+            # Usage of each chunk covers the whole response so far
+            usage_metadata = event.usage_metadata or usage_metadata
             if not (
                 event.candidates
                 and event.candidates[0].content
@@ -1386,6 +1609,7 @@ class LLMClient:
                             arguments=each_part.function_call.args,
                         )
                     )
+        record_llm_usage(usage_metadata)
 
         if tool_calls and not has_response_schema_tool_call:
             tool_call_messages = await self.tool_calls_handler.handle_tool_calls_google(
@@ -1425,9 +1649,10 @@ class LLMClient:
 
         tool_calls: List[AnthropicToolCall] = []
         has_response_schema_tool_call = False
+        record_llm_request()
         async with client.messages.stream(
             model=model,
-            system=self._get_system_prompt(messages),
+            system=self._get_anthropic_system(messages),
             messages=[
                 message.model_dump()
                 for message in self._get_anthropic_messages(messages)
@@ -1473,6 +1698,7 @@ class LLMClient:
                             input=event.content_block.input,
                         )
                     )
+            record_llm_usage(stream.current_message_snapshot.usage)
 
         if tool_calls and not has_response_schema_tool_call:
             tool_call_messages = (
@@ -1546,11 +1772,26 @@ class LLMClient:
         tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
         max_tokens: Optional[int] = None,
     ):
+        if self._endpoint_pool:
+            return self._endpoint_pool.stream(
+                self.purpose,
+                model,
+                self.llm_provider,
+                lambda client, model: client.stream_structured(
+                    model=model,
+                    messages=messages,
+                    response_format=response_format,
+                    strict=strict,
+                    tools=tools,
+                    max_tokens=max_tokens,
+                ),
+            )
+
         parsed_tools = self.tool_calls_handler.parse_tools(tools)
 
         match self.llm_provider:
             case LLMProvider.OPENAI:
-                return self._stream_openai_structured(
+                stream = self._stream_openai_structured(
                     model=model,
                     messages=messages,
                     response_format=response_format,
@@ -1559,7 +1800,7 @@ class LLMClient:
                     max_tokens=max_tokens,
                 )
             case LLMProvider.GOOGLE:
-                return self._stream_google_structured(
+                stream = self._stream_google_structured(
                     model=model,
                     messages=messages,
                     response_format=response_format,
@@ -1567,7 +1808,7 @@ class LLMClient:
                     max_tokens=max_tokens,
                 )
             case LLMProvider.ANTHROPIC:
-                return self._stream_anthropic_structured(
+                stream = self._stream_anthropic_structured(
                     model=model,
                     messages=messages,
                     response_format=response_format,
@@ -1575,7 +1816,7 @@ class LLMClient:
                     max_tokens=max_tokens,
                 )
             case LLMProvider.OLLAMA:
-                return self._stream_ollama_structured(
+                stream = self._stream_ollama_structured(
                     model=model,
                     messages=messages,
                     response_format=response_format,
@@ -1583,7 +1824,7 @@ class LLMClient:
                     max_tokens=max_tokens,
                 )
             case LLMProvider.CUSTOM:
-                return self._stream_custom_structured(
+                stream = self._stream_custom_structured(
                     model=model,
                     messages=messages,
                     response_format=response_format,
@@ -1591,6 +1832,14 @@ class LLMClient:
                     max_tokens=max_tokens,
                 )
 
+        return LLM_CALL_METRICS.track_stream(
+            stream,
+            self.purpose,
+            LLMCallType.STRUCTURED_STREAM,
+            self.llm_provider,
+            model,
+        )
+
     # ? Web search
     async def _search_openai(self, query: str) -> str:
         client: AsyncOpenAI = self._client
@@ -1603,6 +1852,7 @@ class LLMClient:
             ],
             input=query,
         )
+        record_llm_request(response.usage)
         if self.llm_provider == LLMProvider.OPENAI:
             track_openai_response_usage(model=get_model(), usage=response.usage)
         return response.output_text
@@ -1618,6 +1868,7 @@ class LLMClient:
             contents=query,
             config=config,
         )
+        record_llm_request(response.usage_metadata)
         return response.text
 
     async def _search_anthropic(self, query: str) -> str:
@@ -1631,6 +1882,7 @@ class LLMClient:
                 {"type": "web_search_20250305", "name": "web_search", "max_uses": 1}
             ],
         )
+        record_llm_request(response.usage)
         result = "\n".join(
             [each.text for each in response.content if each.type == "text"]
         )
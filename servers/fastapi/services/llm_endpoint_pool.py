@@ -0,0 +1,364 @@
+import asyncio
+import json
+import random
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+)
+
+from fastapi import HTTPException
+from pydantic import TypeAdapter
+
+from enums.llm_call_purpose import LLMCallPurpose
+from enums.llm_provider import LLMProvider
+from models.llm_endpoint import LLMEndpointConfig, LLMEndpointHealth
+from services.prometheus_metrics import PROMETHEUS_METRICS
+from utils.get_env import (
+    get_llm_circuit_breaker_cooldown_env,
+    get_llm_circuit_breaker_threshold_env,
+    get_llm_endpoints_env,
+    get_llm_routing_env,
+)
+from utils.llm_provider import get_model
+from utils.parsers import parse_int_or_default
+
+if TYPE_CHECKING:
+    from services.llm_client import LLMClient
+
+
+DEFAULT_CIRCUIT_BREAKER_THRESHOLD = 3
+DEFAULT_CIRCUIT_BREAKER_COOLDOWN = 30
+# Weight of the latest latency in the moving average
+LATENCY_SMOOTHING = 0.2
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+def get_llm_error_status(error: BaseException) -> Optional[int]:
+    # OpenAI and Anthropic errors have status_code, Google errors have code
+    for name in ("status_code", "code"):
+        status = getattr(error, name, None)
+        if isinstance(status, int):
+            return status
+    return None
+
+
+def is_retryable_llm_error(error: BaseException) -> bool:
+    """
+    Returns whether another endpoint may succeed where this one failed,
+    which is the case for rate limits, server errors, timeouts and
+    connection errors.
+    """
+    if isinstance(error, HTTPException):
+        return False
+    status = get_llm_error_status(error)
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(error, (asyncio.TimeoutError, ConnectionError)) or type(
+        error
+    ).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMEndpoint:
+    """
+    An LLM endpoint with its health and circuit breaker.
+
+    The circuit opens after consecutive retryable failures or on a rate limit,
+    and the endpoint is skipped until the cooldown or retry-after passes.
+    It then lets a single request through, which closes the circuit if it
+    succeeds and opens it again otherwise.
+    """
+
+    def __init__(self, config: LLMEndpointConfig):
+        self.config = config
+        self.latency: Optional[float] = None
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.opened_until = 0.0
+        self.is_trial_in_progress = False
+        self._clients: Dict[LLMCallPurpose, "LLMClient"] = {}
+
+    @property
+    def name(self) -> str:
+        return self.config.name
+
+    @property
+    def state(self) -> str:
+        if self.opened_until == 0:
+            return CIRCUIT_CLOSED
+        if time.monotonic() < self.opened_until:
+            return CIRCUIT_OPEN
+        return CIRCUIT_HALF_OPEN
+
+    def is_available(self) -> bool:
+        state = self.state
+        return state == CIRCUIT_CLOSED or (
+            state == CIRCUIT_HALF_OPEN and not self.is_trial_in_progress
+        )
+
+    def get_client(self, purpose: LLMCallPurpose) -> "LLMClient":
+        from services.llm_client import LLMClient
+
+        client = self._clients.get(purpose)
+        if client is None:
+            client = LLMClient(
+                purpose,
+                api_key=self.config.api_key,
+                llm_provider=self.config.provider,
+                base_url=self.config.base_url,
+            )
+            self._clients[purpose] = client
+        return client
+
+    def get_model(self, model: str, default_provider: LLMProvider) -> str:
+        if self.config.model:
+            return self.config.model
+        if self.config.provider == default_provider:
+            return model
+        return get_model(self.config.provider)
+
+    def start_request(self):
+        self.requests += 1
+        if self.state == CIRCUIT_HALF_OPEN:
+            self.is_trial_in_progress = True
+
+    def record_success(self, latency: float):
+        self.is_trial_in_progress = False
+        self.consecutive_failures = 0
+        self.opened_until = 0.0
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += LATENCY_SMOOTHING * (latency - self.latency)
+
+    def record_failure(self, error: BaseException, threshold: int, cooldown: float):
+        self.is_trial_in_progress = False
+        self.failures += 1
+        self.consecutive_failures += 1
+        status = get_llm_error_status(error)
+        if status == 429 or self.consecutive_failures >= threshold:
+            self.opened_until = time.monotonic() + (get_retry_after(error) or cooldown)
+        PROMETHEUS_METRICS.llm_endpoint_failures.labels(
+            self.name, str(status or type(error).__name__)
+        ).inc()
+
+    def release(self):
+        # Requests that neither succeeded nor failed, such as cancelled ones
+        self.is_trial_in_progress = False
+
+    def get_health(self) -> LLMEndpointHealth:
+        return LLMEndpointHealth(
+            name=self.name,
+            provider=self.config.provider,
+            state=self.state,
+            latency=self.latency,
+            requests=self.requests,
+            failures=self.failures,
+            consecutive_failures=self.consecutive_failures,
+        )
+
+
+class LLMEndpointPool:
+    """
+    Routes LLM calls over several endpoints and fails over to the next one on
+    rate limits, server errors and connection errors.
+
+    Endpoints are tried in order of their moving average latency with
+    least_latency routing, endpoints without a latency yet first, or in a
+    random order weighted by their weight with weighted routing.
+    Fallback endpoints are tried last.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[LLMEndpointConfig],
+        routing: str = "weighted",
+        threshold: int = DEFAULT_CIRCUIT_BREAKER_THRESHOLD,
+        cooldown: float = DEFAULT_CIRCUIT_BREAKER_COOLDOWN,
+    ):
+        self.endpoints = [LLMEndpoint(config) for config in endpoints]
+        self.routing = routing
+        self.threshold = threshold
+        self.cooldown = cooldown
+
+    def _order(self, endpoints: List[LLMEndpoint]) -> List[LLMEndpoint]:
+        if self.routing == "least_latency":
+            return sorted(
+                endpoints,
+                key=lambda endpoint: (
+                    endpoint.latency is not None,
+                    endpoint.latency or 0,
+                ),
+            )
+        # Weighted shuffle, each endpoint is drawn with probability
+        # proportional to its weight among those left
+        return sorted(
+            endpoints,
+            key=lambda endpoint: random.random() ** (1 / endpoint.config.weight),
+            reverse=True,
+        )
+
+    def get_candidates(self) -> List[LLMEndpoint]:
+        available = [endpoint for endpoint in self.endpoints if endpoint.is_available()]
+        return self._order(
+            [endpoint for endpoint in available if not endpoint.config.fallback]
+        ) + self._order([endpoint for endpoint in available if endpoint.config.fallback])
+
+    def _get_unavailable_error(
+        self, last_error: Optional[BaseException]
+    ) -> BaseException:
+        if last_error is not None:
+            return last_error
+        return HTTPException(
+            status_code=503,
+            detail="All LLM endpoints are unavailable, please try again later",
+        )
+
+    async def call(
+        self,
+        purpose: LLMCallPurpose,
+        model: str,
+        default_provider: LLMProvider,
+        call: Callable[["LLMClient", str], Awaitable[Any]],
+    ) -> Any:
+        last_error = None
+        for endpoint in self.get_candidates():
+            endpoint.start_request()
+            start = time.perf_counter()
+            try:
+                result = await call(
+                    endpoint.get_client(purpose),
+                    endpoint.get_model(model, default_provider),
+                )
+            except Exception as e:
+                if not is_retryable_llm_error(e):
+                    endpoint.release()
+                    raise
+                print(f"LLM endpoint {endpoint.name} failed, trying next one: {e}")
+                endpoint.record_failure(e, self.threshold, self.cooldown)
+                last_error = e
+                continue
+            except BaseException:
+                endpoint.release()
+                raise
+            endpoint.record_success(time.perf_counter() - start)
+            return result
+        raise self._get_unavailable_error(last_error)
+
+    async def stream(
+        self,
+        purpose: LLMCallPurpose,
+        model: str,
+        default_provider: LLMProvider,
+        stream: Callable[["LLMClient", str], AsyncIterator[Any]],
+    ) -> AsyncGenerator[Any, None]:
+        """
+        Streams from the first endpoint that returns a chunk.
+        Errors after the first chunk are raised as chunks can not be taken back.
+        """
+        last_error = None
+        for endpoint in self.get_candidates():
+            endpoint.start_request()
+            start = time.perf_counter()
+            chunks = None
+            try:
+                chunks = stream(
+                    endpoint.get_client(purpose),
+                    endpoint.get_model(model, default_provider),
+                )
+                first_chunk = await chunks.__anext__()
+            except StopAsyncIteration:
+                endpoint.record_success(time.perf_counter() - start)
+                return
+            except Exception as e:
+                if not is_retryable_llm_error(e):
+                    endpoint.release()
+                    raise
+                print(f"LLM endpoint {endpoint.name} failed, trying next one: {e}")
+                endpoint.record_failure(e, self.threshold, self.cooldown)
+                last_error = e
+                continue
+            except BaseException:
+                endpoint.release()
+                if chunks is not None:
+                    await chunks.aclose()
+                raise
+
+            # Health is judged by time to first chunk for streams
+            endpoint.record_success(time.perf_counter() - start)
+            try:
+                yield first_chunk
+                async for chunk in chunks:
+                    yield chunk
+            finally:
+                await chunks.aclose()
+            return
+        raise self._get_unavailable_error(last_error)
+
+    def get_health(self) -> List[LLMEndpointHealth]:
+        return [endpoint.get_health() for endpoint in self.endpoints]
+
+
+def parse_llm_endpoints(value: Optional[str]) -> List[LLMEndpointConfig]:
+    if not value:
+        return []
+    return TypeAdapter(List[LLMEndpointConfig]).validate_python(json.loads(value))
+
+
+_LLM_ENDPOINT_POOL: Optional[LLMEndpointPool] = None
+_LLM_ENDPOINTS_ENV: Optional[str] = None
+
+
+def get_llm_endpoint_pool() -> Optional[LLMEndpointPool]:
+    """
+    Returns the pool of endpoints in LLM_ENDPOINTS, or None if it is not set.
+    The pool is rebuilt, losing endpoint health, only when LLM_ENDPOINTS changes.
+    """
+    global _LLM_ENDPOINT_POOL, _LLM_ENDPOINTS_ENV
+
+    endpoints_env = get_llm_endpoints_env()
+    if not endpoints_env:
+        return None
+    if endpoints_env != _LLM_ENDPOINTS_ENV:
+        try:
+            endpoints = parse_llm_endpoints(endpoints_env)
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"Invalid LLM_ENDPOINTS: {e}"
+            )
+        _LLM_ENDPOINT_POOL = LLMEndpointPool(
+            endpoints,
+            routing=get_llm_routing_env() or "weighted",
+            threshold=parse_int_or_default(
+                get_llm_circuit_breaker_threshold_env(),
+                DEFAULT_CIRCUIT_BREAKER_THRESHOLD,
+            ),
+            cooldown=parse_int_or_default(
+                get_llm_circuit_breaker_cooldown_env(),
+                DEFAULT_CIRCUIT_BREAKER_COOLDOWN,
+            ),
+        )
+        _LLM_ENDPOINTS_ENV = endpoints_env
+    return _LLM_ENDPOINT_POOL
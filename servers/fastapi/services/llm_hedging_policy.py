@@ -0,0 +1,102 @@
+from collections import deque
+import math
+from typing import Deque, Dict, Optional, Set, Tuple
+
+from enums.llm_call_purpose import LLMCallPurpose
+from enums.llm_provider import LLMProvider
+from utils.get_env import (
+    get_llm_hedging_min_samples_env,
+    get_llm_hedging_percentile_env,
+    get_llm_hedging_purposes_env,
+)
+from utils.parsers import parse_int_or_default
+
+
+DEFAULT_LLM_HEDGING_PERCENTILE = 95
+DEFAULT_LLM_HEDGING_MIN_SAMPLES = 20
+DEFAULT_LLM_HEDGING_WINDOW = 200
+
+
+class LLMHedgingPolicy:
+    """
+    Decides when a structured LLM call should be hedged with a duplicate request.
+
+    Latencies of recent calls are kept per purpose, provider and model, and a
+    call is hedged once it runs longer than the configured percentile of them.
+    Calls are not hedged until enough latencies are known.
+    """
+
+    def __init__(
+        self,
+        purposes: Optional[Set[LLMCallPurpose]] = None,
+        percentile: Optional[int] = None,
+        min_samples: Optional[int] = None,
+        window: int = DEFAULT_LLM_HEDGING_WINDOW,
+    ):
+        self._purposes = purposes
+        self._percentile = percentile
+        self._min_samples = min_samples
+        self.window = window
+        self._latencies: Dict[Tuple[str, str, str], Deque[float]] = {}
+
+    @property
+    def purposes(self) -> Set[LLMCallPurpose]:
+        if self._purposes is not None:
+            return self._purposes
+        purposes = set()
+        for value in (get_llm_hedging_purposes_env() or "").split(","):
+            try:
+                purposes.add(LLMCallPurpose(value.strip().lower()))
+            except ValueError:
+                pass
+        return purposes
+
+    @property
+    def percentile(self) -> int:
+        percentile = self._percentile
+        if percentile is None:
+            percentile = parse_int_or_default(
+                get_llm_hedging_percentile_env(), DEFAULT_LLM_HEDGING_PERCENTILE
+            )
+        return min(max(percentile, 1), 99)
+
+    @property
+    def min_samples(self) -> int:
+        if self._min_samples is not None:
+            return self._min_samples
+        return parse_int_or_default(
+            get_llm_hedging_min_samples_env(), DEFAULT_LLM_HEDGING_MIN_SAMPLES
+        )
+
+    def observe(
+        self,
+        purpose: LLMCallPurpose,
+        provider: LLMProvider,
+        model: str,
+        latency: float,
+    ):
+        key = (purpose.value, provider.value, model)
+        latencies = self._latencies.get(key)
+        if latencies is None:
+            latencies = deque(maxlen=self.window)
+            self._latencies[key] = latencies
+        latencies.append(latency)
+
+    def get_hedge_delay(
+        self, purpose: LLMCallPurpose, provider: LLMProvider, model: str
+    ) -> Optional[float]:
+        """
+        Returns seconds after which a call should be hedged,
+        or None if it should not be.
+        """
+        if purpose not in self.purposes:
+            return None
+        latencies = self._latencies.get((purpose.value, provider.value, model))
+        if not latencies or len(latencies) < self.min_samples:
+            return None
+        sorted_latencies = sorted(latencies)
+        index = math.ceil(len(sorted_latencies) * self.percentile / 100) - 1
+        return sorted_latencies[index]
+
+
+LLM_HEDGING_POLICY = LLMHedgingPolicy()
@@ -0,0 +1,136 @@
+import asyncio
+import hashlib
+import time
+from typing import Dict, List, Optional, Tuple
+
+from google import genai
+from google.genai.types import CreateCachedContentConfig
+
+from enums.llm_call_purpose import LLMCallPurpose
+from utils.get_env import get_llm_prompt_caching_env
+from utils.parsers import parse_bool_or_none
+
+
+DEFAULT_GOOGLE_CACHE_TTL = 300
+# Gemini does not cache prompts shorter than 1024 tokens, about 4 characters each
+GOOGLE_MIN_CACHED_CHARACTERS = 4096
+# Cached contents are not used this close to expiring
+GOOGLE_CACHE_EXPIRY_MARGIN = 30
+
+
+class LLMPromptCache:
+    """
+    Marks the system prompt, the static prefix of LLM requests, as cacheable so
+    repeated prefixes are billed and processed at the cached rate.
+
+    Anthropic system prompts get a cache_control block, OpenAI requests get a
+    prompt_cache_key so requests sharing a prefix are routed to the same cache,
+    and Gemini system prompts are stored as cached contents which are reused
+    until they expire.
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        google_cache_ttl: int = DEFAULT_GOOGLE_CACHE_TTL,
+    ):
+        self._enabled = enabled
+        self.google_cache_ttl = google_cache_ttl
+        # Cached content names, or None if caching failed, and when they expire,
+        # by hashes of the API key and the prompt and the model
+        self._google_caches: Dict[
+            Tuple[str, str, str], Tuple[Optional[str], float]
+        ] = {}
+        self._google_cache_tasks: Dict[Tuple[str, str, str], asyncio.Task] = {}
+
+    @property
+    def enabled(self) -> bool:
+        if self._enabled is not None:
+            return self._enabled
+        enabled = parse_bool_or_none(get_llm_prompt_caching_env())
+        return enabled is None or enabled
+
+    def get_prompt_hash(self, prompt: str) -> str:
+        return hashlib.sha256(prompt.encode()).hexdigest()[:16]
+
+    def get_prompt_cache_key(
+        self, purpose: LLMCallPurpose, system_prompt: str
+    ) -> Optional[str]:
+        if not (self.enabled and system_prompt):
+            return None
+        return f"presenton-{purpose.value}-{self.get_prompt_hash(system_prompt)}"
+
+    def get_anthropic_system(self, system_prompt: str) -> str | List[dict]:
+        if not (self.enabled and system_prompt):
+            return system_prompt
+        return [
+            {
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+
+    async def get_google_cached_content(
+        self,
+        client: genai.Client,
+        model: str,
+        system_prompt: str,
+        api_key: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Returns name of the cached content holding the system prompt, or None
+        if it should be sent with the request.
+        Cached contents belong to the project of the API key they were created
+        with, so they are only shared by clients using the same key.
+        Concurrent requests with the same prompt wait for one cached content.
+        """
+        if not self.enabled or len(system_prompt) < GOOGLE_MIN_CACHED_CHARACTERS:
+            return None
+
+        key = (
+            self.get_prompt_hash(api_key or ""),
+            model,
+            self.get_prompt_hash(system_prompt),
+        )
+        cached = self._google_caches.get(key)
+        if cached and time.monotonic() < cached[1]:
+            return cached[0]
+
+        task = self._google_cache_tasks.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(
+                self._create_google_cached_content(client, model, system_prompt)
+            )
+            self._google_cache_tasks[key] = task
+        try:
+            name = await asyncio.shield(task)
+        finally:
+            if task.done() and self._google_cache_tasks.get(key) is task:
+                del self._google_cache_tasks[key]
+        # Failures are also remembered so they are not retried on every request
+        self._google_caches[key] = (
+            name,
+            time.monotonic() + self.google_cache_ttl - GOOGLE_CACHE_EXPIRY_MARGIN,
+        )
+        return name
+
+    async def _create_google_cached_content(
+        self, client: genai.Client, model: str, system_prompt: str
+    ) -> Optional[str]:
+        try:
+            cached_content = await asyncio.to_thread(
+                client.caches.create,
+                model=model,
+                config=CreateCachedContentConfig(
+                    system_instruction=system_prompt,
+                    ttl=f"{self.google_cache_ttl}s",
+                ),
+            )
+            return cached_content.name
+        except Exception as e:
+            print(f"Failed to cache system prompt of {model}: {e}")
+            return None
+
+
+LLM_PROMPT_CACHE = LLMPromptCache()
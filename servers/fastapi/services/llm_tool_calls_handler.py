@@ -11,11 +11,7 @@ from models.llm_message import (
 )
 from models.llm_tool_call import AnthropicToolCall, GoogleToolCall, OpenAIToolCall
 from models.llm_tools import LLMDynamicTool, LLMTool, SearchWebTool
-from utils.schema_utils import (
-    ensure_strict_json_schema,
-    flatten_json_schema,
-    remove_titles_from_schema,
-)
+from services.json_schema_cache import JSON_SCHEMA_CACHE
 
 
 class LLMToolCallsHandler:
@@ -79,7 +75,7 @@ class LLMToolCallsHandler:
             parameters = tool.model_json_schema()
 
         if strict:
-            parameters = ensure_strict_json_schema(parameters, path=(), root=parameters)
+            parameters = JSON_SCHEMA_CACHE.get_strict(parameters)
 
         return {
             "type": "function",
@@ -94,9 +90,7 @@ class LLMToolCallsHandler:
     def parse_tool_google(self, tool: type[LLMTool] | LLMDynamicTool):
         parsed = self.parse_tool_openai(tool)
         parsed["function"]["parameters"] = (
-            remove_titles_from_schema(
-                flatten_json_schema(parsed["function"]["parameters"])
-            )
+            JSON_SCHEMA_CACHE.get_flattened(parsed["function"]["parameters"])
             if parsed["function"]["parameters"]
             else {}
         )
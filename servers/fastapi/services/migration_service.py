@@ -0,0 +1,60 @@
+from typing import List, Optional, Set
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import SQLModel, select
+
+from migrations import MIGRATIONS
+from models.sql.schema_migration import SchemaMigrationModel
+from utils.datetime_utils import get_current_utc_datetime
+from utils.migration_utils import Migration
+
+
+async def get_applied_migration_versions(engine: AsyncEngine) -> Set[int]:
+    async with engine.connect() as conn:
+        result = await conn.execute(select(SchemaMigrationModel.version))
+        return set(result.scalars().all())
+
+
+async def run_migrations(
+    engine: AsyncEngine, migrations: Optional[List[Migration]] = None
+) -> List[int]:
+    """
+    Applies pending migrations in version order and records them in schema_migrations.
+    Each migration runs in its own transaction together with its version row, so
+    when several workers start at once only one of them records it.
+    Returns the versions applied by this call.
+    """
+    migrations = sorted(migrations or MIGRATIONS, key=lambda m: m.version)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: SQLModel.metadata.create_all(
+                sync_conn, tables=[SchemaMigrationModel.__table__]
+            )
+        )
+
+    applied_versions = await get_applied_migration_versions(engine)
+    newly_applied = []
+    for migration in migrations:
+        if migration.version in applied_versions:
+            continue
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(migration.upgrade)
+                await conn.execute(
+                    insert(SchemaMigrationModel.__table__).values(
+                        version=migration.version,
+                        name=migration.name,
+                        applied_at=get_current_utc_datetime(),
+                    )
+                )
+        except Exception:
+            # Another worker may have applied it concurrently
+            if migration.version in await get_applied_migration_versions(engine):
+                continue
+            raise
+        print(f"Applied database migration {migration.version}: {migration.name}")
+        newly_applied.append(migration.version)
+
+    return newly_applied
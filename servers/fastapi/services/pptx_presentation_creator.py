@@ -2,6 +2,7 @@ import os
 from typing import List, Optional
 from lxml import etree
 from services.html_to_text_runs_service import (
+    TextRun,
     parse_html_text_to_text_runs as parse_inline_html_to_runs,
 )
 
@@ -17,12 +18,15 @@ from pptx.oxml.xmlchemy import OxmlElement
 from pptx.util import Pt
 from pptx.dml.color import RGBColor
 
+from models.export_stats import ExportStatsModel
 from models.pptx_models import (
     PptxAutoShapeBoxModel,
     PptxBoxShapeEnum,
     PptxConnectorModel,
     PptxFillModel,
     PptxFontModel,
+    PptxImageCompressionModel,
+    PptxImageCompressionStatsModel,
     PptxParagraphModel,
     PptxPictureBoxModel,
     PptxPositionModel,
@@ -38,7 +42,9 @@ from utils.download_helpers import download_files
 from utils.image_utils import (
     clip_image,
     create_circle_image,
+    downsample_image,
     fit_image,
+    has_transparency,
     invert_image,
     round_image_corners,
     set_image_opacity,
@@ -49,8 +55,17 @@ BLANK_SLIDE_LAYOUT = 6
 
 
 class PptxPresentationCreator:
-    def __init__(self, ppt_model: PptxPresentationModel, temp_dir: str):
+    def __init__(
+        self,
+        ppt_model: PptxPresentationModel,
+        temp_dir: str,
+        image_compression: Optional[PptxImageCompressionModel] = None,
+        stats: Optional[ExportStatsModel] = None,
+    ):
         self._temp_dir = temp_dir
+        self._image_compression = image_compression
+        self.image_compression_stats = PptxImageCompressionStatsModel()
+        self.stats = stats or ExportStatsModel()
 
         self._ppt_model = ppt_model
         self._slide_models = ppt_model.slides
@@ -67,58 +82,65 @@ class PptxPresentationCreator:
         return element
 
     async def fetch_network_assets(self):
-        image_urls = []
-        models_with_network_asset: List[PptxPictureBoxModel] = []
+        # Same url is downloaded only once and shared by all shapes using it
+        models_with_network_asset: dict[str, List[PptxPictureBoxModel]] = {}
 
+        picture_models: List[PptxPictureBoxModel] = []
         if self._ppt_model.shapes:
-            for each_shape in self._ppt_model.shapes:
-                if isinstance(each_shape, PptxPictureBoxModel):
-                    image_path = each_shape.picture.path
-                    if image_path.startswith("http"):
-                        if "app_data/" in image_path:
-                            relative_path = image_path.split("app_data/")[1]
-                            each_shape.picture.path = os.path.join(
-                                "/app_data", relative_path
-                            )
-                            each_shape.picture.is_network = False
-                            continue
-                        image_urls.append(image_path)
-                        models_with_network_asset.append(each_shape)
-
+            picture_models.extend(
+                each_shape
+                for each_shape in self._ppt_model.shapes
+                if isinstance(each_shape, PptxPictureBoxModel)
+            )
         for each_slide in self._slide_models:
-            for each_shape in each_slide.shapes:
-                if isinstance(each_shape, PptxPictureBoxModel):
-                    image_path = each_shape.picture.path
-                    if image_path.startswith("http"):
-                        if "app_data" in image_path:
-                            relative_path = image_path.split("app_data/")[1]
-                            each_shape.picture.path = os.path.join(
-                                "/app_data", relative_path
-                            )
-                            each_shape.picture.is_network = False
-                            continue
-                        image_urls.append(image_path)
-                        models_with_network_asset.append(each_shape)
-
-        if image_urls:
+            picture_models.extend(
+                each_shape
+                for each_shape in each_slide.shapes
+                if isinstance(each_shape, PptxPictureBoxModel)
+            )
+
+        for each_shape in picture_models:
+            image_path = each_shape.picture.path
+            if image_path.startswith("http"):
+                if "app_data/" in image_path:
+                    relative_path = image_path.split("app_data/")[1]
+                    each_shape.picture.path = os.path.join("/app_data", relative_path)
+                    each_shape.picture.is_network = False
+                    self.stats.asset_cache_hits += 1
+                    continue
+                if image_path in models_with_network_asset:
+                    self.stats.asset_cache_hits += 1
+                models_with_network_asset.setdefault(image_path, []).append(each_shape)
+
+        if models_with_network_asset:
+            image_urls = list(models_with_network_asset.keys())
             image_paths = await download_files(image_urls, self._temp_dir)
 
-            for each_shape, each_image_path in zip(
-                models_with_network_asset, image_paths
-            ):
-                if each_image_path:
+            for each_image_url, each_image_path in zip(image_urls, image_paths):
+                if not each_image_path:
+                    continue
+                self.stats.assets_downloaded += 1
+                self.stats.bytes_downloaded += os.path.getsize(each_image_path)
+                for each_shape in models_with_network_asset[each_image_url]:
                     each_shape.picture.path = each_image_path
                     each_shape.picture.is_network = False
 
     async def create_ppt(self):
-        await self.fetch_network_assets()
+        with self.stats.time_stage("fetch_assets"):
+            await self.fetch_network_assets()
+
+        with self.stats.time_stage("build_slides"):
+            for slide_model in self._slide_models:
+                # Adding global shapes to slide
+                if self._ppt_model.shapes:
+                    slide_model.shapes.append(self._ppt_model.shapes)
 
-        for slide_model in self._slide_models:
-            # Adding global shapes to slide
-            if self._ppt_model.shapes:
-                slide_model.shapes.append(self._ppt_model.shapes)
+                self.add_and_populate_slide(slide_model)
 
-            self.add_and_populate_slide(slide_model)
+        # Image transforms are timed separately, keep build_slides exclusive of them
+        self.stats.add_timing(
+            "build_slides", -self.stats.timings.get("image_transforms", 0.0)
+        )
 
     def set_presentation_theme(self):
         slide_master = self._ppt.slide_master
@@ -142,6 +164,8 @@ class PptxPresentationCreator:
 
     def add_and_populate_slide(self, slide_model: PptxSlideModel):
         slide = self._ppt.slides.add_slide(self._ppt.slide_layouts[BLANK_SLIDE_LAYOUT])
+        self.stats.slides += 1
+        self.stats.shapes += len(slide_model.shapes)
 
         if slide_model.background:
             self.apply_fill_to_shape(slide.background, slide_model.background)
@@ -175,21 +199,46 @@ class PptxPresentationCreator:
         self.set_fill_opacity(connector_shape, connector_model.opacity)
 
     def add_picture(self, slide: Slide, picture_model: PptxPictureBoxModel):
+        with self.stats.time_stage("image_transforms"):
+            image_path = self.get_processed_image_path(picture_model)
+        if not image_path:
+            return
+
+        margined_position = self.get_margined_position(
+            picture_model.position, picture_model.margin
+        )
+
+        slide.shapes.add_picture(image_path, *margined_position.to_pt_list())
+        self.stats.pictures += 1
+
+    def get_processed_image_path(
+        self, picture_model: PptxPictureBoxModel
+    ) -> Optional[str]:
         image_path = picture_model.picture.path
-        if (
+        needs_transform = bool(
             picture_model.clip
             or picture_model.border_radius
             or picture_model.invert
             or picture_model.opacity
             or picture_model.object_fit
             or picture_model.shape
-        ):
+        )
+        if needs_transform or self._image_compression:
             try:
                 image = Image.open(image_path)
             except Exception:
                 print(f"Could not open image: {image_path}")
-                return
+                return None
+
+            if self._image_compression:
+                image = downsample_image(
+                    image,
+                    picture_model.position.width,
+                    picture_model.position.height,
+                    self._image_compression.dpi,
+                )
 
+        if needs_transform:
             image = image.convert("RGBA")
             # ? Applying border radius twice to support both clip and object fit
             if picture_model.border_radius:
@@ -215,14 +264,48 @@ class PptxPresentationCreator:
                 image = invert_image(image)
             if picture_model.opacity:
                 image = set_image_opacity(image, picture_model.opacity)
+
+        if self._image_compression:
+            image_path = self.save_compressed_image(image, image_path, needs_transform)
+        elif needs_transform:
             image_path = os.path.join(self._temp_dir, f"{uuid.uuid4()}.png")
             image.save(image_path)
 
-        margined_position = self.get_margined_position(
-            picture_model.position, picture_model.margin
-        )
+        return image_path
 
-        slide.shapes.add_picture(image_path, *margined_position.to_pt_list())
+    def save_compressed_image(
+        self, image: Image.Image, source_path: str, transformed: bool
+    ) -> str:
+        """
+        Saves opaque images as JPEG and transparent ones as PNG.
+        Untransformed images keep their source file if re-encoding does not shrink it.
+        """
+        try:
+            original_bytes = os.path.getsize(source_path)
+        except OSError:
+            original_bytes = 0
+
+        if has_transparency(image):
+            image_path = os.path.join(self._temp_dir, f"{uuid.uuid4()}.png")
+            image.save(image_path, optimize=True)
+        else:
+            image_path = os.path.join(self._temp_dir, f"{uuid.uuid4()}.jpg")
+            image.convert("RGB").save(
+                image_path, quality=self._image_compression.quality, optimize=True
+            )
+        compressed_bytes = os.path.getsize(image_path)
+
+        if not transformed and original_bytes and compressed_bytes >= original_bytes:
+            image_path = source_path
+            compressed_bytes = original_bytes
+
+        stats = self.image_compression_stats
+        stats.images += 1
+        stats.original_bytes += original_bytes
+        stats.compressed_bytes += compressed_bytes
+        stats.bytes_saved = max(stats.original_bytes - stats.compressed_bytes, 0)
+
+        return image_path
 
     def add_autoshape(self, slide: Slide, autoshape_box_model: PptxAutoShapeBoxModel):
         position = autoshape_box_model.position
@@ -294,7 +377,9 @@ class PptxPresentationCreator:
     def parse_html_text_to_text_runs(self, font: Optional[PptxFontModel], text: str):
         return parse_inline_html_to_runs(text, font)
 
-    def populate_text_run(self, text_run: _Run, text_run_model: PptxTextRunModel):
+    def populate_text_run(
+        self, text_run: _Run, text_run_model: PptxTextRunModel | TextRun
+    ):
         text_run.text = text_run_model.text
         if text_run_model.font:
             self.apply_font(text_run.font, text_run_model.font)
@@ -483,4 +568,6 @@ class PptxPresentationCreator:
             print(f"Could not apply strikethrough: {e}")
 
     def save(self, path: str):
-        self._ppt.save(path)
+        with self.stats.time_stage("save"):
+            self._ppt.save(path)
+        self.stats.artifact_bytes = os.path.getsize(path)
@@ -0,0 +1,103 @@
+from collections import OrderedDict
+import hashlib
+import json
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.presentation_layout import PresentationLayoutModel
+from models.sql.presentation import PresentationModel
+from models.sql.presentation_layout import PresentationLayoutSqlModel
+from utils.datetime_utils import get_current_utc_datetime
+from utils.db_utils import get_insert_ignore
+
+
+def get_layout_dict_hash(layout: dict) -> str:
+    canonical_json = json.dumps(
+        layout, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical_json.encode()).hexdigest()
+
+
+def get_layout_hash(layout: PresentationLayoutModel) -> str:
+    return get_layout_dict_hash(layout.model_dump(mode="json"))
+
+
+class PresentationLayoutStore:
+    """
+    Content addressed store for presentation layouts.
+    Each distinct layout is written once and presentations keep only its hash.
+    Parsed layouts are cached by hash, which is safe since rows never change.
+    """
+
+    def __init__(self, cache_size: int = 128):
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, PresentationLayoutModel] = OrderedDict()
+
+    def _cache_layout(self, layout_hash: str, layout: PresentationLayoutModel):
+        self._cache[layout_hash] = layout
+        self._cache.move_to_end(layout_hash)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def save(
+        self, sql_session: AsyncSession, layout: PresentationLayoutModel
+    ) -> str:
+        """
+        Stores the layout in the session's transaction unless it is already stored.
+        Returns its hash.
+        """
+        layout_hash = get_layout_hash(layout)
+        # Only layouts read back from the database are cached, so a cached
+        # hash is known to be committed
+        if layout_hash in self._cache:
+            return layout_hash
+
+        await sql_session.execute(
+            get_insert_ignore(
+                PresentationLayoutSqlModel.__table__, sql_session.bind.dialect.name
+            ).values(
+                hash=layout_hash,
+                layout=layout.model_dump(mode="json"),
+                created_at=get_current_utc_datetime(),
+            )
+        )
+        return layout_hash
+
+    async def get(
+        self, sql_session: AsyncSession, layout_hash: str
+    ) -> PresentationLayoutModel:
+        layout = self._cache.get(layout_hash)
+        if layout:
+            self._cache.move_to_end(layout_hash)
+            return layout
+
+        stored_layout = await sql_session.get(PresentationLayoutSqlModel, layout_hash)
+        if not stored_layout:
+            raise HTTPException(status_code=404, detail="Presentation layout not found")
+
+        layout = PresentationLayoutModel(**stored_layout.layout)
+        self._cache_layout(layout_hash, layout)
+        return layout
+
+    async def get_presentation_layout(
+        self, sql_session: AsyncSession, presentation: PresentationModel
+    ) -> PresentationLayoutModel:
+        if presentation.layout_hash:
+            return await self.get(sql_session, presentation.layout_hash)
+        # Presentations that have not been migrated yet keep their own copy
+        if presentation.layout:
+            return PresentationLayoutModel(**presentation.layout)
+        raise HTTPException(status_code=404, detail="Presentation layout not found")
+
+    async def set_presentation_layout(
+        self,
+        sql_session: AsyncSession,
+        presentation: PresentationModel,
+        layout: PresentationLayoutModel,
+    ):
+        presentation.layout_hash = await self.save(sql_session, layout)
+        presentation.layout = None
+
+
+PRESENTATION_LAYOUT_STORE = PresentationLayoutStore()
@@ -0,0 +1,353 @@
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, List, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from utils.get_env import get_prometheus_multiproc_dir_env
+
+if TYPE_CHECKING:
+    from models.asset_gc_report import AssetGcReport
+    from models.export_stats import ExportStatsModel
+    from models.llm_endpoint import LLMEndpointHealth
+    from services.llm_call_metrics import LLMCall
+
+
+# Requests span quick reads to SSE streams of whole presentations
+REQUEST_LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+TASK_LATENCY_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+LLM_LATENCY_BUCKETS = (0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+LLM_TOKEN_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+EVENT_LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+DEFAULT_RUNTIME_SAMPLE_INTERVAL = 1.0
+
+# States of circuit breakers of LLM endpoints, as in services.llm_endpoint_pool
+LLM_ENDPOINT_CIRCUIT_STATES = ("closed", "open", "half_open")
+
+
+def is_multiprocess_mode() -> bool:
+    return bool(get_prometheus_multiproc_dir_env())
+
+
+class PrometheusMetrics:
+    """
+    Prometheus metrics of the server.
+
+    With several workers PROMETHEUS_MULTIPROC_DIR must point to an empty
+    directory shared by them. Each worker then writes its values to files there
+    and /metrics aggregates the files of all workers, whichever serves it.
+    Gauges are summed over live workers.
+    """
+
+    def __init__(self, registry: Optional[CollectorRegistry] = None):
+        self.registry = registry or CollectorRegistry()
+
+        self.http_request_duration = Histogram(
+            "presenton_http_request_duration_seconds",
+            "Duration of HTTP requests by route template",
+            ["method", "route", "status"],
+            buckets=REQUEST_LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self.sse_streams_in_progress = Gauge(
+            "presenton_sse_streams_in_progress",
+            "Server-sent event streams currently open",
+            ["route"],
+            multiprocess_mode="livesum",
+            registry=self.registry,
+        )
+
+        self.llm_call_duration = Histogram(
+            "presenton_llm_call_duration_seconds",
+            "Duration of LLM calls",
+            ["purpose", "mode", "provider"],
+            buckets=LLM_LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self.llm_call_time_to_first_token = Histogram(
+            "presenton_llm_call_time_to_first_token_seconds",
+            "Time until the first chunk of streamed LLM calls",
+            ["purpose", "mode", "provider"],
+            buckets=LLM_LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self.llm_call_errors = Counter(
+            "presenton_llm_call_errors_total",
+            "LLM calls that raised an error",
+            ["purpose", "mode", "provider", "error"],
+            registry=self.registry,
+        )
+        self.llm_calls_cancelled = Counter(
+            "presenton_llm_calls_cancelled_total",
+            "LLM calls cancelled before finishing, such as losing hedged requests",
+            ["purpose", "mode", "provider"],
+            registry=self.registry,
+        )
+        self.llm_call_retries = Counter(
+            "presenton_llm_call_retries_total",
+            "Provider requests made by LLM calls after their first one",
+            ["purpose", "mode", "provider"],
+            registry=self.registry,
+        )
+        self.llm_hedged_calls = Counter(
+            "presenton_llm_hedged_calls_total",
+            "LLM calls that sent a hedge request, by the request that won",
+            ["purpose", "provider", "winner"],
+            registry=self.registry,
+        )
+        self.llm_endpoint_failures = Counter(
+            "presenton_llm_endpoint_failures_total",
+            "Retryable failures of LLM endpoints in LLM_ENDPOINTS",
+            ["endpoint", "status"],
+            registry=self.registry,
+        )
+        self.llm_endpoint_circuit_state = Gauge(
+            "presenton_llm_endpoint_circuit_state",
+            "Workers in which the circuit breaker of an LLM_ENDPOINTS endpoint is in a state",
+            ["endpoint", "state"],
+            multiprocess_mode="livesum",
+            registry=self.registry,
+        )
+        self.llm_endpoint_latency = Gauge(
+            "presenton_llm_endpoint_latency_seconds",
+            "Moving average latency of an LLM_ENDPOINTS endpoint",
+            ["endpoint"],
+            multiprocess_mode="livemostrecent",
+            registry=self.registry,
+        )
+        self.llm_call_tokens = Histogram(
+            "presenton_llm_call_tokens",
+            "Tokens used by each LLM call, cached tokens are included in input",
+            ["purpose", "provider", "kind"],
+            buckets=LLM_TOKEN_BUCKETS,
+            registry=self.registry,
+        )
+        self.llm_tokens = Counter(
+            "presenton_llm_tokens_total",
+            "Tokens used by LLM calls, cached tokens are included in input",
+            ["purpose", "provider", "kind"],
+            registry=self.registry,
+        )
+
+        self.image_generation_duration = Histogram(
+            "presenton_image_generation_duration_seconds",
+            "Duration of image provider calls",
+            ["provider"],
+            buckets=TASK_LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self.image_generation_errors = Counter(
+            "presenton_image_generation_errors_total",
+            "Image provider calls that failed and fell back to a placeholder",
+            ["provider"],
+            registry=self.registry,
+        )
+
+        self.document_parse_duration = Histogram(
+            "presenton_document_parse_duration_seconds",
+            "Duration of parsing uploaded documents",
+            ["type"],
+            buckets=TASK_LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self.export_duration = Histogram(
+            "presenton_export_duration_seconds",
+            "Duration of presentation exports",
+            ["format"],
+            buckets=TASK_LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self.export_stage_duration = Histogram(
+            "presenton_export_stage_duration_seconds",
+            "Duration of stages of presentation exports",
+            ["format", "stage"],
+            buckets=TASK_LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self.export_assets_downloaded = Counter(
+            "presenton_export_assets_downloaded_total",
+            "Images downloaded by presentation exports",
+            ["format"],
+            registry=self.registry,
+        )
+        self.export_bytes_downloaded = Counter(
+            "presenton_export_bytes_downloaded_total",
+            "Bytes of images downloaded by presentation exports",
+            ["format"],
+            registry=self.registry,
+        )
+        self.export_asset_cache_hits = Counter(
+            "presenton_export_asset_cache_hits_total",
+            "Images of presentation exports read from app data or downloaded once",
+            ["format"],
+            registry=self.registry,
+        )
+
+        self.background_tasks_in_progress = Gauge(
+            "presenton_background_tasks_in_progress",
+            "Background tasks currently running",
+            ["task"],
+            multiprocess_mode="livesum",
+            registry=self.registry,
+        )
+        self.background_tasks = Counter(
+            "presenton_background_tasks_total",
+            "Finished background tasks",
+            ["task", "status"],
+            registry=self.registry,
+        )
+
+        self.asset_gc_deleted = Counter(
+            "presenton_asset_gc_deleted_total",
+            "Files, directories and rows removed by asset garbage collection",
+            ["category"],
+            registry=self.registry,
+        )
+        self.asset_gc_reclaimed_bytes = Counter(
+            "presenton_asset_gc_reclaimed_bytes_total",
+            "Bytes freed by asset garbage collection",
+            ["category"],
+            registry=self.registry,
+        )
+
+        self.db_pool_connections = Gauge(
+            "presenton_db_pool_connections",
+            "Connections of the database pool",
+            ["state"],
+            multiprocess_mode="livesum",
+            registry=self.registry,
+        )
+        self.event_loop_lag = Histogram(
+            "presenton_event_loop_lag_seconds",
+            "Delay of event loop callbacks past their scheduled time",
+            buckets=EVENT_LOOP_LAG_BUCKETS,
+            registry=self.registry,
+        )
+
+    def observe_llm_call(self, call: "LLMCall"):
+        """Records an LLMCall tracked by LLM_CALL_METRICS."""
+        labels = (call.purpose.value, call.mode.value, call.provider.value)
+        self.llm_call_duration.labels(*labels).observe(call.latency)
+        if call.time_to_first_token is not None:
+            self.llm_call_time_to_first_token.labels(*labels).observe(
+                call.time_to_first_token
+            )
+        if call.error:
+            self.llm_call_errors.labels(*labels, call.error).inc()
+        if call.cancelled:
+            self.llm_calls_cancelled.labels(*labels).inc()
+        if call.retries:
+            self.llm_call_retries.labels(*labels).inc(call.retries)
+        for kind, tokens in [
+            ("input", call.input_tokens),
+            ("output", call.output_tokens),
+            ("cached", call.cached_tokens),
+        ]:
+            self.llm_call_tokens.labels(
+                call.purpose.value, call.provider.value, kind
+            ).observe(tokens)
+            if tokens:
+                self.llm_tokens.labels(
+                    call.purpose.value, call.provider.value, kind
+                ).inc(tokens)
+
+    def sample_llm_endpoints(self, endpoints: List["LLMEndpointHealth"]):
+        for endpoint in endpoints:
+            for state in LLM_ENDPOINT_CIRCUIT_STATES:
+                self.llm_endpoint_circuit_state.labels(endpoint.name, state).set(
+                    int(endpoint.state == state)
+                )
+            if endpoint.latency is not None:
+                self.llm_endpoint_latency.labels(endpoint.name).set(endpoint.latency)
+
+    def observe_export(self, export_as: str, stats: "ExportStatsModel"):
+        """Records stage timings and asset downloads of a finished export."""
+        for stage, seconds in stats.timings.items():
+            self.export_stage_duration.labels(export_as, stage).observe(seconds)
+        self.export_assets_downloaded.labels(export_as).inc(stats.assets_downloaded)
+        self.export_bytes_downloaded.labels(export_as).inc(stats.bytes_downloaded)
+        self.export_asset_cache_hits.labels(export_as).inc(stats.asset_cache_hits)
+
+    def observe_asset_gc(self, report: "AssetGcReport"):
+        """Records what an asset garbage collection run removed."""
+        for category, deleted in report.deleted.items():
+            self.asset_gc_deleted.labels(category).inc(deleted)
+            self.asset_gc_reclaimed_bytes.labels(category).inc(
+                report.reclaimed_bytes[category]
+            )
+
+    @contextmanager
+    def time(self, histogram: Histogram, *labels: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram.labels(*labels).observe(time.perf_counter() - start)
+
+    def sample_db_pool(self, engine: AsyncEngine):
+        pool = engine.pool
+        # SQLite in-memory and null pools keep no connections to report
+        if not isinstance(pool, QueuePool):
+            return
+        self.db_pool_connections.labels("checked_out").set(pool.checkedout())
+        self.db_pool_connections.labels("idle").set(pool.checkedin())
+        self.db_pool_connections.labels("overflow").set(max(pool.overflow(), 0))
+
+    async def monitor_runtime(
+        self,
+        engine: AsyncEngine,
+        interval: float = DEFAULT_RUNTIME_SAMPLE_INTERVAL,
+    ):
+        """
+        Samples event loop lag, database pool usage and health of LLM_ENDPOINTS
+        endpoints of this worker.
+        Lag is how much later than requested a sleep wakes up.
+        """
+        # Imported here as the endpoint pool records its failures in these metrics
+        from services.llm_endpoint_pool import get_llm_endpoint_pool
+
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            self.event_loop_lag.observe(max(loop.time() - start - interval, 0))
+            self.sample_db_pool(engine)
+            try:
+                endpoint_pool = get_llm_endpoint_pool()
+            except Exception:
+                # Invalid LLM_ENDPOINTS is reported by LLM calls
+                endpoint_pool = None
+            if endpoint_pool:
+                self.sample_llm_endpoints(endpoint_pool.get_health())
+
+    def mark_process_dead(self):
+        # Drops live gauges of this worker so they stop being summed
+        if is_multiprocess_mode():
+            multiprocess.mark_process_dead(os.getpid())
+
+    def get_latest(self) -> bytes:
+        if is_multiprocess_mode():
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            return generate_latest(registry)
+        return generate_latest(self.registry)
+
+    @property
+    def content_type(self) -> str:
+        return CONTENT_TYPE_LATEST
+
+
+PROMETHEUS_METRICS = PrometheusMetrics()
@@ -0,0 +1,96 @@
+import asyncio
+import os
+from typing import Dict, Optional
+
+from PIL import Image
+
+
+DEFAULT_THUMBNAIL_SIZE = 256
+DEFAULT_THUMBNAIL_QUALITY = 80
+DEFAULT_THUMBNAIL_WORKERS = 4
+
+
+class ThumbnailService:
+    """
+    Creates small WebP thumbnails of images in worker threads and caches them in
+    a thumbnails directory next to the originals.
+    Concurrent requests for the same thumbnail share one conversion.
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_THUMBNAIL_SIZE,
+        quality: int = DEFAULT_THUMBNAIL_QUALITY,
+        workers: int = DEFAULT_THUMBNAIL_WORKERS,
+    ):
+        self.size = size
+        self.quality = quality
+        self.workers = workers
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    def get_thumbnail_path(self, image_path: str) -> str:
+        name = os.path.splitext(os.path.basename(image_path))[0]
+        return os.path.join(
+            os.path.dirname(image_path), "thumbnails", f"{name}_{self.size}.webp"
+        )
+
+    def get_cached_thumbnail_path(self, image_path: str) -> Optional[str]:
+        thumbnail_path = self.get_thumbnail_path(image_path)
+        try:
+            if os.path.getmtime(thumbnail_path) >= os.path.getmtime(image_path):
+                return thumbnail_path
+        except OSError:
+            pass
+        return None
+
+    def create_thumbnail(self, image_path: str) -> str:
+        thumbnail_path = self.get_thumbnail_path(image_path)
+        os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+
+        with Image.open(image_path) as image:
+            # Lets JPEG decoder skip full resolution decoding
+            image.draft("RGB", (self.size, self.size))
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert(
+                    "RGBA" if image.mode in ("P", "LA", "PA") else "RGB"
+                )
+            image.thumbnail(
+                (self.size, self.size), Image.LANCZOS, reducing_gap=3.0
+            )
+
+            # Written to a temporary file first so readers never see partial files
+            temp_path = f"{thumbnail_path}.{os.getpid()}.tmp"
+            image.save(temp_path, "WEBP", quality=self.quality, method=4)
+        os.replace(temp_path, thumbnail_path)
+        return thumbnail_path
+
+    async def _create_thumbnail(self, image_path: str) -> str:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+        async with self._semaphore:
+            return await asyncio.to_thread(self.create_thumbnail, image_path)
+
+    async def get_thumbnail(self, image_path: str) -> Optional[str]:
+        """
+        Returns path of the image's thumbnail, creating it if it is not cached.
+        Returns None if the image can not be read.
+        """
+        thumbnail_path = self.get_cached_thumbnail_path(image_path)
+        if thumbnail_path:
+            return thumbnail_path
+
+        task = self._pending.get(image_path)
+        if task is None:
+            task = asyncio.create_task(self._create_thumbnail(image_path))
+            self._pending[image_path] = task
+            task.add_done_callback(lambda _: self._pending.pop(image_path, None))
+
+        try:
+            return await asyncio.shield(task)
+        except Exception as e:
+            print(f"Failed to create thumbnail for {image_path}: {e}")
+            return None
+
+
+THUMBNAIL_SERVICE = ThumbnailService()
@@ -0,0 +1,257 @@
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import json
+import os
+import secrets
+import time
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from models.timing_breakdown import TimingBreakdownModel
+from utils.get_env import (
+    get_otel_exporter_otlp_endpoint_env,
+    get_otel_service_name_env,
+    get_tracing_jsonl_path_env,
+)
+
+
+_CURRENT_SPAN: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+# OTLP span kind and status codes
+SPAN_KIND_INTERNAL = 1
+STATUS_CODE_OK = 1
+STATUS_CODE_ERROR = 2
+
+
+@dataclass(eq=False)
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent: Optional["Span"] = field(default=None, repr=False)
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start_time: float = field(default_factory=time.time)
+    started_at: float = field(default_factory=time.perf_counter)
+    duration: Optional[float] = None
+    error: Optional[str] = None
+    # Finished spans of the trace, only kept on its root span
+    trace_spans: List["Span"] = field(default_factory=list, repr=False)
+
+    @property
+    def root(self) -> "Span":
+        span = self
+        while span.parent is not None:
+            span = span.parent
+        return span
+
+    @property
+    def parent_span_id(self) -> Optional[str]:
+        return self.parent.span_id if self.parent else None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def finish(self, error: Optional[BaseException] = None):
+        self.duration = time.perf_counter() - self.started_at
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        self.root.trace_spans.append(self)
+
+    def get_timing_breakdown(self) -> TimingBreakdownModel:
+        """
+        Returns seconds spent in each finished child span of this span,
+        summed by name.
+        """
+        stages: Dict[str, float] = {}
+        for span in self.root.trace_spans:
+            if span.parent is self:
+                stages[span.name] = round(stages.get(span.name, 0.0) + span.duration, 3)
+        total = (
+            self.duration
+            if self.duration is not None
+            else time.perf_counter() - self.started_at
+        )
+        return TimingBreakdownModel(
+            trace_id=self.trace_id, total=round(total, 3), stages=stages
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def to_otlp(self) -> dict:
+        start_time = int(self.start_time * 1e9)
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": SPAN_KIND_INTERNAL,
+            "startTimeUnixNano": str(start_time),
+            "endTimeUnixNano": str(start_time + int((self.duration or 0) * 1e9)),
+            "attributes": [
+                {"key": key, "value": get_otlp_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": (
+                {"code": STATUS_CODE_ERROR, "message": self.error}
+                if self.error
+                else {"code": STATUS_CODE_OK}
+            ),
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+def get_otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class TracingService:
+    """
+    Records OpenTelemetry style spans of presentation generation.
+
+    Spans nest through a context variable, so spans started in tasks created
+    inside a span become its children. Once a root span finishes its trace is
+    written to TRACING_JSONL_PATH, one span per line, and sent to the OTLP/HTTP
+    collector at OTEL_EXPORTER_OTLP_ENDPOINT, if they are set.
+    """
+
+    def __init__(
+        self,
+        jsonl_path: Optional[str] = None,
+        otlp_endpoint: Optional[str] = None,
+        service_name: Optional[str] = None,
+    ):
+        self._jsonl_path = jsonl_path
+        self._otlp_endpoint = otlp_endpoint
+        self._service_name = service_name
+        self._export_tasks = set[asyncio.Task]()
+
+    @property
+    def jsonl_path(self) -> Optional[str]:
+        return self._jsonl_path or get_tracing_jsonl_path_env()
+
+    @property
+    def otlp_endpoint(self) -> Optional[str]:
+        return self._otlp_endpoint or get_otel_exporter_otlp_endpoint_env()
+
+    @property
+    def service_name(self) -> str:
+        return self._service_name or get_otel_service_name_env() or "presenton"
+
+    def get_current_span(self) -> Optional[Span]:
+        return _CURRENT_SPAN.get()
+
+    @contextmanager
+    def start_span(self, name: str, **attributes: Any):
+        parent = _CURRENT_SPAN.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent=parent,
+            attributes=attributes,
+        )
+        token = _CURRENT_SPAN.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.finish(e)
+            raise
+        else:
+            span.finish()
+        finally:
+            _CURRENT_SPAN.reset(token)
+            if parent is None:
+                self.export(span.trace_spans)
+
+    def export(self, spans: List[Span]):
+        if not (self.jsonl_path or self.otlp_endpoint):
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(self.export_async(spans))
+        except RuntimeError:
+            return
+        self._export_tasks.add(task)
+        task.add_done_callback(self._export_tasks.discard)
+
+    async def flush(self):
+        """Waits for traces that are still being exported."""
+        if self._export_tasks:
+            await asyncio.gather(*self._export_tasks)
+
+    async def export_async(self, spans: List[Span]):
+        try:
+            if self.jsonl_path:
+                await asyncio.to_thread(self.write_jsonl, self.jsonl_path, spans)
+            if self.otlp_endpoint:
+                await self.send_otlp(self.otlp_endpoint, spans)
+        except Exception as e:
+            print(f"Failed to export trace: {e}")
+
+    def write_jsonl(self, path: str, spans: List[Span]):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "a") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+    def get_otlp_payload(self, spans: List[Span]) -> dict:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": self.service_name},
+                            }
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "presenton"},
+                            "spans": [span.to_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    async def send_otlp(self, endpoint: str, spans: List[Span]):
+        url = endpoint.rstrip("/")
+        if not url.endswith("/v1/traces"):
+            url += "/v1/traces"
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                url,
+                json=self.get_otlp_payload(spans),
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as response:
+                if response.status >= 400:
+                    print(
+                        f"OTLP collector returned {response.status}: "
+                        f"{await response.text()}"
+                    )
+
+
+TRACING_SERVICE = TracingService()
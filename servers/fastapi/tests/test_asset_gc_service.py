@@ -0,0 +1,185 @@
+import asyncio
+from datetime import timedelta
+import os
+import tempfile
+import time
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlmodel import SQLModel, select
+
+from models.sql.image_asset import ImageAsset
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+from services.asset_gc_service import AssetGarbageCollector
+from services.prometheus_metrics import PROMETHEUS_METRICS
+from utils.datetime_utils import get_current_utc_datetime
+
+
+OLD = time.time() - 10 * 24 * 3600
+OLD_TEMP_DIR = str(uuid.uuid4())
+ACTIVE_TEMP_DIR = str(uuid.uuid4())
+
+
+def write_file(path: str, size: int, mtime: float = OLD) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def run_gc(dry_run: bool):
+    async def run(app_data_directory: str, temp_directory: str):
+        images_directory = os.path.join(app_data_directory, "images")
+        referenced = write_file(os.path.join(images_directory, "referenced.jpg"), 10)
+        orphan = write_file(os.path.join(images_directory, "orphan.jpg"), 20)
+        write_file(os.path.join(images_directory, "thumbnails", "orphan_256.webp"), 5)
+        uploaded = write_file(os.path.join(images_directory, "uploaded.jpg"), 40)
+        recent = write_file(
+            os.path.join(images_directory, "recent.jpg"), 80, mtime=time.time()
+        )
+        write_file(os.path.join(images_directory, "stray.jpg"), 160)
+        screenshots = os.path.join(images_directory, "imported")
+        write_file(os.path.join(screenshots, "slide_1.png"), 320)
+        os.utime(screenshots, (OLD, OLD))
+        write_file(os.path.join(app_data_directory, "exports", "old.pptx"), 640)
+        write_file(
+            os.path.join(app_data_directory, "exports", "new.pptx"),
+            1280,
+            mtime=time.time(),
+        )
+        write_file(os.path.join(temp_directory, OLD_TEMP_DIR, "file.pptx"), 2560)
+        # Directories are as old as their newest file
+        write_file(os.path.join(temp_directory, ACTIVE_TEMP_DIR, "old.pptx"), 1)
+        write_file(
+            os.path.join(temp_directory, ACTIVE_TEMP_DIR, "new", "file.pptx"),
+            1,
+            mtime=time.time(),
+        )
+        # Long lived directories, such as LibreOffice worker profiles, are kept
+        write_file(os.path.join(temp_directory, "libreoffice", "worker_0", "a"), 1)
+        for directory in [OLD_TEMP_DIR, ACTIVE_TEMP_DIR, "libreoffice"]:
+            os.utime(os.path.join(temp_directory, directory), (OLD, OLD))
+
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                SQLModel.metadata.create_all,
+                tables=[
+                    PresentationModel.__table__,
+                    SlideModel.__table__,
+                    ImageAsset.__table__,
+                ],
+            )
+
+        old_created_at = get_current_utc_datetime() - timedelta(days=10)
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            presentation = PresentationModel(
+                content="prompt", n_slides=1, language="English"
+            )
+            session.add(presentation)
+            session.add(
+                SlideModel(
+                    presentation=presentation.id,
+                    layout_group="general",
+                    layout="general:intro",
+                    index=0,
+                    content={
+                        "image": {
+                            "__image_url__": "/app_data/images/referenced.jpg",
+                        },
+                        "items": [{"image": {"__image_url__": "https://a.b/c.jpg"}}],
+                    },
+                )
+            )
+            for path, is_uploaded, created_at in [
+                (referenced, False, old_created_at),
+                (orphan, False, old_created_at),
+                (uploaded, True, old_created_at),
+                (recent, False, get_current_utc_datetime()),
+            ]:
+                session.add(
+                    ImageAsset(path=path, is_uploaded=is_uploaded, created_at=created_at)
+                )
+            await session.commit()
+
+            collector = AssetGarbageCollector(
+                app_data_directory=app_data_directory,
+                temp_directory=temp_directory,
+                batch_size=2,
+            )
+            report = await collector.run(session, dry_run=dry_run)
+            asset_paths = (await session.scalars(select(ImageAsset.path))).all()
+
+        await engine.dispose()
+        remaining_files = sorted(
+            os.path.relpath(os.path.join(root, name), app_data_directory)
+            for root, _, files in os.walk(app_data_directory)
+            for name in files
+        ) + sorted(os.listdir(temp_directory))
+        return report, sorted(os.path.basename(path) for path in asset_paths), (
+            remaining_files
+        )
+
+    with tempfile.TemporaryDirectory() as app_data_directory:
+        with tempfile.TemporaryDirectory() as temp_directory:
+            return asyncio.run(run(app_data_directory, temp_directory))
+
+
+def get_reclaimed_temp_bytes() -> float:
+    return (
+        PROMETHEUS_METRICS.registry.get_sample_value(
+            "presenton_asset_gc_reclaimed_bytes_total", {"category": "temp"}
+        )
+        or 0
+    )
+
+
+def test_unreferenced_assets_are_collected():
+    reclaimed_temp_bytes = get_reclaimed_temp_bytes()
+    report, asset_names, remaining_files = run_gc(dry_run=False)
+
+    assert report.deleted == {
+        "image_assets": 1,
+        "thumbnails": 1,
+        "images": 1,
+        "screenshots": 1,
+        "exports": 1,
+        "temp": 1,
+    }
+    assert report.reclaimed_bytes == {
+        "image_assets": 20,
+        "thumbnails": 5,
+        "images": 160,
+        "screenshots": 320,
+        "exports": 640,
+        "temp": 2560,
+    }
+    assert report.referenced_images == 1
+    assert asset_names == ["recent.jpg", "referenced.jpg", "uploaded.jpg"]
+    assert remaining_files == [
+        "exports/new.pptx",
+        "images/recent.jpg",
+        "images/referenced.jpg",
+        "images/uploaded.jpg",
+        ACTIVE_TEMP_DIR,
+        "libreoffice",
+    ]
+    assert get_reclaimed_temp_bytes() - reclaimed_temp_bytes == 2560
+
+
+def test_dry_run_deletes_nothing():
+    reclaimed_temp_bytes = get_reclaimed_temp_bytes()
+    report, asset_names, remaining_files = run_gc(dry_run=True)
+
+    assert report.dry_run
+    assert report.total_reclaimed_bytes == 20 + 5 + 160 + 320 + 640 + 2560
+    assert asset_names == [
+        "orphan.jpg",
+        "recent.jpg",
+        "referenced.jpg",
+        "uploaded.jpg",
+    ]
+    assert len(remaining_files) == 12
+    assert get_reclaimed_temp_bytes() == reclaimed_temp_bytes
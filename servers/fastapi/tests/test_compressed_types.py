@@ -0,0 +1,94 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlmodel import SQLModel
+
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+from utils.compression_utils import (
+    COMPRESSED_VALUE_HEADER,
+    compress_text,
+    decompress_text,
+)
+
+
+CONTENT = {"title": "Quarterly results", "body": "Revenue grew " * 200}
+HTML_CONTENT = "<div class='slide'>" + "<p>Revenue grew</p>" * 200 + "</div>"
+
+
+async def write_and_read_slide(raw_columns: str = "content, html_content"):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all,
+            tables=[PresentationModel.__table__, SlideModel.__table__],
+        )
+
+    slide = SlideModel(
+        presentation=uuid.uuid4(),
+        layout_group="general",
+        layout="general:intro",
+        index=0,
+        content=CONTENT,
+        html_content=HTML_CONTENT,
+        properties=None,
+    )
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.add(slide)
+        await session.commit()
+
+    async with AsyncSession(engine) as session:
+        raw_row = (
+            await session.execute(text(f"SELECT {raw_columns} FROM slides"))
+        ).one()
+        stored_slide = await session.get(SlideModel, slide.id)
+
+    await engine.dispose()
+    return raw_row, stored_slide
+
+
+@pytest.mark.parametrize("codec", ["zlib", "zstd"])
+def test_compressed_columns_round_trip(monkeypatch, codec):
+    if codec == "zstd":
+        pytest.importorskip("zstandard")
+    monkeypatch.setenv("DATABASE_COMPRESSION", codec)
+
+    (raw_content, raw_html_content), slide = asyncio.run(write_and_read_slide())
+
+    # JSON columns hold the compressed value as a JSON string
+    assert json.loads(raw_content).startswith(f"{COMPRESSED_VALUE_HEADER}{codec}:")
+    assert raw_html_content.startswith(f"{COMPRESSED_VALUE_HEADER}{codec}:")
+    assert len(raw_html_content) < len(HTML_CONTENT)
+    assert slide.content == CONTENT
+    assert slide.html_content == HTML_CONTENT
+
+
+def test_uncompressed_values_stay_readable(monkeypatch):
+    monkeypatch.delenv("DATABASE_COMPRESSION", raising=False)
+
+    (raw_content, raw_html_content), slide = asyncio.run(write_and_read_slide())
+
+    assert COMPRESSED_VALUE_HEADER not in raw_content
+    assert raw_html_content == HTML_CONTENT
+    assert slide.content == CONTENT
+    assert slide.html_content == HTML_CONTENT
+
+
+def test_small_values_are_not_compressed(monkeypatch):
+    monkeypatch.setenv("DATABASE_COMPRESSION", "zlib")
+    monkeypatch.setenv("DATABASE_COMPRESSION_MIN_SIZE", str(len(HTML_CONTENT) + 1))
+
+    (raw_html_content,), _ = asyncio.run(write_and_read_slide("html_content"))
+
+    assert raw_html_content == HTML_CONTENT
+
+
+def test_compress_text_round_trip():
+    compressed = compress_text(HTML_CONTENT, "zlib")
+
+    assert compressed.startswith(COMPRESSED_VALUE_HEADER)
+    assert decompress_text(compressed) == HTML_CONTENT
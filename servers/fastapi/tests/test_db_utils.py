@@ -0,0 +1,118 @@
+import asyncio
+import os
+import tempfile
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlmodel import SQLModel, select
+
+from models.sql.image_asset import ImageAsset
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+from utils.db_utils import (
+    bulk_insert_models,
+    create_tuned_async_engine,
+    get_engine_kwargs,
+)
+
+
+def test_get_engine_kwargs_for_server_databases(monkeypatch):
+    monkeypatch.setenv("DATABASE_POOL_SIZE", "5")
+    monkeypatch.setenv("DATABASE_POOL_PRE_PING", "false")
+    monkeypatch.setenv("DATABASE_MAX_OVERFLOW", "0")
+
+    kwargs = get_engine_kwargs("postgresql+asyncpg://user@localhost/presenton")
+
+    assert kwargs["pool_size"] == 5
+    assert kwargs["max_overflow"] == 0
+    assert kwargs["pool_recycle"] == 1800
+    assert kwargs["pool_pre_ping"] is False
+    assert get_engine_kwargs("sqlite+aiosqlite:///test.db") == {}
+
+
+def test_sqlite_engine_applies_pragmas(monkeypatch):
+    monkeypatch.setenv("SQLITE_BUSY_TIMEOUT", "1234")
+
+    async def run(database_url: str):
+        engine = create_tuned_async_engine(
+            database_url, {"check_same_thread": False}
+        )
+        async with engine.connect() as conn:
+            journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+            busy_timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar()
+            synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+        await engine.dispose()
+        return journal_mode, busy_timeout, synchronous
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        database_path = os.path.join(temp_dir, "test.db")
+        journal_mode, busy_timeout, synchronous = asyncio.run(
+            run(f"sqlite+aiosqlite:///{database_path}")
+        )
+
+    assert journal_mode == "wal"
+    assert busy_timeout == 1234
+    # NORMAL
+    assert synchronous == 1
+
+
+def test_bulk_insert_models_uses_one_statement_per_table(monkeypatch):
+    monkeypatch.setenv("DATABASE_COMPRESSION", "zlib")
+    monkeypatch.setenv("DATABASE_COMPRESSION_MIN_SIZE", "10")
+
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                SQLModel.metadata.create_all,
+                tables=[
+                    PresentationModel.__table__,
+                    SlideModel.__table__,
+                    ImageAsset.__table__,
+                ],
+            )
+
+        statements = []
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+
+        presentation = PresentationModel(content="prompt", n_slides=20, language="en")
+        slides = [
+            SlideModel(
+                presentation=presentation.id,
+                layout_group="general",
+                layout="general:intro",
+                index=index,
+                content={"title": f"Slide {index} " * 5},
+            )
+            for index in range(20)
+        ]
+        assets = [ImageAsset(path=f"/app_data/images/{index}.jpg") for index in range(3)]
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            session.add(presentation)
+            await bulk_insert_models(session, [*slides, *assets])
+            await session.commit()
+
+            stored_slides = (
+                await session.scalars(select(SlideModel).order_by(SlideModel.index))
+            ).all()
+            stored_assets = (await session.scalars(select(ImageAsset))).all()
+
+        await engine.dispose()
+        return statements, slides, stored_slides, stored_assets
+
+    statements, slides, stored_slides, stored_assets = asyncio.run(run())
+
+    inserts = [statement for statement in statements if statement.startswith("INSERT")]
+    assert len(inserts) == 3
+    assert [slide.content for slide in stored_slides] == [
+        slide.content for slide in slides
+    ]
+    assert all(
+        slide.content_hash == slide.get_content_hash() for slide in stored_slides
+    )
+    assert len(stored_assets) == 3
+    assert all(asset.created_at is not None for asset in stored_assets)
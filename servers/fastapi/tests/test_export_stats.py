@@ -0,0 +1,85 @@
+import asyncio
+import os
+import tempfile
+
+from PIL import Image
+
+import services.pptx_presentation_creator as pptx_presentation_creator
+from models.export_stats import ExportStatsModel
+from models.pptx_models import (
+    PptxAutoShapeBoxModel,
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from services.pptx_presentation_creator import PptxPresentationCreator
+
+
+def test_export_stats_accumulates_stage_timings():
+    stats = ExportStatsModel()
+    stats.add_timing("save", 0.5)
+    stats.add_timing("save", 0.25)
+    stats.add_timing("fetch_assets", 0.1)
+
+    assert stats.timings["save"] == 0.75
+    assert stats.get_slowest_stage() == "save"
+
+
+def test_pptx_creator_records_export_stats(monkeypatch):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        image_path = os.path.join(temp_dir, "image.png")
+        Image.new("RGB", (64, 64), (255, 0, 0)).save(image_path)
+        downloaded_urls = []
+
+        async def fake_download_files(urls, save_directory, headers=None):
+            downloaded_urls.extend(urls)
+            return [image_path for _ in urls]
+
+        monkeypatch.setattr(
+            pptx_presentation_creator, "download_files", fake_download_files
+        )
+
+        def picture(url: str) -> PptxPictureBoxModel:
+            return PptxPictureBoxModel(
+                position=PptxPositionModel(left=0, top=0, width=64, height=64),
+                picture=PptxPictureModel(is_network=True, path=url),
+            )
+
+        pptx_model = PptxPresentationModel(
+            slides=[
+                PptxSlideModel(
+                    shapes=[
+                        picture("https://example.com/a.png"),
+                        picture("https://example.com/a.png"),
+                        picture("http://localhost/app_data/images/b.png"),
+                        PptxAutoShapeBoxModel(
+                            position=PptxPositionModel(width=10, height=10)
+                        ),
+                    ]
+                ),
+                PptxSlideModel(shapes=[picture("https://example.com/c.png")]),
+            ]
+        )
+
+        pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
+        asyncio.run(pptx_creator.create_ppt())
+        pptx_path = os.path.join(temp_dir, "stats.pptx")
+        pptx_creator.save(pptx_path)
+
+        stats = pptx_creator.stats
+        assert downloaded_urls == [
+            "https://example.com/a.png",
+            "https://example.com/c.png",
+        ]
+        assert stats.slides == 2
+        assert stats.shapes == 5
+        assert stats.pictures == 3
+        assert stats.assets_downloaded == 2
+        assert stats.bytes_downloaded == 2 * os.path.getsize(image_path)
+        assert stats.asset_cache_hits == 2
+        assert stats.artifact_bytes == os.path.getsize(pptx_path)
+        assert {"fetch_assets", "build_slides", "image_transforms", "save"} <= set(
+            stats.timings
+        )
@@ -0,0 +1,64 @@
+import os
+import tempfile
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from utils.file_response_utils import get_file_download_response
+
+
+def _create_client(path: str, delete_after: bool) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/download")
+    async def download(request: Request):
+        return get_file_download_response(request, path, delete_after=delete_after)
+
+    return TestClient(app)
+
+
+def test_file_download_response_streams_file_with_content_length():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "deck.pptx")
+        with open(path, "wb") as f:
+            f.write(b"x" * 100_000)
+
+        response = _create_client(path, delete_after=False).get("/download")
+
+        assert response.status_code == 200
+        assert response.headers["content-length"] == "100000"
+        assert response.headers["content-type"].startswith(
+            "application/vnd.openxmlformats-officedocument.presentationml"
+        )
+        assert 'filename="deck.pptx"' in response.headers["content-disposition"]
+        assert response.content == b"x" * 100_000
+        assert os.path.exists(path)
+
+
+def test_file_download_response_deletes_file_after_streaming():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "deck.pdf")
+        with open(path, "wb") as f:
+            f.write(b"%PDF")
+
+        response = _create_client(path, delete_after=True).get("/download")
+
+        assert response.content == b"%PDF"
+        assert response.headers["content-type"] == "application/pdf"
+        assert not os.path.exists(path)
+
+
+def test_file_download_response_uses_accel_redirect_behind_nginx(monkeypatch):
+    with tempfile.TemporaryDirectory() as app_data_dir:
+        monkeypatch.setenv("APP_DATA_DIRECTORY", app_data_dir)
+        os.makedirs(os.path.join(app_data_dir, "exports"))
+        path = os.path.join(app_data_dir, "exports", "My deck.pptx")
+        with open(path, "wb") as f:
+            f.write(b"pptx")
+
+        response = _create_client(path, delete_after=False).get(
+            "/download", headers={"X-Sendfile-Type": "X-Accel-Redirect"}
+        )
+
+        assert response.headers["x-accel-redirect"] == "/app_data/exports/My%20deck.pptx"
+        assert response.content == b""
@@ -0,0 +1,99 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlmodel import SQLModel
+
+from models.generation_progress import GenerationProgressEvent
+from models.sql.async_presentation_generation_status import (
+    AsyncPresentationGenerationTaskModel,
+)
+from services.generation_progress_service import GenerationProgressService
+
+
+def test_subscribers_receive_progress_until_terminal_event():
+    async def run():
+        service = GenerationProgressService()
+        task_id = "task-1"
+        events = []
+
+        async def listen():
+            async with service.subscribe(task_id) as subscription:
+                while True:
+                    event = await subscription.get(1)
+                    events.append(event)
+                    if event.is_terminal:
+                        return
+
+        listener = asyncio.create_task(listen())
+        await asyncio.sleep(0)
+        for index in range(3):
+            await service.publish(
+                GenerationProgressEvent(
+                    task_id=task_id,
+                    status="pending",
+                    message="Generating slides",
+                    total_slides=3,
+                    completed_slides=index + 1,
+                    slide_index=index,
+                )
+            )
+        await service.publish(
+            GenerationProgressEvent(task_id=task_id, status="completed")
+        )
+        await asyncio.wait_for(listener, 1)
+        return events, await service.get_latest(task_id), service.broker._subscribers
+
+    events, latest, subscribers = asyncio.run(run())
+
+    assert [event.completed_slides for event in events] == [1, 2, 3, None]
+    assert latest.status == "completed"
+    assert not subscribers
+
+
+def test_update_task_only_writes_checkpoints():
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                SQLModel.metadata.create_all,
+                tables=[AsyncPresentationGenerationTaskModel.__table__],
+            )
+
+        service = GenerationProgressService()
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            task = AsyncPresentationGenerationTaskModel(
+                status="pending", message="Queued for generation"
+            )
+            session.add(task)
+            await session.commit()
+
+            await service.update_task(session, task, "Generating slides")
+            async with AsyncSession(engine) as other_session:
+                stored = await other_session.get(
+                    AsyncPresentationGenerationTaskModel, task.id
+                )
+                message_before_checkpoint = stored.message
+
+            await service.update_task(
+                session,
+                task,
+                "Presentation generation completed",
+                status="completed",
+                persist=True,
+            )
+            async with AsyncSession(engine) as other_session:
+                stored = await other_session.get(
+                    AsyncPresentationGenerationTaskModel, task.id
+                )
+                stored_status = stored.status
+
+            latest = await service.get_latest(task.id)
+
+        await engine.dispose()
+        return message_before_checkpoint, stored_status, latest
+
+    message_before_checkpoint, stored_status, latest = asyncio.run(run())
+
+    assert message_before_checkpoint == "Queued for generation"
+    assert stored_status == "completed"
+    assert latest.to_task().message == "Presentation generation completed"
@@ -0,0 +1,34 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+from api.v1.ppt.endpoints import presentation
+from models.generation_progress import GenerationProgressEvent
+from services.generation_progress_service import GenerationProgressService
+
+
+def test_status_stream_ends_with_error_once_task_is_gone(monkeypatch):
+    running = GenerationProgressEvent(task_id="task-1", status="pending")
+    service = GenerationProgressService()
+    # The task row is deleted while the stream waits for progress
+    monkeypatch.setattr(
+        service, "get_latest", AsyncMock(side_effect=[running, running, None])
+    )
+    monkeypatch.setattr(presentation, "GENERATION_PROGRESS_SERVICE", service)
+    monkeypatch.setattr(presentation, "GENERATION_PROGRESS_HEARTBEAT_INTERVAL", 0.01)
+    sql_session = MagicMock(get=AsyncMock(return_value=None))
+
+    async def run():
+        response = await presentation.stream_async_presentation_generation_status(
+            "task-1", sql_session
+        )
+        return [event async for event in response.body_iterator]
+
+    events = asyncio.run(run())
+
+    assert len(events) == 2
+    assert json.loads(events[0].split("data: ")[1])["status"] == "pending"
+    assert json.loads(events[1].split("data: ")[1]) == {
+        "type": "error",
+        "detail": "No presentation generation task found",
+    }
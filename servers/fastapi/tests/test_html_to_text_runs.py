@@ -0,0 +1,38 @@
+from models.pptx_models import PptxFontModel
+from services.html_to_text_runs_service import parse_html_text_to_text_runs
+
+
+def test_parse_html_text_to_text_runs_applies_formatting():
+    base_font = PptxFontModel(name="Inter", size=20, color="111111")
+    runs = parse_html_text_to_text_runs(
+        "Plain <strong>bold <em>both</em></strong>\n<code>code</code>", base_font
+    )
+
+    assert [run.text for run in runs] == ["Plain ", "bold ", "both", "\n", "code"]
+    assert runs[0].font.font_weight == 400
+    assert runs[1].font.font_weight == 700 and not runs[1].font.italic
+    assert runs[2].font.font_weight == 700 and runs[2].font.italic
+    assert runs[3].font is None
+    assert runs[4].font.name == "Courier New"
+    assert all(run.font.size == 20 for run in runs if run.font)
+
+
+def test_parse_html_text_to_text_runs_reuses_resolved_fonts():
+    base_font = PptxFontModel()
+    runs = parse_html_text_to_text_runs(
+        "<b>one</b> two <b>three</b> <u>four</u>", base_font
+    )
+
+    assert runs[0].font is runs[2].font
+    assert runs[1].font is runs[3].font
+    assert runs[4].font.underline is True
+    assert runs[0].to_model().font == runs[0].font
+
+
+def test_parse_html_text_to_text_runs_handles_unclosed_and_nested_tags():
+    runs = parse_html_text_to_text_runs("<b><b>a</b>b</b>c<i>d")
+
+    assert [run.text for run in runs] == ["a", "b", "c", "d"]
+    assert runs[1].font.font_weight == 700
+    assert runs[2].font.font_weight == 400
+    assert runs[3].font.italic is True
@@ -0,0 +1,70 @@
+from copy import deepcopy
+
+from models.presentation_layout import SlideLayoutModel
+from services.json_schema_cache import JsonSchemaCache
+from utils.llm_calls import generate_slide_content
+from utils.schema_utils import (
+    ensure_strict_json_schema,
+    flatten_json_schema,
+    remove_titles_from_schema,
+)
+
+
+SCHEMA = {
+    "type": "object",
+    "title": "Slide",
+    "properties": {
+        "title": {"type": "string", "title": "Title"},
+        "image": {"$ref": "#/$defs/Image"},
+    },
+    "required": ["title"],
+    "$defs": {
+        "Image": {
+            "type": "object",
+            "properties": {"__image_url__": {"type": "string", "format": "uri"}},
+        }
+    },
+}
+
+
+def test_provider_schemas_match_uncached_ones_without_mutating_source():
+    cache = JsonSchemaCache()
+    schema = deepcopy(SCHEMA)
+
+    strict = cache.get_strict(schema)
+    expected_strict = deepcopy(SCHEMA)
+    ensure_strict_json_schema(expected_strict, path=(), root=expected_strict)
+    assert strict == expected_strict
+    assert cache.get_flattened(schema) == remove_titles_from_schema(
+        flatten_json_schema(SCHEMA)
+    )
+    assert schema == SCHEMA
+
+    assert cache.get_strict(deepcopy(SCHEMA)) is strict
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_slide_response_schema_is_cached_by_layout_and_schema(monkeypatch):
+    cache = JsonSchemaCache()
+    monkeypatch.setattr(generate_slide_content, "JSON_SCHEMA_CACHE", cache)
+    layout = SlideLayoutModel(id="layout", json_schema=deepcopy(SCHEMA))
+
+    response_schema = generate_slide_content.get_response_schema(layout)
+    assert "__speaker_note__" in response_schema["properties"]
+    assert "__image_url__" not in response_schema["$defs"]["Image"]["properties"]
+    assert generate_slide_content.get_response_schema(layout) is response_schema
+
+    layout.json_schema["properties"]["subtitle"] = {"type": "string"}
+    assert "subtitle" in generate_slide_content.get_response_schema(layout)["properties"]
+    assert cache.misses == 2
+
+
+def test_least_recently_used_schemas_are_evicted():
+    cache = JsonSchemaCache(maxsize=2)
+    first = cache.get("first", lambda: {"type": "string"})
+    cache.get("second", lambda: {"type": "number"})
+    cache.get("first", lambda: {})
+    cache.get("third", lambda: {"type": "boolean"})
+
+    assert cache.get("first", lambda: {}) is first
+    assert cache.get("second", lambda: {"rebuilt": True}) == {"rebuilt": True}
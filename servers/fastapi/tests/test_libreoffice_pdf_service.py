@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from services.libreoffice_pdf_service import LibreOfficePdfService, LibreOfficeWorker
+
+
+def test_libreoffice_pdf_service_limits_concurrency_and_queue(monkeypatch):
+    active = 0
+    max_active = 0
+
+    async def fake_convert_to_pdf(self, pptx_path, output_dir, timeout):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return f"{output_dir}/{self.index}.pdf"
+
+    monkeypatch.setattr(LibreOfficeWorker, "convert_to_pdf", fake_convert_to_pdf)
+
+    async def run():
+        service = LibreOfficePdfService(workers=2, queue_size=3)
+        results = await asyncio.gather(
+            *[service.convert_to_pdf(f"{i}.pptx", "/tmp") for i in range(6)],
+            return_exceptions=True,
+        )
+        return service, results
+
+    service, results = asyncio.run(run())
+
+    rejected = [result for result in results if isinstance(result, HTTPException)]
+    converted = [result for result in results if isinstance(result, str)]
+    assert max_active == 2
+    assert len(converted) == 5
+    assert len(rejected) == 1 and rejected[0].status_code == 503
+    assert service.waiting == 0
+
+
+def test_libreoffice_pdf_service_releases_worker_on_failure(monkeypatch):
+    async def failing_convert_to_pdf(self, pptx_path, output_dir, timeout):
+        raise HTTPException(status_code=500, detail="failed")
+
+    monkeypatch.setattr(LibreOfficeWorker, "convert_to_pdf", failing_convert_to_pdf)
+
+    async def run():
+        service = LibreOfficePdfService(workers=1)
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                await service.convert_to_pdf("deck.pptx", "/tmp")
+        return service._get_pool().qsize()
+
+    assert asyncio.run(run()) == 1
@@ -0,0 +1,247 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from enums.llm_call_purpose import LLMCallPurpose
+from enums.llm_call_type import LLMCallType
+from enums.llm_provider import LLMProvider
+from services.llm_call_metrics import (
+    LLMCallMetrics,
+    get_usage_tokens,
+    record_llm_request,
+    record_llm_usage,
+)
+from services.prometheus_metrics import PrometheusMetrics
+
+
+def _get_value(metrics: PrometheusMetrics, name: str, **labels) -> float:
+    return metrics.registry.get_sample_value(name, labels) or 0
+
+
+def test_usage_tokens_of_each_provider():
+    openai_usage = SimpleNamespace(
+        prompt_tokens=1000,
+        completion_tokens=200,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=600),
+    )
+    anthropic_usage = SimpleNamespace(
+        input_tokens=100,
+        output_tokens=50,
+        cache_read_input_tokens=800,
+        cache_creation_input_tokens=300,
+    )
+    google_usage = SimpleNamespace(
+        prompt_token_count=700,
+        candidates_token_count=70,
+        cached_content_token_count=None,
+    )
+
+    assert get_usage_tokens(openai_usage) == (1000, 200, 600)
+    assert get_usage_tokens(anthropic_usage) == (1200, 50, 800)
+    assert get_usage_tokens(google_usage) == (700, 70, 0)
+    assert get_usage_tokens({"input_tokens": 5, "output_tokens": 6}) == (5, 6, 0)
+
+
+def test_track_aggregates_requests_and_errors():
+    prometheus_metrics = PrometheusMetrics()
+    metrics = LLMCallMetrics(prometheus_metrics)
+    usage = SimpleNamespace(prompt_tokens=300, completion_tokens=40)
+
+    for _ in range(2):
+        with metrics.track(
+            LLMCallPurpose.OUTLINE,
+            LLMCallType.STRUCTURED,
+            LLMProvider.OPENAI,
+            "gpt-4.1",
+        ):
+            record_llm_request(usage)
+            record_llm_request(usage)
+
+    with pytest.raises(ValueError):
+        with metrics.track(
+            LLMCallPurpose.OUTLINE,
+            LLMCallType.STRUCTURED,
+            LLMProvider.OPENAI,
+            "gpt-4.1",
+        ):
+            raise ValueError()
+
+    # Requests outside of a tracked call are ignored
+    record_llm_request(usage)
+
+    labels = {"purpose": "outline", "mode": "structured", "provider": "openai"}
+    token_labels = {"purpose": "outline", "provider": "openai"}
+    assert (
+        _get_value(
+            prometheus_metrics, "presenton_llm_call_duration_seconds_count", **labels
+        )
+        == 3
+    )
+    assert (
+        _get_value(
+            prometheus_metrics,
+            "presenton_llm_call_errors_total",
+            **labels,
+            error="ValueError",
+        )
+        == 1
+    )
+    assert (
+        _get_value(prometheus_metrics, "presenton_llm_call_retries_total", **labels)
+        == 2
+    )
+    assert (
+        _get_value(
+            prometheus_metrics,
+            "presenton_llm_call_tokens_count",
+            **token_labels,
+            kind="input",
+        )
+        == 3
+    )
+    assert (
+        _get_value(
+            prometheus_metrics,
+            "presenton_llm_tokens_total",
+            **token_labels,
+            kind="input",
+        )
+        == 1200
+    )
+    assert (
+        _get_value(
+            prometheus_metrics,
+            "presenton_llm_tokens_total",
+            **token_labels,
+            kind="output",
+        )
+        == 160
+    )
+    assert (
+        _get_value(
+            prometheus_metrics,
+            "presenton_llm_call_time_to_first_token_seconds_count",
+            **labels,
+        )
+        == 0
+    )
+
+
+def test_track_stream_records_time_to_first_token_and_usage():
+    async def stream():
+        record_llm_request()
+        for chunk in ["a", "b", "c"]:
+            yield chunk
+        record_llm_usage(SimpleNamespace(input_tokens=10, output_tokens=3))
+
+    prometheus_metrics = PrometheusMetrics()
+
+    async def run():
+        metrics = LLMCallMetrics(prometheus_metrics)
+        chunks = [
+            chunk
+            async for chunk in metrics.track_stream(
+                stream(),
+                LLMCallPurpose.SLIDE_CONTENT,
+                LLMCallType.STRUCTURED_STREAM,
+                LLMProvider.ANTHROPIC,
+                "claude-sonnet-4",
+            )
+        ]
+
+        tracked = metrics.track_stream(
+            stream(),
+            LLMCallPurpose.SLIDE_CONTENT,
+            LLMCallType.STRUCTURED_STREAM,
+            LLMProvider.ANTHROPIC,
+            "claude-sonnet-4",
+        )
+        await tracked.__anext__()
+        await tracked.aclose()
+        return chunks
+
+    chunks = asyncio.run(run())
+
+    assert chunks == ["a", "b", "c"]
+    labels = {
+        "purpose": "slide_content",
+        "mode": "structured_stream",
+        "provider": "anthropic",
+    }
+    token_labels = {"purpose": "slide_content", "provider": "anthropic"}
+    assert (
+        _get_value(
+            prometheus_metrics, "presenton_llm_call_duration_seconds_count", **labels
+        )
+        == 2
+    )
+    assert (
+        _get_value(
+            prometheus_metrics,
+            "presenton_llm_call_time_to_first_token_seconds_count",
+            **labels,
+        )
+        == 2
+    )
+    assert (
+        _get_value(
+            prometheus_metrics,
+            "presenton_llm_tokens_total",
+            **token_labels,
+            kind="input",
+        )
+        == 10
+    )
+    assert (
+        _get_value(
+            prometheus_metrics,
+            "presenton_llm_tokens_total",
+            **token_labels,
+            kind="output",
+        )
+        == 3
+    )
+
+
+def test_cancelled_calls_are_not_errors():
+    prometheus_metrics = PrometheusMetrics()
+    metrics = LLMCallMetrics(prometheus_metrics)
+
+    async def cancelled_call():
+        with metrics.track(
+            LLMCallPurpose.SLIDE_CONTENT,
+            LLMCallType.STRUCTURED,
+            LLMProvider.OPENAI,
+            "gpt-4.1",
+        ):
+            await asyncio.sleep(10)
+
+    async def run():
+        task = asyncio.create_task(cancelled_call())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+
+    labels = {"purpose": "slide_content", "mode": "structured", "provider": "openai"}
+    assert (
+        _get_value(
+            prometheus_metrics, "presenton_llm_call_duration_seconds_count", **labels
+        )
+        == 1
+    )
+    assert not [
+        sample
+        for metric in prometheus_metrics.registry.collect()
+        if metric.name == "presenton_llm_call_errors"
+        for sample in metric.samples
+    ]
+    assert (
+        _get_value(
+            prometheus_metrics, "presenton_llm_calls_cancelled_total", **labels
+        )
+        == 1
+    )
@@ -0,0 +1,234 @@
+import asyncio
+import time
+
+from fastapi import HTTPException
+import pytest
+
+from enums.llm_call_purpose import LLMCallPurpose
+from enums.llm_provider import LLMProvider
+from models.llm_endpoint import LLMEndpointConfig
+from services.llm_client import LLMClient
+from services.llm_endpoint_pool import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    LLMEndpointPool,
+    get_llm_endpoint_pool,
+)
+from services.prometheus_metrics import PrometheusMetrics
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+def _get_pool(*configs: dict, **kwargs) -> LLMEndpointPool:
+    pool = LLMEndpointPool(
+        [LLMEndpointConfig(provider=LLMProvider.OPENAI, **config) for config in configs],
+        routing="least_latency",
+        **kwargs,
+    )
+    for endpoint in pool.endpoints:
+        endpoint.get_client = lambda purpose, name=endpoint.name: name
+    return pool
+
+
+def _get_call(results: dict, calls: list):
+    async def call(client: str, model: str):
+        calls.append(client)
+        result = results[client]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return call
+
+
+def _call(pool: LLMEndpointPool, call):
+    return asyncio.run(pool.call(LLMCallPurpose.OTHER, "m", LLMProvider.OPENAI, call))
+
+
+def test_call_fails_over_on_rate_limit_and_opens_circuit():
+    pool = _get_pool({"name": "a"}, {"name": "b"})
+    calls = []
+    call = _get_call({"a": FakeAPIError(429), "b": "from b"}, calls)
+
+    assert _call(pool, call) == "from b"
+    assert calls == ["a", "b"]
+    assert pool.endpoints[0].state == CIRCUIT_OPEN
+
+    # Open endpoints are skipped
+    assert _call(pool, call) == "from b"
+    assert calls == ["a", "b", "b"]
+
+
+def test_call_does_not_fail_over_on_client_errors():
+    pool = _get_pool({"name": "a"}, {"name": "b"})
+    calls = []
+
+    with pytest.raises(FakeAPIError):
+        _call(pool, _get_call({"a": FakeAPIError(400), "b": "from b"}, calls))
+    assert calls == ["a"]
+    assert pool.endpoints[0].state == CIRCUIT_CLOSED
+
+
+def test_circuit_opens_after_threshold_and_half_opens_after_cooldown():
+    pool = _get_pool({"name": "a"}, threshold=2, cooldown=0.05)
+    endpoint = pool.endpoints[0]
+    call = _get_call({"a": FakeAPIError(503)}, [])
+
+    for _ in range(2):
+        with pytest.raises(FakeAPIError):
+            _call(pool, call)
+    assert endpoint.state == CIRCUIT_OPEN
+
+    with pytest.raises(Exception) as error:
+        _call(pool, call)
+    assert error.value.status_code == 503
+    assert "unavailable" in error.value.detail
+
+    time.sleep(0.06)
+    assert endpoint.state == CIRCUIT_HALF_OPEN
+    endpoint.start_request()
+    # Only one trial request is let through while half open
+    assert pool.get_candidates() == []
+    endpoint.record_success(0.1)
+    assert endpoint.state == CIRCUIT_CLOSED
+
+
+def test_fallback_endpoints_are_tried_last():
+    pool = _get_pool(
+        {"name": "fallback", "fallback": True},
+        {"name": "a"},
+        {"name": "b"},
+    )
+    pool.endpoints[1].latency = 2.0
+    pool.endpoints[2].latency = 1.0
+
+    assert [endpoint.name for endpoint in pool.get_candidates()] == [
+        "b",
+        "a",
+        "fallback",
+    ]
+
+
+def test_stream_fails_over_only_before_first_chunk():
+    pool = _get_pool({"name": "a"}, {"name": "b"})
+
+    def stream(client: str, model: str):
+        async def chunks():
+            if client == "a":
+                raise FakeAPIError(500)
+            yield "first"
+            raise FakeAPIError(500)
+
+        return chunks()
+
+    async def collect():
+        received = []
+        with pytest.raises(FakeAPIError):
+            async for chunk in pool.stream(
+                LLMCallPurpose.OTHER, "m", LLMProvider.OPENAI, stream
+            ):
+                received.append(chunk)
+        return received
+
+    assert asyncio.run(collect()) == ["first"]
+    assert pool.endpoints[0].failures == 1
+    assert pool.endpoints[1].failures == 0
+
+
+def test_stream_releases_trial_when_client_can_not_be_created():
+    pool = _get_pool({"name": "a"}, cooldown=0)
+    endpoint = pool.endpoints[0]
+    endpoint.opened_until = time.monotonic()
+    assert endpoint.state == CIRCUIT_HALF_OPEN
+
+    def get_client(purpose):
+        raise HTTPException(status_code=400, detail="API Key is not set")
+
+    endpoint.get_client = get_client
+
+    async def collect():
+        return [
+            chunk
+            async for chunk in pool.stream(
+                LLMCallPurpose.OTHER, "m", LLMProvider.OPENAI, lambda *args: None
+            )
+        ]
+
+    with pytest.raises(HTTPException):
+        asyncio.run(collect())
+    assert not endpoint.is_trial_in_progress
+    assert pool.get_candidates() == [endpoint]
+
+
+def test_endpoint_health_is_exported():
+    pool = _get_pool({"name": "a"}, {"name": "b"})
+    pool.endpoints[0].opened_until = time.monotonic() + 60
+    pool.endpoints[1].latency = 1.5
+    metrics = PrometheusMetrics()
+
+    metrics.sample_llm_endpoints(pool.get_health())
+
+    def get_value(name: str, labels: dict):
+        return metrics.registry.get_sample_value(name, labels)
+
+    state = "presenton_llm_endpoint_circuit_state"
+    assert get_value(state, {"endpoint": "a", "state": CIRCUIT_OPEN}) == 1
+    assert get_value(state, {"endpoint": "a", "state": CIRCUIT_CLOSED}) == 0
+    assert get_value(state, {"endpoint": "b", "state": CIRCUIT_CLOSED}) == 1
+    assert (
+        get_value("presenton_llm_endpoint_latency_seconds", {"endpoint": "b"}) == 1.5
+    )
+
+
+def test_llm_client_routes_over_llm_endpoints(monkeypatch):
+    monkeypatch.setenv("LLM", "openai")
+    monkeypatch.setenv(
+        "LLM_ENDPOINTS",
+        '[{"name": "a", "provider": "openai", "api_key": "key-a"},'
+        ' {"name": "b", "provider": "custom", "base_url": "http://b/v1",'
+        ' "model": "b-model", "fallback": true}]',
+    )
+    pool = get_llm_endpoint_pool()
+    assert pool is get_llm_endpoint_pool()
+    calls = []
+
+    async def generate_openai(self, model: str, **kwargs):
+        calls.append((self.llm_provider, model, str(self._client.base_url)))
+        raise FakeAPIError(429)
+
+    async def generate_custom(self, model: str, **kwargs):
+        calls.append((self.llm_provider, model, str(self._client.base_url)))
+        return "done"
+
+    monkeypatch.setattr(LLMClient, "_generate_openai", generate_openai)
+    monkeypatch.setattr(LLMClient, "_generate_custom", generate_custom)
+    client = LLMClient(LLMCallPurpose.OTHER)
+    assert client._endpoint_pool is pool
+
+    assert asyncio.run(client.generate(model="m", messages=[])) == "done"
+    assert calls == [
+        (LLMProvider.OPENAI, "m", "https://api.openai.com/v1/"),
+        (LLMProvider.CUSTOM, "b-model", "http://b/v1/"),
+    ]
+
+    # Clients with their own API key, such as the hedging client, are not routed
+    client = LLMClient(LLMCallPurpose.OTHER, api_key="hedge-key")
+    assert client._endpoint_pool is None
+    assert client._client.api_key == "hedge-key"
+
+
+def test_circuit_breaker_env_keeps_zero_cooldown(monkeypatch):
+    monkeypatch.setenv(
+        "LLM_ENDPOINTS", '[{"name": "zero-cooldown", "provider": "openai"}]'
+    )
+    monkeypatch.setenv("LLM_CIRCUIT_BREAKER_COOLDOWN", "0")
+    monkeypatch.delenv("LLM_CIRCUIT_BREAKER_THRESHOLD", raising=False)
+    pool = get_llm_endpoint_pool()
+
+    assert pool.cooldown == 0
+    assert pool.threshold == 3
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from enums.llm_call_purpose import LLMCallPurpose
+from enums.llm_provider import LLMProvider
+from services import llm_client as llm_client_module
+from services.llm_client import LLMClient
+from services.llm_hedging_policy import LLMHedgingPolicy
+
+
+def _get_policy(latency: float = 0.05) -> LLMHedgingPolicy:
+    policy = LLMHedgingPolicy(purposes={LLMCallPurpose.SLIDE_CONTENT}, min_samples=3)
+    for _ in range(3):
+        policy.observe(LLMCallPurpose.SLIDE_CONTENT, LLMProvider.OPENAI, "m", latency)
+    return policy
+
+
+def _get_client(monkeypatch, policy: LLMHedgingPolicy, delays: list, errors=()):
+    monkeypatch.setenv("LLM", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.delenv("LLM_HEDGING_API_KEY", raising=False)
+    monkeypatch.setenv("LLM_HEDGING_MODEL", "hedge-model")
+    monkeypatch.setattr(llm_client_module, "LLM_HEDGING_POLICY", policy)
+
+    client = LLMClient(LLMCallPurpose.SLIDE_CONTENT)
+    calls = []
+
+    async def generate_structured(model: str, **kwargs):
+        index = len(calls)
+        calls.append({"model": model, "cancelled": False})
+        try:
+            await asyncio.sleep(delays[index])
+        except asyncio.CancelledError:
+            calls[index]["cancelled"] = True
+            raise
+        if index in errors:
+            raise ValueError(f"call {index} failed")
+        return {"model": model}
+
+    monkeypatch.setattr(client, "_generate_structured", generate_structured)
+    return client, calls
+
+
+def _generate(client: LLMClient):
+    return asyncio.run(
+        client.generate_structured(model="m", messages=[], response_format={})
+    )
+
+
+def test_policy_uses_percentile_of_recent_latencies():
+    policy = LLMHedgingPolicy(
+        purposes={LLMCallPurpose.SLIDE_CONTENT}, percentile=90, min_samples=10
+    )
+    for latency in range(1, 10):
+        policy.observe(LLMCallPurpose.SLIDE_CONTENT, LLMProvider.OPENAI, "m", latency)
+
+    assert (
+        policy.get_hedge_delay(LLMCallPurpose.SLIDE_CONTENT, LLMProvider.OPENAI, "m")
+        is None
+    )
+    policy.observe(LLMCallPurpose.SLIDE_CONTENT, LLMProvider.OPENAI, "m", 10)
+    assert (
+        policy.get_hedge_delay(LLMCallPurpose.SLIDE_CONTENT, LLMProvider.OPENAI, "m")
+        == 9
+    )
+    assert (
+        policy.get_hedge_delay(LLMCallPurpose.OUTLINE, LLMProvider.OPENAI, "m")
+        is None
+    )
+
+
+def test_policy_keeps_zero_from_env(monkeypatch):
+    monkeypatch.setenv("LLM_HEDGING_MIN_SAMPLES", "0")
+    monkeypatch.delenv("LLM_HEDGING_PERCENTILE", raising=False)
+    policy = LLMHedgingPolicy(purposes={LLMCallPurpose.SLIDE_CONTENT})
+
+    assert policy.min_samples == 0
+    assert policy.percentile == 95
+
+
+def test_slow_call_is_hedged_and_cancelled(monkeypatch):
+    client, calls = _get_client(monkeypatch, _get_policy(), delays=[5, 0.01])
+
+    assert _generate(client) == {"model": "hedge-model"}
+    assert calls == [
+        {"model": "m", "cancelled": True},
+        {"model": "hedge-model", "cancelled": False},
+    ]
+
+
+def test_fast_call_is_not_hedged(monkeypatch):
+    client, calls = _get_client(monkeypatch, _get_policy(latency=1), delays=[0.01])
+
+    assert _generate(client) == {"model": "m"}
+    assert len(calls) == 1
+
+
+def test_failed_hedge_waits_for_primary(monkeypatch):
+    client, calls = _get_client(
+        monkeypatch, _get_policy(), delays=[0.2, 0.01], errors=(1,)
+    )
+
+    assert _generate(client) == {"model": "m"}
+    assert len(calls) == 2
+
+
+def test_error_is_raised_if_both_requests_fail(monkeypatch):
+    client, _ = _get_client(
+        monkeypatch, _get_policy(), delays=[0.1, 0.01], errors=(0, 1)
+    )
+
+    with pytest.raises(ValueError, match="call 0 failed"):
+        _generate(client)
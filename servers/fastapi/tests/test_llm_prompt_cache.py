@@ -0,0 +1,125 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from enums.llm_call_purpose import LLMCallPurpose
+from enums.llm_provider import LLMProvider
+from models.llm_message import LLMSystemMessage, LLMUserMessage
+from services import llm_client as llm_client_module
+from services.llm_client import LLMClient
+from services.llm_prompt_cache import GOOGLE_MIN_CACHED_CHARACTERS, LLMPromptCache
+
+
+LONG_PROMPT = "x" * GOOGLE_MIN_CACHED_CHARACTERS
+
+
+class FakeCaches:
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.created = []
+
+    def create(self, model: str, config):
+        time.sleep(0.01)
+        self.created.append((model, config.system_instruction, config.ttl))
+        if self.error:
+            raise self.error
+        return SimpleNamespace(name=f"cachedContents/{len(self.created)}")
+
+
+def _get_cached_contents(
+    cache: LLMPromptCache, caches: FakeCaches, prompts: list, api_key: str = "key"
+):
+    client = SimpleNamespace(caches=caches)
+
+    async def get_cached_contents():
+        return await asyncio.gather(
+            *[
+                cache.get_google_cached_content(client, "m", prompt, api_key)
+                for prompt in prompts
+            ]
+        )
+
+    return asyncio.run(get_cached_contents())
+
+
+def test_anthropic_system_prompt_is_marked_cacheable():
+    assert LLMPromptCache(enabled=True).get_anthropic_system("prompt") == [
+        {"type": "text", "text": "prompt", "cache_control": {"type": "ephemeral"}}
+    ]
+    assert LLMPromptCache(enabled=False).get_anthropic_system("prompt") == "prompt"
+    assert LLMPromptCache(enabled=True).get_anthropic_system("") == ""
+
+
+def test_openai_prompt_cache_key_is_only_sent_to_openai(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("CUSTOM_LLM_URL", "http://localhost/v1")
+    monkeypatch.delenv("LLM_PROMPT_CACHING", raising=False)
+    messages = [LLMSystemMessage(content="system"), LLMUserMessage(content="user")]
+
+    monkeypatch.setenv("LLM", "openai")
+    client = LLMClient(LLMCallPurpose.SLIDE_CONTENT)
+    extra_body = client._get_openai_extra_body(messages, {"other": 1})
+    assert extra_body["other"] == 1
+    assert extra_body["prompt_cache_key"].startswith("presenton-slide_content-")
+    assert extra_body == client._get_openai_extra_body(messages, {"other": 1})
+    assert extra_body != client._get_openai_extra_body(
+        [LLMSystemMessage(content="other system")], {"other": 1}
+    )
+
+    monkeypatch.setenv("LLM_PROMPT_CACHING", "false")
+    assert client._get_openai_extra_body(messages, None) is None
+
+    monkeypatch.delenv("LLM_PROMPT_CACHING")
+    monkeypatch.setenv("LLM", "custom")
+    client = LLMClient(LLMCallPurpose.SLIDE_CONTENT)
+    assert client._get_openai_extra_body(messages, None) is None
+
+
+def test_google_cached_content_is_created_once_per_prompt():
+    cache = LLMPromptCache(enabled=True, google_cache_ttl=300)
+    caches = FakeCaches()
+
+    names = _get_cached_contents(
+        cache, caches, [LONG_PROMPT, LONG_PROMPT, LONG_PROMPT, "short"]
+    )
+
+    assert names == ["cachedContents/1", "cachedContents/1", "cachedContents/1", None]
+    assert caches.created == [("m", LONG_PROMPT, "300s")]
+    assert _get_cached_contents(cache, caches, [LONG_PROMPT]) == ["cachedContents/1"]
+
+    # Cached contents of one API key are not visible to others
+    other_caches = FakeCaches()
+    assert _get_cached_contents(cache, other_caches, [LONG_PROMPT], "other") == [
+        "cachedContents/1"
+    ]
+    assert len(other_caches.created) == 1
+
+
+def test_google_cache_failures_are_not_retried_until_expiry():
+    cache = LLMPromptCache(enabled=True)
+    caches = FakeCaches(error=ValueError("too few tokens"))
+
+    assert _get_cached_contents(cache, caches, [LONG_PROMPT]) == [None]
+    assert _get_cached_contents(cache, caches, [LONG_PROMPT]) == [None]
+    assert len(caches.created) == 1
+
+
+def test_google_request_uses_cached_content_without_tools(monkeypatch):
+    monkeypatch.setenv("LLM", "google")
+    monkeypatch.setenv("GOOGLE_API_KEY", "test")
+    cache = LLMPromptCache(enabled=True)
+    monkeypatch.setattr(llm_client_module, "LLM_PROMPT_CACHE", cache)
+    client = LLMClient(LLMCallPurpose.SLIDE_CONTENT)
+    assert client.llm_provider == LLMProvider.GOOGLE
+    client._client = SimpleNamespace(caches=FakeCaches())
+    messages = [LLMSystemMessage(content=LONG_PROMPT)]
+
+    async def get_configs():
+        return (
+            await client._get_google_system_config("m", messages, None),
+            await client._get_google_system_config("m", messages, [object()]),
+        )
+
+    without_tools, with_tools = asyncio.run(get_configs())
+    assert without_tools == {"cached_content": "cachedContents/1"}
+    assert with_tools == {"system_instruction": LONG_PROMPT}
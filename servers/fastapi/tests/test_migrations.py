@@ -0,0 +1,107 @@
+import asyncio
+import os
+import tempfile
+
+from sqlalchemy import Column, Integer, inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from migrations import MIGRATIONS
+from models.sql.image_asset import ImageAsset
+from models.sql.presentation import PresentationModel
+from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+from models.sql.slide import SlideModel
+from services.migration_service import (
+    get_applied_migration_versions,
+    run_migrations,
+)
+from utils.migration_utils import Migration, add_column_if_missing
+
+
+TABLES = [
+    PresentationModel.__table__,
+    SlideModel.__table__,
+    ImageAsset.__table__,
+    PresentationLayoutCodeModel.__table__,
+]
+
+
+def get_index_names(sync_conn, table_name):
+    return {index["name"] for index in inspect(sync_conn).get_indexes(table_name)}
+
+
+def run_with_engine(coroutine_fn):
+    async def run(database_url: str):
+        engine = create_async_engine(database_url)
+        try:
+            return await coroutine_fn(engine)
+        finally:
+            await engine.dispose()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        database_path = os.path.join(temp_dir, "test.db")
+        return asyncio.run(run(f"sqlite+aiosqlite:///{database_path}"))
+
+
+def test_migrations_add_indexes_to_existing_tables():
+    async def run(engine):
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all, tables=TABLES)
+            # Tables created by a version without the composite indexes
+            for table in TABLES:
+                for index in table.indexes:
+                    if index.name.startswith("ix_") and len(index.columns) > 1:
+                        await conn.execute(text(f"DROP INDEX {index.name}"))
+
+        first_run = await run_migrations(engine)
+        second_run = await run_migrations(engine)
+
+        async with engine.connect() as conn:
+            slide_indexes = await conn.run_sync(get_index_names, "slides")
+            image_indexes = await conn.run_sync(get_index_names, "imageasset")
+        return first_run, second_run, slide_indexes, image_indexes, (
+            await get_applied_migration_versions(engine)
+        )
+
+    first_run, second_run, slide_indexes, image_indexes, applied = run_with_engine(
+        run
+    )
+
+    assert first_run == [migration.version for migration in MIGRATIONS]
+    assert second_run == []
+    assert applied == set(first_run)
+    assert "ix_slides_presentation_index" in slide_indexes
+    assert "ix_imageasset_is_uploaded_created_at" in image_indexes
+
+
+def test_failed_migration_is_not_recorded():
+    def failing_upgrade(sync_conn):
+        raise RuntimeError("boom")
+
+    def add_column(sync_conn):
+        add_column_if_missing(sync_conn, "slides", Column("version", Integer))
+        add_column_if_missing(sync_conn, "slides", Column("version", Integer))
+
+    async def run(engine):
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all, tables=TABLES)
+
+        applied = await run_migrations(engine, [Migration(1, "add_column", add_column)])
+        try:
+            await run_migrations(engine, [Migration(2, "failing", failing_upgrade)])
+        except RuntimeError:
+            pass
+
+        async with engine.connect() as conn:
+            columns = await conn.run_sync(
+                lambda sync_conn: [
+                    column["name"] for column in inspect(sync_conn).get_columns("slides")
+                ]
+            )
+        return applied, await get_applied_migration_versions(engine), columns
+
+    applied, versions, columns = run_with_engine(run)
+
+    assert applied == [1]
+    assert versions == {1}
+    assert "version" in columns
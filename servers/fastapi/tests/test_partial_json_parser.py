@@ -0,0 +1,52 @@
+import json
+
+from utils.partial_json_parser import PartialJsonParser
+
+
+DOCUMENT = {
+    "title": 'Growth "2025" é \U0001f680\nnext',
+    "bullets": [
+        {"heading": "Revenue", "value": 1.5},
+        {"heading": "Margin", "visible": True, "note": None},
+    ],
+    "empty": {},
+}
+
+
+def _feed(parser: PartialJsonParser, text: str, size: int):
+    patches = []
+    for start in range(0, len(text), size):
+        patches.extend(parser.feed(text[start : start + size]))
+    return patches
+
+
+def test_parses_document_streamed_in_any_chunk_size():
+    for ensure_ascii in (True, False):
+        text = "```json\n" + json.dumps(DOCUMENT, ensure_ascii=ensure_ascii) + "\n```"
+        for size in range(1, 12):
+            parser = PartialJsonParser()
+            _feed(parser, text, size)
+            assert parser.is_done
+            assert parser.value == DOCUMENT
+
+
+def test_patches_completed_fields_and_growing_strings():
+    parser = PartialJsonParser()
+
+    assert [
+        (patch.path, patch.value, patch.done)
+        for patch in parser.feed('{"title": "Gro')
+    ] == [(["title"], "Gro", False)]
+
+    patches = parser.feed('wth", "bullets": [{"heading": "Rev", "value": 1.5}, ')
+    assert [(patch.path, patch.value, patch.done) for patch in patches] == [
+        (["title"], "Growth", True),
+        (["bullets", 0, "heading"], "Rev", True),
+        (["bullets", 0, "value"], 1.5, True),
+        (["bullets", 0], {"heading": "Rev", "value": 1.5}, True),
+    ]
+
+    # Incomplete escapes are held back until complete
+    assert [patch.value for patch in parser.feed('{"heading": "a\\u00')] == ["a"]
+    assert [patch.value for patch in parser.feed("e9")] == ["aé"]
+    assert parser.feed("") == []
@@ -0,0 +1,83 @@
+import asyncio
+import os
+import tempfile
+
+from PIL import Image
+
+from models.pptx_models import (
+    PptxImageCompressionModel,
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from services.pptx_presentation_creator import PptxPresentationCreator
+from utils.image_utils import downsample_image, has_transparency
+
+
+def _save_noise_image(path: str, size: tuple, mode: str):
+    image = Image.effect_noise(size, 64).convert(mode)
+    if mode == "RGBA":
+        image.putalpha(128)
+    image.save(path)
+
+
+def _picture(path: str, clip: bool) -> PptxPictureBoxModel:
+    return PptxPictureBoxModel(
+        position=PptxPositionModel(left=0, top=0, width=320, height=180),
+        clip=clip,
+        picture=PptxPictureModel(is_network=False, path=path),
+    )
+
+
+def test_downsample_image_keeps_cover_size_at_dpi():
+    image = Image.new("RGB", (4000, 2000))
+
+    downsampled = downsample_image(image, 320, 180, 144)
+
+    assert downsampled.size[0] >= 640 and downsampled.size[1] >= 360
+    assert downsampled.size[0] < 4000
+    assert downsample_image(Image.new("RGB", (100, 100)), 320, 180, 144).size == (
+        100,
+        100,
+    )
+
+
+def test_has_transparency():
+    assert not has_transparency(Image.new("RGB", (4, 4)))
+    assert not has_transparency(Image.new("RGBA", (4, 4), (0, 0, 0, 255)))
+    assert has_transparency(Image.new("RGBA", (4, 4), (0, 0, 0, 10)))
+
+
+def test_pptx_creator_compresses_images():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        opaque_path = os.path.join(temp_dir, "opaque.png")
+        transparent_path = os.path.join(temp_dir, "transparent.png")
+        _save_noise_image(opaque_path, (1600, 900), "RGB")
+        _save_noise_image(transparent_path, (1600, 900), "RGBA")
+
+        pptx_model = PptxPresentationModel(
+            slides=[
+                PptxSlideModel(
+                    shapes=[
+                        _picture(opaque_path, clip=False),
+                        _picture(transparent_path, clip=True),
+                    ]
+                )
+            ]
+        )
+        pptx_creator = PptxPresentationCreator(
+            pptx_model, temp_dir, PptxImageCompressionModel(dpi=144, quality=80)
+        )
+        asyncio.run(pptx_creator.create_ppt())
+        pptx_creator.save(os.path.join(temp_dir, "compressed.pptx"))
+
+        pictures = list(pptx_creator._ppt.slides[0].shapes)
+        assert pictures[0].image.content_type == "image/jpeg"
+        assert pictures[1].image.content_type == "image/png"
+
+        stats = pptx_creator.image_compression_stats
+        assert stats.images == 2
+        assert stats.compressed_bytes < stats.original_bytes
+        assert stats.bytes_saved == stats.original_bytes - stats.compressed_bytes
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import tempfile
+import uuid
+
+from sqlalchemy import func, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlmodel import SQLModel, select
+
+from models.presentation_layout import PresentationLayoutModel, SlideLayoutModel
+from models.sql.presentation import PresentationModel
+from models.sql.presentation_layout import PresentationLayoutSqlModel
+from services.migration_service import run_migrations
+from services.presentation_layout_store import (
+    PresentationLayoutStore,
+    get_layout_hash,
+)
+from utils.datetime_utils import get_current_utc_datetime
+from utils.migration_utils import get_table
+
+
+LAYOUT = PresentationLayoutModel(
+    name="general",
+    slides=[
+        SlideLayoutModel(
+            id="general:intro",
+            name="Intro",
+            json_schema={"type": "object", "properties": {"title": {"type": "string"}}},
+        )
+    ],
+)
+
+
+def run_with_engine(coroutine_fn):
+    async def run(database_url: str):
+        engine = create_async_engine(database_url)
+        try:
+            return await coroutine_fn(engine)
+        finally:
+            await engine.dispose()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        database_path = os.path.join(temp_dir, "test.db")
+        return asyncio.run(run(f"sqlite+aiosqlite:///{database_path}"))
+
+
+async def count_stored_layouts(session: AsyncSession) -> int:
+    return await session.scalar(
+        select(func.count()).select_from(PresentationLayoutSqlModel)
+    )
+
+
+def test_layouts_are_stored_once_and_cached():
+    async def run(engine):
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                SQLModel.metadata.create_all,
+                tables=[
+                    PresentationModel.__table__,
+                    PresentationLayoutSqlModel.__table__,
+                ],
+            )
+
+        store = PresentationLayoutStore()
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            presentations = []
+            for _ in range(3):
+                presentation = PresentationModel(
+                    content="prompt", n_slides=1, language="English"
+                )
+                await store.set_presentation_layout(session, presentation, LAYOUT)
+                session.add(presentation)
+                presentations.append(presentation)
+            await session.commit()
+
+            layout = await store.get_presentation_layout(session, presentations[0])
+            cached_layout = await store.get_presentation_layout(
+                session, presentations[1]
+            )
+            return presentations, layout, cached_layout, await count_stored_layouts(
+                session
+            )
+
+    presentations, layout, cached_layout, n_stored = run_with_engine(run)
+
+    assert n_stored == 1
+    assert {presentation.layout_hash for presentation in presentations} == {
+        get_layout_hash(LAYOUT)
+    }
+    assert all(presentation.layout is None for presentation in presentations)
+    assert layout == LAYOUT
+    assert cached_layout is layout
+
+
+def test_migration_moves_inline_layouts_to_store():
+    async def run(engine):
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                SQLModel.metadata.create_all, tables=[PresentationModel.__table__]
+            )
+            # Table created by a version that stored layouts inline
+            await conn.execute(text("ALTER TABLE presentations DROP COLUMN layout_hash"))
+            presentations = await conn.run_sync(get_table, "presentations")
+            for _ in range(3):
+                await conn.execute(
+                    insert(presentations).values(
+                        id=uuid.uuid4().hex,
+                        content="prompt",
+                        n_slides=1,
+                        language="English",
+                        layout=LAYOUT.model_dump(),
+                        created_at=get_current_utc_datetime(),
+                        updated_at=get_current_utc_datetime(),
+                    )
+                )
+
+        await run_migrations(engine)
+
+        async with AsyncSession(engine) as session:
+            rows = (await session.scalars(select(PresentationModel))).all()
+            return [(row.layout, row.layout_hash) for row in rows], (
+                await count_stored_layouts(session)
+            )
+
+    rows, n_stored = run_with_engine(run)
+
+    assert n_stored == 1
+    assert rows == [(None, get_layout_hash(LAYOUT))] * 3
@@ -0,0 +1,90 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from fastapi import Response
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlmodel import SQLModel
+
+from api.v1.ppt.endpoints.presentation import get_all_presentations
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+
+
+async def list_presentations(**kwargs):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all,
+            tables=[PresentationModel.__table__, SlideModel.__table__],
+        )
+
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        for i in range(5):
+            presentation = PresentationModel(
+                content="prompt",
+                n_slides=2,
+                language="English",
+                title=f"Deck {i}" if i % 2 == 0 else f"Report {i}",
+                created_at=created_at + timedelta(minutes=i),
+                updated_at=created_at + timedelta(minutes=i),
+                layout={"name": "general", "slides": []},
+            )
+            session.add(presentation)
+            for index in range(2):
+                session.add(
+                    SlideModel(
+                        presentation=presentation.id,
+                        layout_group="general",
+                        layout="general:intro",
+                        index=index,
+                        content={"title": f"Slide {index}"},
+                        html_content=None,
+                        properties=None,
+                    )
+                )
+        await session.commit()
+
+        pages = []
+        cursor = None
+        while True:
+            response = Response()
+            page = await get_all_presentations(
+                response=response, cursor=cursor, sql_session=session, **kwargs
+            )
+            pages.append((page, response.headers))
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+    await engine.dispose()
+    return pages
+
+
+def test_get_all_presentations_is_keyset_paginated():
+    pages = asyncio.run(
+        list_presentations(limit=2, title=None, include_total=True)
+    )
+
+    assert [len(page) for page, _ in pages] == [2, 2, 1]
+    assert pages[0][1]["X-Total-Count"] == "5"
+
+    titles = [presentation.title for page, _ in pages for presentation in page]
+    assert titles == ["Deck 4", "Report 3", "Deck 2", "Report 1", "Deck 0"]
+    for page, _ in pages:
+        for presentation in page:
+            assert len(presentation.slides) == 1
+            assert presentation.slides[0].index == 0
+            assert presentation.slides[0].content == {"title": "Slide 0"}
+
+
+def test_get_all_presentations_filters_by_title():
+    pages = asyncio.run(
+        list_presentations(limit=None, title="report", include_total=True)
+    )
+
+    assert len(pages) == 1
+    page, headers = pages[0]
+    assert [presentation.title for presentation in page] == ["Report 3", "Report 1"]
+    assert headers["X-Total-Count"] == "2"
+    assert "X-Next-Cursor" not in headers
@@ -0,0 +1,117 @@
+import asyncio
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlmodel import SQLModel, select
+
+from api.v1.ppt.endpoints.presentation import update_presentation
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+
+
+def get_slide_json(slide: SlideModel) -> dict:
+    # Slides in request bodies are not validated, so ids arrive as strings
+    return {
+        **slide.model_dump(exclude={"content_hash"}),
+        "id": str(slide.id),
+        "presentation": str(slide.presentation),
+    }
+
+
+async def update_slides():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all,
+            tables=[PresentationModel.__table__, SlideModel.__table__],
+        )
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        presentation = PresentationModel(
+            content="prompt", n_slides=3, language="English"
+        )
+        stored_slides = [
+            SlideModel(
+                presentation=presentation.id,
+                layout_group="general",
+                layout="general:intro",
+                index=index,
+                content={"title": f"Slide {index}"},
+                html_content=None,
+                properties=None,
+            )
+            for index in range(3)
+        ]
+        session.add(presentation)
+        session.add_all(stored_slides)
+        await session.commit()
+
+        incoming_slides = [get_slide_json(slide) for slide in stored_slides[:2]]
+        incoming_slides[1]["content"] = {"title": "Edited"}
+        new_slide = SlideModel(
+            presentation=presentation.id,
+            layout_group="general",
+            layout="general:intro",
+            index=2,
+            content={"title": "New"},
+            html_content=None,
+            properties=None,
+        )
+        incoming_slides.append(get_slide_json(new_slide))
+
+        response = await update_presentation(
+            id=presentation.id,
+            title="Updated",
+            slides=[SlideModel(**slide) for slide in incoming_slides],
+            expected_version=1,
+            sql_session=session,
+        )
+
+        try:
+            await update_presentation(
+                id=presentation.id,
+                title="Stale",
+                expected_version=1,
+                sql_session=session,
+            )
+            conflict = None
+        except HTTPException as e:
+            conflict = e.status_code
+
+        unchanged_response = await update_presentation(
+            id=presentation.id,
+            slides=[SlideModel(**slide) for slide in incoming_slides],
+            sql_session=session,
+        )
+
+        rows = (
+            await session.scalars(
+                select(SlideModel)
+                .where(SlideModel.presentation == presentation.id)
+                .order_by(SlideModel.index)
+            )
+        ).all()
+
+    await engine.dispose()
+    return stored_slides, new_slide, response, conflict, unchanged_response, rows
+
+
+def test_update_presentation_writes_only_changed_slides():
+    stored_slides, new_slide, response, conflict, unchanged_response, rows = (
+        asyncio.run(update_slides())
+    )
+
+    assert response.version == 2
+    assert response.title == "Updated"
+    assert response.inserted_slides == [new_slide.id]
+    assert response.updated_slides == [stored_slides[1].id]
+    assert response.deleted_slides == [stored_slides[2].id]
+    assert conflict == 409
+
+    assert unchanged_response.version == 2
+    assert unchanged_response.inserted_slides == []
+    assert unchanged_response.updated_slides == []
+    assert unchanged_response.deleted_slides == []
+
+    assert [row.content["title"] for row in rows] == ["Slide 0", "Edited", "New"]
+    assert all(row.content_hash == row.get_content_hash() for row in rows)
@@ -0,0 +1,195 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from api.metrics import METRICS_ROUTER
+from api.middlewares import PrometheusMetricsMiddleware
+from enums.llm_call_purpose import LLMCallPurpose
+from enums.llm_call_type import LLMCallType
+from enums.llm_provider import LLMProvider
+from models.export_stats import ExportStatsModel
+from services.llm_call_metrics import LLMCall
+from services.prometheus_metrics import PROMETHEUS_METRICS, PrometheusMetrics
+
+
+def _get_value(name: str, labels: dict) -> float:
+    return PROMETHEUS_METRICS.registry.get_sample_value(name, labels) or 0
+
+
+def _create_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(METRICS_ROUTER)
+
+    @app.get("/test-metrics/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/test-metrics/stream")
+    async def stream():
+        async def inner():
+            yield "data: {}\n\n".format(
+                _get_value(
+                    "presenton_sse_streams_in_progress",
+                    {"route": "/test-metrics/stream"},
+                )
+            )
+
+        return StreamingResponse(inner(), media_type="text/event-stream")
+
+    app.add_middleware(PrometheusMetricsMiddleware)
+    return TestClient(app)
+
+
+def test_requests_are_timed_by_route_template():
+    client = _create_client()
+    labels = {"method": "GET", "route": "/test-metrics/items/{item_id}"}
+    before_ok = _get_value(
+        "presenton_http_request_duration_seconds_count", {**labels, "status": "200"}
+    )
+    before_invalid = _get_value(
+        "presenton_http_request_duration_seconds_count", {**labels, "status": "422"}
+    )
+
+    client.get("/test-metrics/items/1")
+    client.get("/test-metrics/items/2")
+    client.get("/test-metrics/items/x")
+
+    assert (
+        _get_value(
+            "presenton_http_request_duration_seconds_count",
+            {**labels, "status": "200"},
+        )
+        == before_ok + 2
+    )
+    assert (
+        _get_value(
+            "presenton_http_request_duration_seconds_count",
+            {**labels, "status": "422"},
+        )
+        == before_invalid + 1
+    )
+
+
+def test_open_sse_streams_are_counted():
+    client = _create_client()
+
+    response = client.get("/test-metrics/stream")
+
+    assert response.text == "data: 1.0\n\n"
+    assert (
+        _get_value(
+            "presenton_sse_streams_in_progress", {"route": "/test-metrics/stream"}
+        )
+        == 0
+    )
+    metrics = client.get("/metrics")
+    assert metrics.headers["content-type"].startswith("text/plain")
+    assert 'route="/test-metrics/stream"' in metrics.text
+
+
+def test_llm_calls_are_exported():
+    metrics = PrometheusMetrics()
+    call = LLMCall(
+        purpose=LLMCallPurpose.OUTLINE,
+        mode=LLMCallType.STRUCTURED_STREAM,
+        provider=LLMProvider.OPENAI,
+        model="gpt-4.1",
+        input_tokens=1000,
+        output_tokens=200,
+        requests=2,
+    )
+    call.mark_first_token()
+    call.finish(TimeoutError())
+
+    metrics.observe_llm_call(call)
+
+    labels = {"purpose": "outline", "mode": "structured_stream", "provider": "openai"}
+    registry = metrics.registry
+    assert registry.get_sample_value(
+        "presenton_llm_call_duration_seconds_count", labels
+    ) == 1
+    assert registry.get_sample_value(
+        "presenton_llm_call_time_to_first_token_seconds_count", labels
+    ) == 1
+    assert registry.get_sample_value(
+        "presenton_llm_call_errors_total", {**labels, "error": "TimeoutError"}
+    ) == 1
+    assert registry.get_sample_value("presenton_llm_call_retries_total", labels) == 1
+    assert registry.get_sample_value(
+        "presenton_llm_tokens_total",
+        {"purpose": "outline", "provider": "openai", "kind": "input"},
+    ) == 1000
+
+
+def test_export_stats_are_exported():
+    metrics = PrometheusMetrics()
+    stats = ExportStatsModel(
+        assets_downloaded=2, bytes_downloaded=2048, asset_cache_hits=3
+    )
+    stats.add_timing("pptx_model", 0.2)
+    stats.add_timing("pdf_conversion", 1.5)
+
+    metrics.observe_export("pdf", stats)
+
+    registry = metrics.registry
+    assert registry.get_sample_value(
+        "presenton_export_stage_duration_seconds_sum",
+        {"format": "pdf", "stage": "pdf_conversion"},
+    ) == 1.5
+    assert registry.get_sample_value(
+        "presenton_export_stage_duration_seconds_count",
+        {"format": "pdf", "stage": "pptx_model"},
+    ) == 1
+    assert registry.get_sample_value(
+        "presenton_export_bytes_downloaded_total", {"format": "pdf"}
+    ) == 2048
+    assert registry.get_sample_value(
+        "presenton_export_asset_cache_hits_total", {"format": "pdf"}
+    ) == 3
+
+
+WORKER_SCRIPT = """
+import sys
+
+from services.prometheus_metrics import PROMETHEUS_METRICS
+
+shutdown = sys.argv[1] == "shutdown"
+PROMETHEUS_METRICS.background_tasks.labels("generate", "completed").inc()
+PROMETHEUS_METRICS.background_tasks_in_progress.labels("generate").inc()
+if shutdown:
+    PROMETHEUS_METRICS.mark_process_dead()
+"""
+
+SCRAPE_SCRIPT = """
+from services.prometheus_metrics import PROMETHEUS_METRICS
+
+print(PROMETHEUS_METRICS.get_latest().decode())
+"""
+
+
+def test_metrics_are_aggregated_across_processes():
+    with tempfile.TemporaryDirectory() as multiproc_dir:
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": multiproc_dir}
+        for action in ["shutdown", "keep"]:
+            subprocess.run(
+                [sys.executable, "-c", WORKER_SCRIPT, action], env=env, check=True
+            )
+        output = subprocess.run(
+            [sys.executable, "-c", SCRAPE_SCRIPT],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+
+    assert (
+        'presenton_background_tasks_total{status="completed",task="generate"} 2.0'
+        in output
+    )
+    # Gauges of workers that shut down are no longer summed
+    assert 'presenton_background_tasks_in_progress{task="generate"} 1.0' in output
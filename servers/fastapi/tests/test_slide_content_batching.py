@@ -0,0 +1,112 @@
+import asyncio
+
+from enums.llm_call_purpose import LLMCallPurpose
+from models.presentation_layout import SlideLayoutModel
+from models.presentation_outline_model import SlideOutlineModel
+from services.llm_client import LLMClient
+from utils.llm_calls import generate_slide_content
+from utils.llm_calls.generate_slide_content import (
+    get_slide_contents_from_types_and_outlines,
+)
+
+
+NOTE = "n" * 120
+
+
+def _get_layout(field: str) -> SlideLayoutModel:
+    return SlideLayoutModel(
+        id=field,
+        json_schema={
+            "type": "object",
+            "properties": {field: {"type": "string", "maxLength": 10}},
+            "required": [field],
+        },
+    )
+
+
+def _generate(monkeypatch, layouts, batch_response: dict | Exception):
+    monkeypatch.setattr(generate_slide_content, "get_model", lambda: "m")
+    monkeypatch.setenv("LLM", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    calls = []
+
+    async def generate_structured(self, model, messages, response_format, **kwargs):
+        calls.append((self.purpose, response_format, kwargs.get("max_tokens")))
+        if self.purpose == LLMCallPurpose.SLIDE_CONTENT_BATCH:
+            if isinstance(batch_response, Exception):
+                raise batch_response
+            return batch_response
+        field = next(
+            key for key in response_format["properties"] if key != "__speaker_note__"
+        )
+        return {field: "single", "__speaker_note__": NOTE}
+
+    monkeypatch.setattr(LLMClient, "generate_structured", generate_structured)
+    contents = asyncio.run(
+        get_slide_contents_from_types_and_outlines(
+            layouts,
+            [SlideOutlineModel(content=f"outline {i}") for i in range(len(layouts))],
+            "English",
+        )
+    )
+    return contents, calls
+
+
+def test_batch_generates_slides_in_one_call(monkeypatch):
+    layouts = [_get_layout("title"), _get_layout("body")]
+    contents, calls = _generate(
+        monkeypatch,
+        layouts,
+        {
+            "slide_1": {"title": "batched", "__speaker_note__": NOTE},
+            # Character limits are not enforced
+            "slide_2": {"body": "batched but long", "__speaker_note__": NOTE},
+        },
+    )
+
+    assert contents == [
+        {"title": "batched", "__speaker_note__": NOTE},
+        {"body": "batched but long", "__speaker_note__": NOTE},
+    ]
+    assert len(calls) == 1
+    # Output budget grows with the number of slides
+    assert calls[0][2] == 2 * generate_slide_content.BATCH_MAX_TOKENS_PER_SLIDE
+    schema = calls[0][1]
+    assert schema["required"] == ["slide_1", "slide_2"]
+    assert schema["properties"]["slide_2"]["required"] == ["body", "__speaker_note__"]
+
+
+def test_batch_falls_back_for_invalid_slides_only(monkeypatch):
+    layouts = [_get_layout("title"), _get_layout("body"), _get_layout("quote")]
+    contents, calls = _generate(
+        monkeypatch,
+        layouts,
+        {
+            "slide_1": {"title": "batched", "__speaker_note__": NOTE},
+            "slide_2": {"title": "wrong layout", "__speaker_note__": NOTE},
+        },
+    )
+
+    assert contents == [
+        {"title": "batched", "__speaker_note__": NOTE},
+        {"body": "single", "__speaker_note__": NOTE},
+        {"quote": "single", "__speaker_note__": NOTE},
+    ]
+    assert [purpose for purpose, _, _ in calls] == [
+        LLMCallPurpose.SLIDE_CONTENT_BATCH,
+        LLMCallPurpose.SLIDE_CONTENT,
+        LLMCallPurpose.SLIDE_CONTENT,
+    ]
+
+
+def test_failed_batch_falls_back_for_all_slides(monkeypatch):
+    layouts = [_get_layout("title"), _get_layout("body")]
+    contents, calls = _generate(
+        monkeypatch, layouts, ValueError("LLM did not return any content")
+    )
+
+    assert contents == [
+        {"title": "single", "__speaker_note__": NOTE},
+        {"body": "single", "__speaker_note__": NOTE},
+    ]
+    assert len(calls) == 3
@@ -0,0 +1,33 @@
+import json
+
+from models.presentation_outline_model import SlideOutlineModel
+from utils.slide_outlines_parser import SlideOutlinesParser
+
+
+OUTLINES = {"slides": [{"content": f"# Slide {index}\n- Point"} for index in range(4)]}
+
+
+def test_returns_each_slide_outline_once_complete():
+    text = "```json\n" + json.dumps(OUTLINES) + "\n```"
+    parser = SlideOutlinesParser(n_slides=3)
+
+    returned = []
+    for position, char in enumerate(text):
+        for slide in parser.feed(char):
+            # Returned on the closing brace of its object
+            assert text[: position + 1].endswith(json.dumps(slide.model_dump()))
+            returned.append(slide)
+
+    assert returned == [SlideOutlineModel(**slide) for slide in OUTLINES["slides"][:3]]
+    assert parser.get_presentation_outlines().slides == returned
+
+
+def test_stops_at_invalid_slide_outline():
+    parser = SlideOutlinesParser()
+
+    assert parser.feed('{"slides": [{"content": "a"}, {"title": "b"}, ') == [
+        SlideOutlineModel(content="a")
+    ]
+    assert parser.feed('{"content": "c"}]}') == []
+    assert not parser.is_valid
+    assert parser.get_presentation_outlines() is None
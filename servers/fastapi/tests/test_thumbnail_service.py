@@ -0,0 +1,64 @@
+import asyncio
+import os
+import tempfile
+
+from PIL import Image
+
+from services.thumbnail_service import ThumbnailService
+
+
+def create_image(directory: str, name: str = "image.jpg") -> str:
+    image_path = os.path.join(directory, name)
+    Image.new("RGB", (1600, 900), (200, 40, 40)).save(image_path, "JPEG")
+    return image_path
+
+
+def test_thumbnail_is_created_and_cached():
+    service = ThumbnailService(size=128)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        image_path = create_image(temp_dir)
+        assert service.get_cached_thumbnail_path(image_path) is None
+
+        thumbnail_path = asyncio.run(service.get_thumbnail(image_path))
+
+        assert thumbnail_path == os.path.join(
+            temp_dir, "thumbnails", "image_128.webp"
+        )
+        assert service.get_cached_thumbnail_path(image_path) == thumbnail_path
+        with Image.open(thumbnail_path) as thumbnail:
+            assert thumbnail.format == "WEBP"
+            assert max(thumbnail.size) == 128
+
+
+def test_concurrent_requests_share_one_conversion():
+    service = ThumbnailService()
+    calls = []
+    create_thumbnail = service.create_thumbnail
+
+    def counting_create_thumbnail(image_path):
+        calls.append(image_path)
+        return create_thumbnail(image_path)
+
+    service.create_thumbnail = counting_create_thumbnail
+
+    async def run(image_path):
+        return await asyncio.gather(
+            *[service.get_thumbnail(image_path) for _ in range(5)]
+        )
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        image_path = create_image(temp_dir)
+        thumbnail_paths = asyncio.run(run(image_path))
+
+    assert len(calls) == 1
+    assert len(set(thumbnail_paths)) == 1
+
+
+def test_unreadable_image_returns_none():
+    service = ThumbnailService()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        image_path = os.path.join(temp_dir, "broken.png")
+        with open(image_path, "w") as f:
+            f.write("not an image")
+
+        assert asyncio.run(service.get_thumbnail(image_path)) is None
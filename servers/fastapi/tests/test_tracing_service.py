@@ -0,0 +1,81 @@
+import asyncio
+import json
+import os
+import tempfile
+
+import pytest
+
+from services.tracing_service import TracingService
+
+
+async def _generate(tracing_service: TracingService):
+    async def get_slide(index: int):
+        with tracing_service.start_span("slide_content", slide_index=index):
+            await asyncio.sleep(0.01)
+
+    with tracing_service.start_span("generate_presentation") as root:
+        with tracing_service.start_span("outline_generation"):
+            await asyncio.sleep(0.01)
+        with tracing_service.start_span("slide_content_generation"):
+            await asyncio.gather(*[get_slide(i) for i in range(3)])
+        breakdown = root.get_timing_breakdown()
+    return root, breakdown
+
+
+def test_spans_nest_across_tasks_and_are_written_as_jsonl():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "traces", "spans.jsonl")
+        tracing_service = TracingService(jsonl_path=path)
+
+        async def run():
+            result = await _generate(tracing_service)
+            await tracing_service.flush()
+            return result
+
+        root, breakdown = asyncio.run(run())
+        with open(path) as f:
+            spans = [json.loads(line) for line in f]
+
+    assert len(spans) == 6
+    assert {span["trace_id"] for span in spans} == {root.trace_id}
+    span_ids = {span["name"]: span["span_id"] for span in spans}
+    slide_spans = [span for span in spans if span["name"] == "slide_content"]
+    assert sorted(span["attributes"]["slide_index"] for span in slide_spans) == [
+        0,
+        1,
+        2,
+    ]
+    assert all(
+        span["parent_span_id"] == span_ids["slide_content_generation"]
+        for span in slide_spans
+    )
+    assert spans[-1]["name"] == "generate_presentation"
+    assert spans[-1]["parent_span_id"] is None
+
+    assert set(breakdown.stages) == {"outline_generation", "slide_content_generation"}
+    assert breakdown.total >= sum(breakdown.stages.values())
+
+
+def test_failed_spans_are_exported_with_error_status():
+    tracing_service = TracingService(service_name="test")
+
+    with pytest.raises(ValueError):
+        with tracing_service.start_span("generate_presentation") as root:
+            with tracing_service.start_span("export", export_as="pptx"):
+                raise ValueError("disk full")
+
+    payload = tracing_service.get_otlp_payload(root.trace_spans)
+    resource_spans = payload["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"][0]["value"] == {
+        "stringValue": "test"
+    }
+    export_span, root_span = resource_spans["scopeSpans"][0]["spans"]
+    assert export_span["parentSpanId"] == root_span["spanId"]
+    assert "parentSpanId" not in root_span
+    assert export_span["status"] == {"code": 2, "message": "ValueError: disk full"}
+    assert export_span["attributes"] == [
+        {"key": "export_as", "value": {"stringValue": "pptx"}}
+    ]
+    assert int(export_span["endTimeUnixNano"]) >= int(
+        export_span["startTimeUnixNano"]
+    )
@@ -0,0 +1,72 @@
+import base64
+import zlib
+from typing import Optional
+
+from utils.get_env import (
+    get_database_compression_env,
+    get_database_compression_min_size_env,
+)
+from utils.parsers import parse_int_or_none
+
+try:
+    import zstandard
+
+    ZSTANDARD_AVAILABLE = True
+except ImportError:
+    ZSTANDARD_AVAILABLE = False
+
+
+# Compressed values are stored as text: header, codec, ":" and base64 payload.
+# The record separator makes the header impossible to confuse with stored text.
+COMPRESSED_VALUE_HEADER = "\x1epz1:"
+COMPRESSION_CODECS = ("zlib", "zstd")
+DEFAULT_COMPRESSION_MIN_SIZE = 1024
+
+
+def get_compression_codec() -> Optional[str]:
+    codec = (get_database_compression_env() or "").lower()
+    if codec not in COMPRESSION_CODECS:
+        return None
+    if codec == "zstd" and not ZSTANDARD_AVAILABLE:
+        return "zlib"
+    return codec
+
+
+def get_compression_min_size() -> int:
+    min_size = parse_int_or_none(get_database_compression_min_size_env())
+    return DEFAULT_COMPRESSION_MIN_SIZE if min_size is None else min_size
+
+
+def is_compressed(value: str) -> bool:
+    return value.startswith(COMPRESSED_VALUE_HEADER)
+
+
+def compress_text(text: str, codec: str) -> str:
+    data = text.encode()
+    if codec == "zstd":
+        compressed = zstandard.ZstdCompressor(level=3).compress(data)
+    else:
+        compressed = zlib.compress(data, 6)
+    payload = base64.b64encode(compressed).decode("ascii")
+    return f"{COMPRESSED_VALUE_HEADER}{codec}:{payload}"
+
+
+def decompress_text(value: str) -> str:
+    codec, payload = value[len(COMPRESSED_VALUE_HEADER) :].split(":", 1)
+    compressed = base64.b64decode(payload)
+    if codec == "zstd":
+        if not ZSTANDARD_AVAILABLE:
+            raise RuntimeError("zstandard is required to read zstd compressed values")
+        return zstandard.ZstdDecompressor().decompress(compressed).decode()
+    return zlib.decompress(compressed).decode()
+
+
+def compress_text_if_enabled(text: str) -> Optional[str]:
+    """
+    Returns the compressed text if compression is enabled with DATABASE_COMPRESSION
+    and the text is at least DATABASE_COMPRESSION_MIN_SIZE characters, else None.
+    """
+    codec = get_compression_codec()
+    if not codec or len(text) < get_compression_min_size():
+        return None
+    return compress_text(text, codec)
@@ -1,5 +1,24 @@
 import os
-from utils.get_env import get_app_data_directory_env, get_database_url_env
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import event, insert, inspect
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlmodel import SQLModel
+from utils.get_env import (
+    get_app_data_directory_env,
+    get_database_max_overflow_env,
+    get_database_pool_pre_ping_env,
+    get_database_pool_recycle_env,
+    get_database_pool_size_env,
+    get_database_url_env,
+    get_sqlite_busy_timeout_env,
+    get_sqlite_cache_size_env,
+    get_sqlite_journal_mode_env,
+    get_sqlite_synchronous_env,
+)
+from utils.parsers import parse_bool_or_none, parse_int_or_default
 from urllib.parse import urlsplit, urlunsplit, parse_qsl
 import ssl
 
@@ -46,3 +65,96 @@ def get_database_url_and_connect_args() -> tuple[str, dict]:
         pass
 
     return database_url, connect_args
+
+
+def get_sqlite_pragmas() -> dict[str, str | int]:
+    return {
+        "journal_mode": get_sqlite_journal_mode_env() or "WAL",
+        "synchronous": get_sqlite_synchronous_env() or "NORMAL",
+        "busy_timeout": parse_int_or_default(get_sqlite_busy_timeout_env(), 10000),
+        # Negative values are in KiB
+        "cache_size": parse_int_or_default(get_sqlite_cache_size_env(), -32000),
+        "temp_store": "MEMORY",
+    }
+
+
+def apply_sqlite_pragmas(engine: AsyncEngine, pragmas: Optional[dict] = None):
+    pragmas = pragmas or get_sqlite_pragmas()
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def get_engine_kwargs(database_url: str) -> dict:
+    """
+    Returns engine options tuned for the database backend.
+    - SQLite uses a single file, so pool settings are left to SQLAlchemy and
+    concurrency is handled with pragmas applied on connect.
+    - Server databases get a sized pool that checks and recycles stale connections.
+    """
+    if "sqlite" in database_url:
+        return {}
+
+    return {
+        "pool_size": parse_int_or_default(get_database_pool_size_env(), 10),
+        "max_overflow": parse_int_or_default(get_database_max_overflow_env(), 20),
+        "pool_recycle": parse_int_or_default(get_database_pool_recycle_env(), 1800),
+        "pool_pre_ping": parse_bool_or_none(get_database_pool_pre_ping_env())
+        is not False,
+    }
+
+
+def create_tuned_async_engine(database_url: str, connect_args: dict) -> AsyncEngine:
+    engine = create_async_engine(
+        database_url, connect_args=connect_args, **get_engine_kwargs(database_url)
+    )
+    if "sqlite" in database_url:
+        apply_sqlite_pragmas(engine)
+    return engine
+
+
+def get_insert_ignore(table, dialect_name: str):
+    """
+    Returns an insert statement for the table that skips rows conflicting
+    with an existing primary or unique key.
+    """
+    if dialect_name == "sqlite":
+        return sqlite_insert(table).on_conflict_do_nothing()
+    if dialect_name == "postgresql":
+        return postgresql_insert(table).on_conflict_do_nothing()
+    if dialect_name == "mysql":
+        return mysql_insert(table).prefix_with("IGNORE")
+    return insert(table)
+
+
+async def bulk_insert_models(sql_session: AsyncSession, models: Sequence[SQLModel]):
+    """
+    Inserts models with one executemany INSERT per table instead of flushing
+    them one by one through the unit of work.
+    Tables are written in the order their first model appears and models are
+    not added to the session. Bulk inserts skip mapper events, so before_insert
+    listeners are run here.
+    """
+    models_by_class: Dict[type, List[SQLModel]] = {}
+    for model in models:
+        models_by_class.setdefault(type(model), []).append(model)
+
+    for model_class, class_models in models_by_class.items():
+        mapper = inspect(model_class)
+        rows = []
+        for model in class_models:
+            state = inspect(model)
+            mapper.dispatch.before_insert(mapper, None, state)
+            # Unset attributes are left out so column defaults apply
+            rows.append(
+                {
+                    key: value
+                    for key, value in state.dict.items()
+                    if key in mapper.columns
+                }
+            )
+        await sql_session.execute(insert(model_class), rows)
@@ -1,67 +1,176 @@
 import json
 import os
+import time
 import aiohttp
-from typing import Literal
+from typing import Literal, Optional
 import uuid
 from fastapi import HTTPException
 from pathvalidate import sanitize_filename
 
-from models.pptx_models import PptxPresentationModel
+from enums.pdf_renderer import PdfRenderer
+from models.export_stats import ExportStatsModel
+from models.pptx_models import (
+    PptxImageCompressionModel,
+    PptxImageCompressionStatsModel,
+    PptxPresentationModel,
+)
 from models.presentation_and_path import PresentationAndPath
+from services.libreoffice_pdf_service import LIBREOFFICE_PDF_SERVICE
 from services.pptx_presentation_creator import PptxPresentationCreator
+from services.prometheus_metrics import PROMETHEUS_METRICS
 from services.temp_file_service import TEMP_FILE_SERVICE
 from utils.asset_directory_utils import get_exports_directory
+from utils.get_env import (
+    get_export_image_dpi_env,
+    get_export_image_quality_env,
+    get_pdf_export_renderer_env,
+)
+from utils.parsers import parse_int_or_none
 import uuid
 
 
+def get_image_compression_options(
+    image_compression: Optional[PptxImageCompressionModel] = None,
+) -> Optional[PptxImageCompressionModel]:
+    """
+    Returns requested image compression options or the defaults configured
+    through EXPORT_IMAGE_DPI and EXPORT_IMAGE_QUALITY. Compression is disabled
+    when neither is set.
+    """
+    if image_compression:
+        return image_compression
+
+    dpi = parse_int_or_none(get_export_image_dpi_env())
+    if not dpi:
+        return None
+
+    quality = parse_int_or_none(get_export_image_quality_env())
+    if quality:
+        return PptxImageCompressionModel(dpi=dpi, quality=quality)
+    return PptxImageCompressionModel(dpi=dpi)
+
+
+def get_pdf_renderer(pdf_renderer: Optional[PdfRenderer] = None) -> PdfRenderer:
+    if pdf_renderer:
+        return pdf_renderer
+    try:
+        return PdfRenderer(get_pdf_export_renderer_env() or PdfRenderer.BROWSER.value)
+    except ValueError:
+        return PdfRenderer.BROWSER
+
+
+async def get_pptx_model(presentation_id: uuid.UUID) -> PptxPresentationModel:
+    # Get the converted PPTX model from the Next.js service
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            f"http://localhost/api/presentation_to_pptx_model?id={presentation_id}"
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                print(f"Failed to get PPTX model: {error_text}")
+                raise HTTPException(
+                    status_code=500,
+                    detail="Failed to convert presentation to PPTX model",
+                )
+            pptx_model_data = await response.json()
+
+    return PptxPresentationModel(**pptx_model_data)
+
+
+async def create_pptx(
+    presentation_id: uuid.UUID,
+    pptx_path: str,
+    image_compression: Optional[PptxImageCompressionModel] = None,
+    stats: Optional[ExportStatsModel] = None,
+) -> Optional[PptxImageCompressionStatsModel]:
+    stats = stats or ExportStatsModel()
+    with stats.time_stage("pptx_model"):
+        pptx_model = await get_pptx_model(presentation_id)
+
+    # Create PPTX file using the converted model
+    temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
+    image_compression = get_image_compression_options(image_compression)
+    pptx_creator = PptxPresentationCreator(
+        pptx_model, temp_dir, image_compression, stats
+    )
+    await pptx_creator.create_ppt()
+    pptx_creator.save(pptx_path)
+
+    if not image_compression:
+        return None
+
+    image_compression_stats = pptx_creator.image_compression_stats
+    print(
+        f"Image compression saved {image_compression_stats.bytes_saved} bytes "
+        f"across {image_compression_stats.images} images"
+    )
+    return image_compression_stats
+
+
 async def export_presentation(
-    presentation_id: uuid.UUID, title: str, export_as: Literal["pptx", "pdf"]
+    presentation_id: uuid.UUID,
+    title: str,
+    export_as: Literal["pptx", "pdf"],
+    image_compression: Optional[PptxImageCompressionModel] = None,
+    pdf_renderer: Optional[PdfRenderer] = None,
+    persist: bool = True,
+    include_stats: bool = False,
 ) -> PresentationAndPath:
-    if export_as == "pptx":
+    """
+    Exports presentation into the exports directory.
+    If persist is false, PPTX and LibreOffice PDF exports are written to a temp
+    directory instead and should be removed by the caller once they are sent.
+    Per-stage timings and counts are logged and returned if include_stats is true.
+    """
+    start = time.perf_counter()
+    file_name = sanitize_filename(title or str(uuid.uuid4()))
+    output_directory = (
+        get_exports_directory() if persist else TEMP_FILE_SERVICE.create_temp_dir()
+    )
+    stats = ExportStatsModel()
+    image_compression_stats = None
 
-        # Get the converted PPTX model from the Next.js service
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"http://localhost/api/presentation_to_pptx_model?id={presentation_id}"
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    print(f"Failed to get PPTX model: {error_text}")
-                    raise HTTPException(
-                        status_code=500,
-                        detail="Failed to convert presentation to PPTX model",
-                    )
-                pptx_model_data = await response.json()
-
-        # Create PPTX file using the converted model
-        pptx_model = PptxPresentationModel(**pptx_model_data)
-        temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
-        pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
-        await pptx_creator.create_ppt()
-
-        export_directory = get_exports_directory()
-        pptx_path = os.path.join(
-            export_directory,
-            f"{sanitize_filename(title or str(uuid.uuid4()))}.pptx",
+    if export_as == "pptx":
+        path = os.path.join(output_directory, f"{file_name}.pptx")
+        image_compression_stats = await create_pptx(
+            presentation_id, path, image_compression, stats
         )
-        pptx_creator.save(pptx_path)
 
-        return PresentationAndPath(
-            presentation_id=presentation_id,
-            path=pptx_path,
+    elif get_pdf_renderer(pdf_renderer) == PdfRenderer.LIBREOFFICE:
+        # LibreOffice names the PDF after the PPTX, so it is built in its own temp dir
+        pptx_path = os.path.join(TEMP_FILE_SERVICE.create_temp_dir(), f"{file_name}.pptx")
+        image_compression_stats = await create_pptx(
+            presentation_id, pptx_path, image_compression, stats
         )
+        with stats.time_stage("pdf_conversion"):
+            path = await LIBREOFFICE_PDF_SERVICE.convert_to_pdf(
+                pptx_path, output_directory
+            )
+
     else:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "http://localhost/api/export-as-pdf",
-                json={
-                    "id": str(presentation_id),
-                    "title": sanitize_filename(title or str(uuid.uuid4())),
-                },
-            ) as response:
-                response_json = await response.json()
-
-        return PresentationAndPath(
-            presentation_id=presentation_id,
-            path=response_json["path"],
-        )
+        with stats.time_stage("pdf_render"):
+            async with aiohttp.ClientSession() as session:
+                async with session.post(
+                    "http://localhost/api/export-as-pdf",
+                    json={
+                        "id": str(presentation_id),
+                        "title": file_name,
+                    },
+                ) as response:
+                    response_json = await response.json()
+        path = response_json["path"]
+
+    if os.path.exists(path):
+        stats.artifact_bytes = os.path.getsize(path)
+    print(f"Export stats for {presentation_id}: {stats.to_log_string()}")
+    PROMETHEUS_METRICS.export_duration.labels(export_as).observe(
+        time.perf_counter() - start
+    )
+    PROMETHEUS_METRICS.observe_export(export_as, stats)
+
+    return PresentationAndPath(
+        presentation_id=presentation_id,
+        path=path,
+        image_compression=image_compression_stats,
+        export_stats=stats if include_stats else None,
+    )
@@ -0,0 +1,74 @@
+import os
+from typing import Optional
+from urllib.parse import quote
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+
+from services.temp_file_service import TEMP_FILE_SERVICE
+from utils.get_env import get_app_data_directory_env
+
+
+EXPORT_MEDIA_TYPES = {
+    ".pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    ".pdf": "application/pdf",
+}
+
+
+def get_accel_redirect_path(request: Request, path: str) -> Optional[str]:
+    """
+    Returns the nginx internal path for a file inside the app data directory when
+    the proxy announced X-Accel-Redirect support through the X-Sendfile-Type header.
+    """
+    if request.headers.get("x-sendfile-type", "").lower() != "x-accel-redirect":
+        return None
+
+    app_data_directory = get_app_data_directory_env()
+    if not app_data_directory:
+        return None
+
+    relative_path = os.path.relpath(
+        os.path.realpath(path), os.path.realpath(app_data_directory)
+    )
+    if relative_path.startswith(".."):
+        return None
+
+    return f"/app_data/{quote(relative_path)}"
+
+
+def get_file_download_response(
+    request: Request, path: str, delete_after: bool = False
+) -> Response:
+    """
+    Streams file as an attachment.
+    - Behind nginx, persistent files are handed to nginx with X-Accel-Redirect so
+    it serves them with sendfile.
+    - Otherwise the file is streamed in chunks with Content-Length, which ASGI servers
+    supporting the pathsend extension send zero-copy.
+    - If delete_after is true, file is removed once the response is sent.
+    """
+    filename = os.path.basename(path)
+    media_type = EXPORT_MEDIA_TYPES.get(os.path.splitext(filename)[1].lower())
+
+    if not delete_after:
+        accel_redirect_path = get_accel_redirect_path(request, path)
+        if accel_redirect_path:
+            return Response(
+                media_type=media_type,
+                headers={
+                    "X-Accel-Redirect": accel_redirect_path,
+                    "Content-Disposition": f"attachment; filename*=utf-8''{quote(filename)}",
+                },
+            )
+
+    return FileResponse(
+        path,
+        media_type=media_type,
+        filename=filename,
+        background=(
+            BackgroundTask(TEMP_FILE_SERVICE.cleanup_temp_file, path)
+            if delete_after
+            else None
+        ),
+    )
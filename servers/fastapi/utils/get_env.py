@@ -9,6 +9,82 @@ def get_database_url_env():
     return os.getenv("DATABASE_URL")
 
 
+def get_database_pool_size_env():
+    return os.getenv("DATABASE_POOL_SIZE")
+
+
+def get_database_max_overflow_env():
+    return os.getenv("DATABASE_MAX_OVERFLOW")
+
+
+def get_database_pool_recycle_env():
+    return os.getenv("DATABASE_POOL_RECYCLE")
+
+
+def get_database_pool_pre_ping_env():
+    return os.getenv("DATABASE_POOL_PRE_PING")
+
+
+def get_sqlite_journal_mode_env():
+    return os.getenv("SQLITE_JOURNAL_MODE")
+
+
+def get_sqlite_synchronous_env():
+    return os.getenv("SQLITE_SYNCHRONOUS")
+
+
+def get_sqlite_busy_timeout_env():
+    return os.getenv("SQLITE_BUSY_TIMEOUT")
+
+
+def get_sqlite_cache_size_env():
+    return os.getenv("SQLITE_CACHE_SIZE")
+
+
+def get_database_compression_env():
+    return os.getenv("DATABASE_COMPRESSION")
+
+
+def get_database_compression_min_size_env():
+    return os.getenv("DATABASE_COMPRESSION_MIN_SIZE")
+
+
+def get_redis_url_env():
+    return os.getenv("REDIS_URL")
+
+
+def get_asset_gc_interval_env():
+    return os.getenv("ASSET_GC_INTERVAL")
+
+
+def get_asset_gc_dry_run_env():
+    return os.getenv("ASSET_GC_DRY_RUN")
+
+
+def get_asset_gc_min_age_env():
+    return os.getenv("ASSET_GC_MIN_AGE")
+
+
+def get_asset_gc_export_max_age_env():
+    return os.getenv("ASSET_GC_EXPORT_MAX_AGE")
+
+
+def get_prometheus_multiproc_dir_env():
+    return os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+
+def get_tracing_jsonl_path_env():
+    return os.getenv("TRACING_JSONL_PATH")
+
+
+def get_otel_exporter_otlp_endpoint_env():
+    return os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+
+
+def get_otel_service_name_env():
+    return os.getenv("OTEL_SERVICE_NAME")
+
+
 def get_app_data_directory_env():
     return os.getenv("APP_DATA_DIRECTORY")
 
@@ -101,6 +177,50 @@ def get_web_grounding_env():
     return os.getenv("WEB_GROUNDING")
 
 
+def get_llm_hedging_purposes_env():
+    return os.getenv("LLM_HEDGING_PURPOSES")
+
+
+def get_llm_hedging_percentile_env():
+    return os.getenv("LLM_HEDGING_PERCENTILE")
+
+
+def get_llm_hedging_min_samples_env():
+    return os.getenv("LLM_HEDGING_MIN_SAMPLES")
+
+
+def get_llm_hedging_model_env():
+    return os.getenv("LLM_HEDGING_MODEL")
+
+
+def get_llm_hedging_api_key_env():
+    return os.getenv("LLM_HEDGING_API_KEY")
+
+
+def get_llm_endpoints_env():
+    return os.getenv("LLM_ENDPOINTS")
+
+
+def get_llm_routing_env():
+    return os.getenv("LLM_ROUTING")
+
+
+def get_llm_circuit_breaker_threshold_env():
+    return os.getenv("LLM_CIRCUIT_BREAKER_THRESHOLD")
+
+
+def get_llm_circuit_breaker_cooldown_env():
+    return os.getenv("LLM_CIRCUIT_BREAKER_COOLDOWN")
+
+
+def get_llm_prompt_caching_env():
+    return os.getenv("LLM_PROMPT_CACHING")
+
+
+def get_slide_content_batch_size_env():
+    return os.getenv("SLIDE_CONTENT_BATCH_SIZE")
+
+
 def get_track_openai_usage_env():
     return os.getenv("TRACK_OPENAI_USAGE")
 
@@ -109,6 +229,30 @@ def get_openai_pricing_json_env():
     return os.getenv("OPENAI_PRICING_JSON")
 
 
+def get_export_image_dpi_env():
+    return os.getenv("EXPORT_IMAGE_DPI")
+
+
+def get_export_image_quality_env():
+    return os.getenv("EXPORT_IMAGE_QUALITY")
+
+
+def get_pdf_export_renderer_env():
+    return os.getenv("PDF_EXPORT_RENDERER")
+
+
+def get_libreoffice_workers_env():
+    return os.getenv("LIBREOFFICE_WORKERS")
+
+
+def get_libreoffice_queue_size_env():
+    return os.getenv("LIBREOFFICE_QUEUE_SIZE")
+
+
+def get_libreoffice_timeout_env():
+    return os.getenv("LIBREOFFICE_TIMEOUT")
+
+
 def get_comfyui_url_env():
     return os.getenv("COMFYUI_URL")
 
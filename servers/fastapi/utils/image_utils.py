@@ -1,3 +1,4 @@
+import math
 from typing import List
 
 from PIL import Image, ImageDraw
@@ -256,3 +257,43 @@ def fit_image(
         return image.resize((width, height), Image.LANCZOS)
 
     return image
+
+
+def downsample_image(
+    image: Image.Image, width: int, height: int, dpi: int
+) -> Image.Image:
+    """
+    Downsamples image so that it still covers a box of width x height points at dpi.
+    Images that are already small enough are returned unchanged.
+    """
+    if width <= 0 or height <= 0:
+        return image
+
+    target_width = math.ceil(width * dpi / 72)
+    target_height = math.ceil(height * dpi / 72)
+
+    img_width, img_height = image.size
+    scale = max(target_width / img_width, target_height / img_height)
+    if scale >= 1:
+        return image
+
+    new_size = (max(1, round(img_width * scale)), max(1, round(img_height * scale)))
+
+    # Lets JPEG decoder skip full resolution decoding
+    image.draft(image.mode, new_size)
+    if image.size == new_size:
+        return image
+
+    return image.resize(new_size, Image.LANCZOS, reducing_gap=3.0)
+
+
+def has_transparency(image: Image.Image) -> bool:
+    if image.mode == "P":
+        if "transparency" not in image.info:
+            return False
+        image = image.convert("RGBA")
+
+    if image.mode in ("RGBA", "LA", "PA"):
+        return image.getchannel("A").getextrema()[0] < 255
+
+    return False
@@ -3,10 +3,11 @@ from typing import Optional
 from models.llm_message import LLMSystemMessage, LLMUserMessage
 from models.presentation_layout import SlideLayoutModel
 from models.sql.slide import SlideModel
+from enums.llm_call_purpose import LLMCallPurpose
 from services.llm_client import LLMClient
 from utils.llm_client_error_handler import handle_llm_client_exceptions
 from utils.llm_provider import get_model
-from utils.schema_utils import add_field_in_schema, remove_fields_from_schema
+from utils.llm_calls.generate_slide_content import get_response_schema
 
 
 def get_system_prompt(
@@ -87,23 +88,9 @@ async def get_edited_slide_content(
 ):
     model = get_model()
 
-    response_schema = remove_fields_from_schema(
-        slide_layout.json_schema, ["__image_url__", "__icon_url__"]
-    )
-    response_schema = add_field_in_schema(
-        response_schema,
-        {
-            "__speaker_note__": {
-                "type": "string",
-                "minLength": 100,
-                "maxLength": 250,
-                "description": "Speaker note for the slide",
-            }
-        },
-        True,
-    )
-
-    client = LLMClient()
+    response_schema = get_response_schema(slide_layout)
+
+    client = LLMClient(LLMCallPurpose.EDIT)
     try:
         response = await client.generate_structured(
             model=model,
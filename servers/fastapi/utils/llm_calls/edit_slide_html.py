@@ -1,5 +1,6 @@
 from typing import Optional
 from models.llm_message import LLMSystemMessage, LLMUserMessage
+from enums.llm_call_purpose import LLMCallPurpose
 from services.llm_client import LLMClient
 from utils.llm_client_error_handler import handle_llm_client_exceptions
 from utils.llm_provider import get_model
@@ -50,7 +51,7 @@ def get_user_prompt(prompt: str, html: str):
 async def get_edited_slide_html(prompt: str, html: str):
     model = get_model()
 
-    client = LLMClient()
+    client = LLMClient(LLMCallPurpose.EDIT_HTML)
     try:
         response = await client.generate(
             model=model,
@@ -3,6 +3,7 @@ from typing import Optional
 
 from models.llm_message import LLMSystemMessage, LLMUserMessage
 from models.llm_tools import SearchWebTool
+from enums.llm_call_purpose import LLMCallPurpose
 from services.llm_client import LLMClient
 from utils.get_dynamic_models import get_presentation_outline_model_with_n_slides
 from utils.llm_client_error_handler import handle_llm_client_exceptions
@@ -15,20 +16,13 @@ def get_system_prompt(
     instructions: Optional[str] = None,
     include_title_slide: bool = True,
 ):
+    # Instructions, tone and verbosity come last so the rest of the prompt
+    # is a prefix providers can cache
     return f"""
         You are an expert presentation creator. Generate structured presentations based on user requirements and format them according to the specified JSON schema with markdown content.
 
         Try to use available tools for better results.
 
-        {"# User Instruction:" if instructions else ""}
-        {instructions or ""}
-
-        {"# Tone:" if tone else ""}
-        {tone or ""}
-
-        {"# Verbosity:" if verbosity else ""}
-        {verbosity or ""}
-
         - Provide content for each slide in markdown format.
         - Make sure that flow of the presentation is logical and consistent.
         - Place greater emphasis on numerical data.
@@ -41,6 +35,16 @@ def get_system_prompt(
         {"- Always make first slide a title slide." if include_title_slide else "- Do not include title slide in the presentation."}
 
         **Search web to get latest information about the topic**
+
+        {"# User Instruction:" if instructions else ""}
+        {instructions or ""}
+
+        {"# Tone:" if tone else ""}
+        {tone or ""}
+
+        {"# Verbosity:" if verbosity else ""}
+        {verbosity or ""}
+
     """
 
 
@@ -96,7 +100,7 @@ async def generate_ppt_outline(
     model = get_model()
     response_model = get_presentation_outline_model_with_n_slides(n_slides)
 
-    client = LLMClient()
+    client = LLMClient(LLMCallPurpose.OUTLINE)
 
     try:
         async for chunk in client.stream_structured(
@@ -2,6 +2,7 @@ from typing import Optional
 from models.llm_message import LLMSystemMessage, LLMUserMessage
 from models.presentation_layout import PresentationLayoutModel
 from models.presentation_outline_model import PresentationOutlineModel
+from enums.llm_call_purpose import LLMCallPurpose
 from services.llm_client import LLMClient
 from utils.llm_client_error_handler import handle_llm_client_exceptions
 from utils.llm_provider import get_model
@@ -75,13 +76,13 @@ def get_messages_for_slides_markdown(
             content=f"""
                 You're a professional presentation designer with creative freedom to design engaging presentations.
 
-                {"# User Instruction:" if instructions else ""}
-                {instructions or ""}
-
                 {presentation_layout.to_string()}
 
                 Select layout that best matches the content of the slides.
 
+                {"# User Instruction:" if instructions else ""}
+                {instructions or ""}
+
                 User intruction should be taken into account while creating the presentation structure, except for number of slides.
 
                 Select layout index for each of the {n_slides} slides based on what will best serve the presentation's goals.
@@ -102,7 +103,7 @@ async def generate_presentation_structure(
     using_slides_markdown: bool = False,
 ) -> PresentationStructureModel:
 
-    client = LLMClient()
+    client = LLMClient(LLMCallPurpose.STRUCTURE)
     model = get_model()
     response_model = get_presentation_structure_model_with_n_slides(
         len(presentation_outline.slides)
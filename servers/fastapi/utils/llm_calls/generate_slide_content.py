@@ -1,31 +1,36 @@
+import asyncio
 from datetime import datetime
-from typing import Optional
+import json
+from typing import List, Optional
+
+from jsonschema import Draft7Validator, validators
+
 from models.llm_message import LLMSystemMessage, LLMUserMessage
 from models.presentation_layout import SlideLayoutModel
 from models.presentation_outline_model import SlideOutlineModel
+from enums.llm_call_purpose import LLMCallPurpose
+from services.json_schema_cache import JSON_SCHEMA_CACHE
 from services.llm_client import LLMClient
 from utils.llm_client_error_handler import handle_llm_client_exceptions
 from utils.llm_provider import get_model
 from utils.schema_utils import add_field_in_schema, remove_fields_from_schema
 
 
+# Output token budget of each slide in batched calls, as much as a single slide
+# call gets from providers that require a limit
+BATCH_MAX_TOKENS_PER_SLIDE = 4000
+
+
 def get_system_prompt(
     tone: Optional[str] = None,
     verbosity: Optional[str] = None,
     instructions: Optional[str] = None,
 ):
+    # Instructions, tone and verbosity come last so the rest of the prompt
+    # is a prefix shared by every slide call, which providers can cache
     return f"""
         Generate structured slide based on provided outline, follow mentioned steps and notes and provide structured output.
 
-        {"# User Instructions:" if instructions else ""}
-        {instructions or ""}
-
-        {"# Tone:" if tone else ""}
-        {tone or ""}
-
-        {"# Verbosity:" if verbosity else ""}
-        {verbosity or ""}
-
         # Steps
         1. Analyze the outline.
         2. Generate structured slide based on the outline.
@@ -61,6 +66,15 @@ def get_system_prompt(
             __icon_query__: string,
         }}
 
+        {"# User Instructions:" if instructions else ""}
+        {instructions or ""}
+
+        {"# Tone:" if tone else ""}
+        {tone or ""}
+
+        {"# Verbosity:" if verbosity else ""}
+        {verbosity or ""}
+
     """
 
 
@@ -98,6 +112,109 @@ def get_messages(
     ]
 
 
+def get_batch_user_prompt(outlines: List[str], language: str):
+    slide_outlines = "\n\n".join(
+        f"### {get_batch_slide_key(index)}\n{outline}"
+        for index, outline in enumerate(outlines)
+    )
+    return f"""
+        ## Current Date and Time
+        {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+
+        ## Icon Query And Image Prompt Language
+        English
+
+        ## Slide Content Language
+        {language}
+
+        ## Slide Outlines
+        Generate one structured slide for each outline below, under the key of the outline.
+
+        {slide_outlines}
+    """
+
+
+def get_batch_messages(
+    outlines: List[str],
+    language: str,
+    tone: Optional[str] = None,
+    verbosity: Optional[str] = None,
+    instructions: Optional[str] = None,
+):
+    return [
+        LLMSystemMessage(
+            content=get_system_prompt(tone, verbosity, instructions),
+        ),
+        LLMUserMessage(
+            content=get_batch_user_prompt(outlines, language),
+        ),
+    ]
+
+
+def get_batch_slide_key(index: int) -> str:
+    return f"slide_{index + 1}"
+
+
+def get_response_schema(slide_layout: SlideLayoutModel) -> dict:
+    """
+    Returns the cached response schema of the layout, which must not be mutated.
+    """
+
+    def build():
+        response_schema = remove_fields_from_schema(
+            slide_layout.json_schema, ["__image_url__", "__icon_url__"]
+        )
+        return add_field_in_schema(
+            response_schema,
+            {
+                "__speaker_note__": {
+                    "type": "string",
+                    "minLength": 100,
+                    "maxLength": 250,
+                    "description": "Speaker note for the slide",
+                }
+            },
+            True,
+        )
+
+    return JSON_SCHEMA_CACHE.get(
+        (
+            "slide_content",
+            slide_layout.id,
+            JSON_SCHEMA_CACHE.get_hash(slide_layout.json_schema),
+        ),
+        build,
+    )
+
+
+def get_batch_response_schema(response_schemas: List[dict]) -> dict:
+    # Slides are keyed by position as tuple arrays (prefixItems) are not
+    # supported in structured output of most providers
+    return {
+        "type": "object",
+        "properties": {
+            get_batch_slide_key(index): response_schema
+            for index, response_schema in enumerate(response_schemas)
+        },
+        "required": [
+            get_batch_slide_key(index) for index in range(len(response_schemas))
+        ],
+    }
+
+
+# Character limits are not enforced on slides generated one by one either,
+# so slides going over them are not generated again
+SlideContentValidator = validators.extend(
+    Draft7Validator, {"minLength": None, "maxLength": None}
+)
+
+
+def is_valid_slide_content(content, response_schema: dict) -> bool:
+    return isinstance(content, dict) and SlideContentValidator(
+        response_schema
+    ).is_valid(content)
+
+
 async def get_slide_content_from_type_and_outline(
     slide_layout: SlideLayoutModel,
     outline: SlideOutlineModel,
@@ -106,24 +223,10 @@ async def get_slide_content_from_type_and_outline(
     verbosity: Optional[str] = None,
     instructions: Optional[str] = None,
 ):
-    client = LLMClient()
+    client = LLMClient(LLMCallPurpose.SLIDE_CONTENT)
     model = get_model()
 
-    response_schema = remove_fields_from_schema(
-        slide_layout.json_schema, ["__image_url__", "__icon_url__"]
-    )
-    response_schema = add_field_in_schema(
-        response_schema,
-        {
-            "__speaker_note__": {
-                "type": "string",
-                "minLength": 100,
-                "maxLength": 250,
-                "description": "Speaker note for the slide",
-            }
-        },
-        True,
-    )
+    response_schema = get_response_schema(slide_layout)
 
     try:
         response = await client.generate_structured(
@@ -142,3 +245,108 @@ async def get_slide_content_from_type_and_outline(
 
     except Exception as e:
         raise handle_llm_client_exceptions(e)
+
+
+async def stream_slide_content_from_type_and_outline(
+    slide_layout: SlideLayoutModel,
+    outline: SlideOutlineModel,
+    language: str,
+    tone: Optional[str] = None,
+    verbosity: Optional[str] = None,
+    instructions: Optional[str] = None,
+):
+    client = LLMClient(LLMCallPurpose.SLIDE_CONTENT)
+    model = get_model()
+
+    try:
+        async for chunk in client.stream_structured(
+            model,
+            get_messages(
+                outline.content,
+                language,
+                tone,
+                verbosity,
+                instructions,
+            ),
+            get_response_schema(slide_layout),
+            strict=False,
+        ):
+            yield chunk
+    except Exception as e:
+        yield handle_llm_client_exceptions(e)
+
+
+async def get_slide_contents_from_types_and_outlines(
+    slide_layouts: List[SlideLayoutModel],
+    outlines: List[SlideOutlineModel],
+    language: str,
+    tone: Optional[str] = None,
+    verbosity: Optional[str] = None,
+    instructions: Optional[str] = None,
+) -> List[dict]:
+    """
+    Generates contents of several slides in one call, sending the system prompt once.
+    Slides missing from the response or not matching their schema, or all of
+    them if the call fails, are generated again one by one.
+    """
+    response_schemas = [get_response_schema(layout) for layout in slide_layouts]
+    # Schemas with references can not be nested in the combined schema
+    batch_indices = [
+        index
+        for index, response_schema in enumerate(response_schemas)
+        if "$ref" not in json.dumps(response_schema)
+    ]
+
+    contents: List[Optional[dict]] = [None] * len(slide_layouts)
+    if len(batch_indices) > 1:
+        client = LLMClient(LLMCallPurpose.SLIDE_CONTENT_BATCH)
+        try:
+            response = await client.generate_structured(
+                model=get_model(),
+                messages=get_batch_messages(
+                    [outlines[index].content for index in batch_indices],
+                    language,
+                    tone,
+                    verbosity,
+                    instructions,
+                ),
+                response_format=get_batch_response_schema(
+                    [response_schemas[index] for index in batch_indices]
+                ),
+                strict=False,
+                max_tokens=BATCH_MAX_TOKENS_PER_SLIDE * len(batch_indices),
+            )
+        except Exception as e:
+            print(f"Batched slide content generation failed: {e}")
+            response = None
+
+        if isinstance(response, dict):
+            for key_index, index in enumerate(batch_indices):
+                content = response.get(get_batch_slide_key(key_index))
+                if is_valid_slide_content(content, response_schemas[index]):
+                    contents[index] = content
+
+    fallback_indices = [
+        index for index, content in enumerate(contents) if content is None
+    ]
+    if fallback_indices and len(batch_indices) > 1:
+        print(
+            f"Generating {len(fallback_indices)} of {len(contents)} "
+            "batched slides one by one"
+        )
+    fallback_contents = await asyncio.gather(
+        *[
+            get_slide_content_from_type_and_outline(
+                slide_layouts[index],
+                outlines[index],
+                language,
+                tone,
+                verbosity,
+                instructions,
+            )
+            for index in fallback_indices
+        ]
+    )
+    for index, content in zip(fallback_indices, fallback_contents):
+        contents[index] = content
+    return contents
@@ -2,6 +2,7 @@ from models.llm_message import LLMSystemMessage, LLMUserMessage
 from models.presentation_layout import PresentationLayoutModel, SlideLayoutModel
 from models.slide_layout_index import SlideLayoutIndex
 from models.sql.slide import SlideModel
+from enums.llm_call_purpose import LLMCallPurpose
 from services.llm_client import LLMClient
 from utils.llm_client_error_handler import handle_llm_client_exceptions
 from utils.llm_provider import get_model
@@ -42,7 +43,7 @@ async def get_slide_layout_from_prompt(
     slide: SlideModel,
 ) -> SlideLayoutModel:
 
-    client = LLMClient()
+    client = LLMClient(LLMCallPurpose.LAYOUT_SELECTION)
     model = get_model()
 
     slide_layout_index = layout.get_slide_layout_index(slide.layout)
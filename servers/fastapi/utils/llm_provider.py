@@ -46,8 +46,8 @@ def is_custom_llm_selected():
     return get_llm_provider() == LLMProvider.CUSTOM
 
 
-def get_model():
-    selected_llm = get_llm_provider()
+def get_model(llm_provider: LLMProvider | None = None):
+    selected_llm = llm_provider or get_llm_provider()
     if selected_llm == LLMProvider.OPENAI:
         return get_openai_model_env() or DEFAULT_OPENAI_MODEL
     elif selected_llm == LLMProvider.GOOGLE:
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from typing import Callable, List
+
+from sqlalchemy import Column, Connection, Index, MetaData, Table, inspect, text
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    Versioned schema change applied once per database.
+    Upgrades run on a sync connection and must be idempotent, since MySQL
+    commits DDL implicitly and a failed migration can be partially applied.
+    """
+
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def get_table(conn: Connection, table_name: str) -> Table:
+    return Table(table_name, MetaData(), autoload_with=conn)
+
+
+def has_table(conn: Connection, table_name: str) -> bool:
+    return inspect(conn).has_table(table_name)
+
+
+def has_index(conn: Connection, table_name: str, index_name: str) -> bool:
+    return any(
+        index["name"] == index_name for index in inspect(conn).get_indexes(table_name)
+    )
+
+
+def has_column(conn: Connection, table_name: str, column_name: str) -> bool:
+    return any(
+        column["name"] == column_name
+        for column in inspect(conn).get_columns(table_name)
+    )
+
+
+def create_index_if_missing(
+    conn: Connection, table_name: str, index_name: str, columns: List[str]
+):
+    if not has_table(conn, table_name) or has_index(conn, table_name, index_name):
+        return
+    table = get_table(conn, table_name)
+    Index(index_name, *[table.c[column] for column in columns]).create(conn)
+
+
+def add_column_if_missing(conn: Connection, table_name: str, column: Column):
+    if not has_table(conn, table_name) or has_column(conn, table_name, column.name):
+        return
+    preparer = conn.dialect.identifier_preparer
+    column_type = column.type.compile(dialect=conn.dialect)
+    default = (
+        f" DEFAULT {column.server_default.arg}" if column.server_default else ""
+    )
+    nullable = "" if column.nullable else " NOT NULL"
+    conn.execute(
+        text(
+            f"ALTER TABLE {preparer.quote(table_name)} "
+            f"ADD COLUMN {preparer.quote(column.name)} {column_type}"
+            f"{default}{nullable}"
+        )
+    )
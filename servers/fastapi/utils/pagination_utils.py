@@ -0,0 +1,37 @@
+import base64
+from datetime import datetime
+from typing import Tuple
+import uuid
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+    """
+    Encodes the (created_at, id) keyset of the last returned row as an opaque cursor.
+    """
+    raw = f"{created_at.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        created_at, id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def get_keyset_condition(created_at_column, id_column, cursor: str):
+    """
+    Returns the condition selecting rows after the cursor when ordered by
+    created_at and id descending.
+    """
+    cursor_created_at, cursor_id = decode_cursor(cursor)
+    return or_(
+        created_at_column < cursor_created_at,
+        and_(created_at_column == cursor_created_at, id_column < cursor_id),
+    )
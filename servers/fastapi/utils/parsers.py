@@ -2,3 +2,18 @@ def parse_bool_or_none(value: str | None) -> bool | None:
     if value is None:
         return None
     return value.lower() == "true"
+
+
+def parse_int_or_none(value: str | None) -> int | None:
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def parse_int_or_default(value: str | None, default: int) -> int:
+    # Unlike `parse_int_or_none(value) or default`, a configured 0 is kept
+    parsed = parse_int_or_none(value)
+    return default if parsed is None else parsed
@@ -0,0 +1,174 @@
+import json
+from typing import Any, List, Optional
+
+from models.json_field_patch import JsonFieldPatch
+
+
+WHITESPACE = " \t\r\n"
+# Characters that end numbers, booleans and null
+LITERAL_TERMINATORS = ",]}" + WHITESPACE
+
+
+class _Frame:
+    def __init__(self, container: dict | list, path: List[str | int]):
+        self.container = container
+        self.path = path
+        # Key of the next value of an object, set once its key is read
+        self.key: Optional[str] = None
+        self.expects_key = isinstance(container, dict)
+
+    def get_child_path(self) -> List[str | int]:
+        if isinstance(self.container, dict):
+            return [*self.path, self.key]
+        return [*self.path, len(self.container)]
+
+
+class PartialJsonParser:
+    """
+    Incrementally parses a JSON object from streamed chunks and returns
+    field level patches as values are read.
+
+    Strings are patched with their text so far after every chunk and once
+    more when they are complete. Numbers, booleans, null, and objects and
+    arrays other than the root, are patched once they are complete.
+    Text before the root object, such as markdown fences, and after it is ignored.
+    """
+
+    def __init__(self):
+        self.value: Optional[dict] = None
+        self.is_done = False
+        self._stack: List[_Frame] = []
+        self._patches: List[JsonFieldPatch] = []
+        # String being read, as raw JSON text with escapes
+        self._string: Optional[str] = None
+        self._string_is_key = False
+        self._string_path: List[str | int] = []
+        # Length of the string up to its last complete character
+        self._string_safe_length = 0
+        self._string_patched_length = 0
+        self._escape_length = 0
+        self._literal: Optional[str] = None
+
+    def feed(self, chunk: str) -> List[JsonFieldPatch]:
+        for char in chunk:
+            if not self.is_done:
+                self._read(char)
+
+        if self._string is not None and not self._string_is_key:
+            if self._string_safe_length > self._string_patched_length:
+                self._add_patch(
+                    self._string_path, self._get_string_value(), done=False
+                )
+                self._string_patched_length = self._string_safe_length
+
+        patches = self._patches
+        self._patches = []
+        return patches
+
+    def _read(self, char: str):
+        if self._string is not None:
+            self._read_string(char)
+            return
+
+        if self._literal is not None:
+            if char not in LITERAL_TERMINATORS:
+                self._literal += char
+                return
+            self._end_literal()
+
+        if not self._stack:
+            # Waiting for the root object
+            if char == "{":
+                self.value = {}
+                self._stack.append(_Frame(self.value, []))
+            return
+
+        frame = self._stack[-1]
+        if char in WHITESPACE or char == ":":
+            return
+        if char == ",":
+            if isinstance(frame.container, dict):
+                frame.expects_key = True
+            return
+        if char in "}]":
+            self._stack.pop()
+            if self._stack:
+                self._add_patch(frame.path, frame.container, done=True)
+            else:
+                self.is_done = True
+            return
+        if char == '"':
+            self._string = ""
+            self._string_safe_length = 0
+            self._string_patched_length = 0
+            self._string_is_key = frame.expects_key
+            if not self._string_is_key:
+                self._string_path = self._set_value("")
+            return
+        if char in "{[":
+            container = {} if char == "{" else []
+            path = self._set_value(container)
+            self._stack.append(_Frame(container, path))
+            return
+        self._literal = char
+
+    def _read_string(self, char: str):
+        if self._escape_length:
+            self._string += char
+            # \uXXXX escapes are 6 characters long, others 2
+            if self._escape_length == 1 and char != "u":
+                self._escape_length = 0
+            elif self._escape_length == 5:
+                self._escape_length = 0
+            else:
+                self._escape_length += 1
+            if not self._escape_length:
+                self._string_safe_length = len(self._string)
+            return
+
+        if char == "\\":
+            self._string += char
+            self._escape_length = 1
+            return
+
+        if char != '"':
+            self._string += char
+            self._string_safe_length = len(self._string)
+            return
+
+        value = self._get_string_value()
+        self._string = None
+        frame = self._stack[-1]
+        if self._string_is_key:
+            frame.key = value
+            frame.expects_key = False
+            return
+        frame.container[self._string_path[-1]] = value
+        self._add_patch(self._string_path, value, done=True)
+
+    def _end_literal(self):
+        literal = self._literal
+        self._literal = None
+        try:
+            value = json.loads(literal)
+        except json.JSONDecodeError:
+            return
+        path = self._set_value(value)
+        self._add_patch(path, value, done=True)
+
+    def _get_string_value(self) -> str:
+        return json.loads(
+            '"' + self._string[: self._string_safe_length] + '"', strict=False
+        )
+
+    def _set_value(self, value: Any) -> List[str | int]:
+        frame = self._stack[-1]
+        path = frame.get_child_path()
+        if isinstance(frame.container, dict):
+            frame.container[frame.key] = value
+        else:
+            frame.container.append(value)
+        return path
+
+    def _add_patch(self, path: List[str | int], value: Any, done: bool):
+        self._patches.append(JsonFieldPatch(path=path, value=value, done=done))
@@ -0,0 +1,62 @@
+from typing import List, Optional
+
+from pydantic import ValidationError
+
+from models.presentation_outline_model import (
+    PresentationOutlineModel,
+    SlideOutlineModel,
+)
+from utils.partial_json_parser import PartialJsonParser
+
+
+class SlideOutlinesParser:
+    """
+    Incrementally parses streamed presentation outlines and returns each slide
+    outline as soon as its object is complete.
+
+    Slide outlines are returned in order and at most n_slides of them. Once a
+    slide outline is not valid no more are returned, and the outlines should be
+    parsed from the full text.
+    """
+
+    def __init__(self, n_slides: Optional[int] = None):
+        self.slides: List[SlideOutlineModel] = []
+        self.is_valid = True
+        self._n_slides = n_slides
+        self._parser = PartialJsonParser()
+
+    @property
+    def is_done(self) -> bool:
+        return self._parser.is_done
+
+    def feed(self, chunk: str) -> List[SlideOutlineModel]:
+        slides = []
+        for patch in self._parser.feed(chunk):
+            if not (patch.done and len(patch.path) == 2 and patch.path[0] == "slides"):
+                continue
+            if not self.is_valid or (
+                self._n_slides is not None and len(self.slides) >= self._n_slides
+            ):
+                continue
+
+            try:
+                if patch.path[1] != len(self.slides):
+                    raise ValueError("Slide outline is out of order")
+                slide = SlideOutlineModel.model_validate(patch.value)
+            except (ValidationError, ValueError):
+                self.is_valid = False
+                continue
+
+            self.slides.append(slide)
+            slides.append(slide)
+        return slides
+
+    def get_presentation_outlines(self) -> Optional[PresentationOutlineModel]:
+        """Returns the outlines once the whole response is parsed and valid."""
+        if not (
+            self.is_done
+            and self.is_valid
+            and isinstance(self._parser.value.get("slides"), list)
+        ):
+            return None
+        return PresentationOutlineModel(slides=list(self.slides))
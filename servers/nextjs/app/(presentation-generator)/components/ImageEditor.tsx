@@ -362,8 +362,9 @@ const ImageEditor = ({
                             className="aspect-[4/3] w-full overflow-hidden rounded-lg border cursor-pointer hover:border-blue-500 transition-colors"
                           >
                             <img
-                              src={image.path}
+                              src={image.thumbnail || image.path}
                               alt={image.extras.prompt}
+                              loading="lazy"
                               className="w-full h-full object-cover"
                             />
                           </div>
@@ -483,8 +484,9 @@ const ImageEditor = ({
                                 handleDeleteImage(image.id)
                               }}/>
                               <img
-                                src={image.path}
+                                src={image.thumbnail || image.path}
                                 alt="Uploaded preview"
+                                loading="lazy"
                                 className="w-full h-full object-cover group-hover:scale-105 transition-transform"
                               />
                               <div className="absolute inset-0 bg-black/0 group-hover:bg-black/20 transition-all duration-200" />
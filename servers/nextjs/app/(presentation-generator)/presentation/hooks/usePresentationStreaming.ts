@@ -9,6 +9,24 @@ import { jsonrepair } from "jsonrepair";
 import { toast } from "sonner";
 import { MixpanelEvent, trackEvent } from "@/utils/mixpanel";
 
+// Returns a copy of target with value set at path, creating missing containers
+const setValueAtPath = (
+  target: any,
+  path: (string | number)[],
+  value: any
+): any => {
+  if (path.length === 0) {
+    return value;
+  }
+  const [key, ...rest] = path;
+  const copy = Array.isArray(target)
+    ? [...target]
+    : { ...(target && typeof target === "object" ? target : {}) };
+  const child = (copy as any)[key] ?? (typeof rest[0] === "number" ? [] : {});
+  (copy as any)[key] = setValueAtPath(child, rest, value);
+  return copy;
+};
+
 export const usePresentationStreaming = (
   presentationId: string,
   stream: string | null,
@@ -22,6 +40,9 @@ export const usePresentationStreaming = (
   useEffect(() => {
     let eventSource: EventSource;
     let accumulatedChunks = "";
+    let completedSlides: any[] = [];
+    // Slide being generated, built from field patches until its chunk arrives
+    let streamingSlide: any = null;
 
     const initializeStream = async () => {
       dispatch(setStreaming(true));
@@ -48,6 +69,8 @@ export const usePresentationStreaming = (
                   partialData.slides.length !== previousSlidesLength.current &&
                   partialData.slides.length > 0
                 ) {
+                  completedSlides = partialData.slides;
+                  streamingSlide = null;
                   dispatch(
                     setPresentationData({
                       ...partialData,
@@ -63,6 +86,27 @@ export const usePresentationStreaming = (
             }
             break;
 
+          case "patch":
+            if (!streamingSlide || streamingSlide.index !== data.index) {
+              streamingSlide = {
+                index: data.index,
+                layout: data.layout,
+                layout_group: data.layout_group,
+                content: {},
+              };
+            }
+            streamingSlide = {
+              ...streamingSlide,
+              content: setValueAtPath(streamingSlide.content, data.path, data.value),
+            };
+            dispatch(
+              setPresentationData({
+                slides: [...completedSlides, streamingSlide],
+              } as any)
+            );
+            setLoading(false);
+            break;
+
           case "complete":
             try {
               dispatch(setPresentationData(data.presentation));
@@ -27,4 +27,5 @@ export interface PreviousGeneratedImagesResponse {
     created_at: string;
     id: string;
     path: string;
+    thumbnail?: string;
 }
\ No newline at end of file
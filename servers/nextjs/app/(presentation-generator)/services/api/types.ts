@@ -28,4 +28,5 @@ export interface ImageAssetResponse {
   message:string;
   path:string;
   id:string;
+  thumbnail?:string;
 }
\ No newline at end of file